@@ -9,30 +9,6 @@ Window {
     height: 600
     visible: false
 
-    property var canMessages: []
-    property bool isStopped: false    // Yeni: Veri eklemeyi durdurmak için
-
-    function addCanMessage(frameId, length, dataHex) {
-        if (isStopped) {
-            console.log("Ekleme durduruldu, mesaj atlandı.");
-            return;
-        }
-
-        console.log("Adding message:", frameId, length, dataHex); // Debug için
-        var timestamp = new Date().toLocaleTimeString();
-        canMessages.unshift({
-            "timestamp": timestamp,
-            "frameId": frameId.toString(16).toUpperCase(),
-            "length": length,
-            "dataHex": dataHex
-        });
-
-        // Keep only last 100 messages
-        if (canMessages.length > 100) {
-            canMessages = canMessages.slice(0, 100);
-        }
-    }
-
     ColumnLayout {
         anchors.fill: parent
         spacing: 10
@@ -47,19 +23,36 @@ Window {
         RowLayout {
             Button {
                 text: "Clear"
-                onClicked: canMessages = []
+                onClicked: canMessageModel.clear()
             }
             Button {
                 id: stopButton
-                text: isStopped ? "Start" : "Stop"     // Butonun durumu gösterilsin
+                text: canMessageModel.paused ? "Start" : "Stop"     // Butonun durumu gösterilsin
                 onClicked: {
-                    isStopped = !isStopped
+                    canMessageModel.paused = !canMessageModel.paused
                 }
             }
             Button {
                 text: "Close"
                 onClicked: debugWindow.close()
             }
+            TextField {
+                placeholderText: "ID filtresi (örn. 2601, 2301)"
+                Layout.preferredWidth: 220
+                onEditingFinished: canMessageModel.filter = text
+            }
+            Text {
+                text: messageList.count + " / " + canMessageModel.capacity
+                font.pixelSize: 12
+            }
+        }
+
+        // Alım hattı metrikleri (saniyede bir güncellenir)
+        Text {
+            text: canMetrics ? canMetrics.text : ""
+            font.family: "monospace"
+            font.pixelSize: 12
+            Layout.leftMargin: 5
         }
 
         ScrollView {
@@ -68,10 +61,11 @@ Window {
 
             ListView {
                 id: messageList
-                model: canMessages
+                model: canMessageModel
                 clip: true
+                reuseItems: true
                 delegate: Rectangle {
-                    width: parent ? parent.width : 0
+                    width: ListView.view ? ListView.view.width : 0
                     height: 60
                     color: index % 2 === 0 ? "#f0f0f0" : "white"
 
@@ -81,59 +75,33 @@ Window {
                         spacing: 15
 
                         Text {
-                            text: modelData.timestamp
+                            text: model.timestamp
                             width: 100
                             font.pixelSize: 12
                         }
                         Text{
-                            text: {
-                                if(modelData.frameId == 2601){
-                                    return "Motor";
-                                }
-                                else if(modelData.frameId == 2301){
-                                    return "Mesafe";
-                                }
-                                else if(modelData.frameId == 2801){
-                                    return "Sıcaklık";
-                                }
-                                else if(modelData.frameId == 2901){
-                                    return "Sol Sinyal";
-                                }
-                                else if(modelData.frameId == 3001){
-                                    return "Sag Sinyal";
-                                }
-                                else if(modelData.frameId == 3101){
-                                    return "Fren";
-                                }
-                                return "Bilinmeyen";
-                            }
-
+                            text: model.name
                             width: 100
                             font.pixelSize: 12
                         }
 
                         Text {
-                            text: "ID: 0x" + modelData.frameId
+                            text: "ID: 0x" + model.frameId
                             width: 100
                             font.pixelSize: 12
                         }
                         Text {
-                            text: "Len: " + modelData.length
+                            text: "Len: " + model.length
                             width: 50
                             font.pixelSize: 12
                         }
                         Text {
-                            text: "Data: " + modelData.dataHex
+                            text: "Data: " + model.dataHex
                             width: 100
                             font.pixelSize: 12
                         }
                         Text{
-                            text: {
-                                let rawData = parseInt(modelData.dataHex, 16);
-                                if(modelData.frameId == 2601) rawData -= 15;
-                                if(rawData <= 0) rawData = 0;
-                                return "Ondalık: " + rawData;
-                            }
+                            text: "Ondalık: " + model.value
                             width: 300
                             font.pixelSize: 12
                         }
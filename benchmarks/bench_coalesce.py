@@ -0,0 +1,157 @@
+# 5k frame/s sentetik yük altında iki yolu karşılaştırır:
+#   direct    - her frame için GUI thread'ine queued Qt sinyali (eski yol)
+#   coalesced - FrameCoalescer + 16 ms QTimer (VehicleModel'in kullandığı yol)
+#
+# GUI thread'inde bekleyen olay sayısı (queue depth) ve frame'in üretilmesinden
+# GUI'de işlenmesine kadar geçen gecikme raporlanır. --handler-cost-us, her
+# güncelleme için QML tarafındaki JS handler maliyetini taklit eder.
+#
+#   python3 benchmarks/bench_coalesce.py --rate 5000 --seconds 5
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, Slot
+
+from coalesce import FrameCoalescer
+
+FRAME_IDS = (0x2301, 0x2601, 0x2801, 0x2901, 0x3001, 0x3101)
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def produce(offer, rate, seconds, stop):
+    # 1 ms'lik dilimlerde rate/1000 frame üret
+    per_tick = max(1, rate // 1000)
+    tick = per_tick / rate
+    next_tick = time.perf_counter()
+    deadline = next_tick + seconds
+    seq = 0
+    while not stop.is_set() and time.perf_counter() < deadline:
+        for _ in range(per_tick):
+            offer(FRAME_IDS[seq % len(FRAME_IDS)], time.perf_counter())
+            seq += 1
+        next_tick += tick
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    return seq
+
+
+class DirectSink(QObject):
+    frameReceived = Signal(int, float)
+
+    def __init__(self, handler_cost):
+        super().__init__()
+        self.handler_cost = handler_cost
+        self.emitted = 0
+        self.handled = 0
+        self.latencies = []
+        self.frameReceived.connect(self.on_frame)
+
+    def offer(self, frame_id, sent_at):
+        self.emitted += 1
+        self.frameReceived.emit(frame_id, sent_at)
+
+    def pending(self):
+        return self.emitted - self.handled
+
+    @Slot(int, float)
+    def on_frame(self, frame_id, sent_at):
+        self.handled += 1
+        self.latencies.append(time.perf_counter() - sent_at)
+        busy_wait(self.handler_cost)
+
+
+class CoalescedSink(QObject):
+    def __init__(self, handler_cost, interval_ms=16):
+        super().__init__()
+        self.handler_cost = handler_cost
+        self.coalescer = FrameCoalescer()
+        self.latencies = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.publish)
+        self.timer.start()
+
+    def offer(self, frame_id, sent_at):
+        self.coalescer.offer(frame_id, sent_at)
+
+    def pending(self):
+        return self.coalescer.pending()
+
+    @Slot()
+    def publish(self):
+        now = time.perf_counter()
+        for frame_id, sent_at in self.coalescer.drain():
+            self.latencies.append(now - sent_at)
+            busy_wait(self.handler_cost)
+
+
+def run(app, sink, rate, seconds):
+    depths = []
+    sampler = QTimer()
+    sampler.setInterval(10)
+    sampler.timeout.connect(lambda: depths.append(sink.pending()))
+    sampler.start()
+
+    stop = threading.Event()
+    result = {}
+    producer = threading.Thread(target=lambda: result.setdefault('sent', produce(sink.offer, rate, seconds, stop)))
+    producer.start()
+
+    # Üretici bittikten sonra kuyruğun boşalması için kısa bir süre daha çalış
+    QTimer.singleShot(int(seconds * 1000) + 500, app.quit)
+    start = time.perf_counter()
+    app.exec()
+    wall = time.perf_counter() - start
+    stop.set()
+    producer.join()
+    sampler.stop()
+    return result.get('sent', 0), wall, depths
+
+
+def report(name, sent, wall, depths, latencies):
+    latencies = sorted(latencies)
+    print(f"[{name}] gönderilen={sent} ({sent / wall:,.0f}/s) GUI'de işlenen={len(latencies)}")
+    if depths:
+        print(f"  queue depth: ortalama={statistics.mean(depths):.1f} max={max(depths)}")
+    if latencies:
+        p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+        print(f"  latency ms: median={statistics.median(latencies) * 1e3:.2f} "
+              f"p99={p99 * 1e3:.2f} max={latencies[-1] * 1e3:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rate', type=int, default=5000, help="frame/s")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--handler-cost-us', type=float, default=50.0)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    cost = args.handler_cost_us / 1e6
+
+    direct = DirectSink(cost)
+    sent, wall, depths = run(app, direct, args.rate, args.seconds)
+    report("direct", sent, wall, depths, direct.latencies)
+
+    coalesced = CoalescedSink(cost)
+    sent, wall, depths = run(app, coalesced, args.rate, args.seconds)
+    report("coalesced", sent, wall, depths, coalesced.latencies)
+    for frame_id, stats in sorted(coalesced.coalescer.stats().items()):
+        print(f"  {hex(frame_id)}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
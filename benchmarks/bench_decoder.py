@@ -0,0 +1,121 @@
+# FrameDecoder ile eski yeniden dilimleyen (reslice) çerçeveleme döngüsünün
+# farklı burst boyutlarında frames/sec karşılaştırması.
+#
+# 2 Mbaud ~ 200 kB/s; tek bir read() tipik olarak 64 B - 64 kB arası döner.
+#
+#   python3 benchmarks/bench_decoder.py --frames 200000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import CANProtocol, FrameDecoder
+
+BURST_SIZES = (64, 512, 4096, 65536)
+
+
+def make_stream(frame_count, seed=1):
+    rng = random.Random(seed)
+    protocol = CANProtocol()
+    ids = (0x2301, 0x2601, 0x2801, 0x2901, 0x3001, 0x3101)
+    return b''.join(
+        protocol.pack_can_frame(rng.choice(ids) & 0x7FF, bytes(rng.randrange(256) for _ in range(rng.randint(1, 8))))
+        for _ in range(frame_count)
+    )
+
+
+def legacy_parse(packet):
+    # CANReceiver.parse_can_packet
+    if len(packet) < 5:
+        raise ValueError("Paket çok kısa")
+    if packet[0] != 0xAA:
+        raise ValueError("Geçersiz başlık")
+    type_byte = packet[1]
+    frame_type = (type_byte >> 5) & 0x01
+    data_length = type_byte & 0x0F
+    if frame_type == 0:
+        if len(packet) < 4 + data_length + 1:
+            raise ValueError("Standard frame için paket tam değil")
+        frame_id = (packet[2] << 8) | packet[3]
+        frame_data = packet[4:4+data_length]
+        end_pos = 4 + data_length
+    else:
+        if len(packet) < 6 + data_length + 1:
+            raise ValueError("Extended frame için paket tam değil")
+        frame_id = (packet[2] << 24) | (packet[3] << 16) | (packet[4] << 8) | packet[5]
+        frame_data = packet[6:6+data_length]
+        end_pos = 6 + data_length
+    if packet[end_pos] != 0x55:
+        raise ValueError("Geçersiz sonlandırıcı")
+    return frame_id, data_length, frame_data
+
+
+def legacy_decode(chunks):
+    # main.py'deki eski döngünün çerçeveleme kısmı
+    buffer = bytearray()
+    frames = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while True:
+            header_pos = buffer.find(0xAA)
+            if header_pos == -1:
+                buffer.clear()
+                break
+            if header_pos > 0:
+                buffer = buffer[header_pos:]
+            if len(buffer) < 2:
+                break
+            type_byte = buffer[1]
+            data_length = type_byte & 0x0F
+            min_len = 6 + data_length + 1 if (type_byte >> 5) & 0x01 else 4 + data_length + 1
+            if len(buffer) < min_len:
+                break
+            try:
+                frame_id, length, data = legacy_parse(buffer[:min_len])
+                frames += 1
+                buffer = buffer[min_len:]
+            except ValueError:
+                buffer = buffer[1:]
+    return frames
+
+
+def decoder_decode(chunks):
+    decoder = FrameDecoder()
+    frames = 0
+    for chunk in chunks:
+        for frame_id, dlc, data in decoder.feed(chunk):
+            frames += 1
+    return frames
+
+
+def run(fn, chunks, expected):
+    start = time.perf_counter()
+    frames = fn(chunks)
+    elapsed = time.perf_counter() - start
+    if frames != expected:
+        raise RuntimeError(f"{fn.__name__}: {frames} frame, beklenen {expected}")
+    return frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=100000)
+    args = parser.parse_args()
+
+    stream = make_stream(args.frames)
+    print(f"{args.frames} frame, {len(stream)} bayt "
+          f"(2 Mbaud'da {len(stream) * 10 / 2_000_000:.2f}s trafik)")
+    print(f"{'burst':>8} {'legacy f/s':>14} {'decoder f/s':>14} {'x':>6}")
+    for burst in BURST_SIZES:
+        chunks = [stream[i:i + burst] for i in range(0, len(stream), burst)]
+        legacy = run(legacy_decode, chunks, args.frames)
+        decoder = run(decoder_decode, chunks, args.frames)
+        print(f"{burst:>8} {legacy:>14,.0f} {decoder:>14,.0f} {decoder / legacy:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Gamepad giriş yolunun karşılaştırması; gerçek cihaz yerine pipe'a yazılan
+# evdev olayları kullanılır:
+#   per_event - olay başına read + handler çağrısı (eski inputs döngüsü gibi)
+#   batched   - toplu read, iter_unpack, poll başına eksen birleştirme
+#
+# Trigger basılı tutulurken 1 kHz ABS_Z fırtınası + SYN üretilir; ölçülen
+# değerler CPU süresi, handler çağrı sayısı ve yazma -> handler gecikmesidir.
+# --burst N, okuyucu thread'in (GIL/GUI yükü yüzünden) ancak N raporda bir
+# uyanabildiği durumu taklit eder: raporlar N'li gruplar halinde yazılır.
+#
+#   python3 benchmarks/bench_gamepad.py --seconds 2 --rate 1000 --burst 8
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamepad import EvdevReader, EV_ABS, EV_SYN, TRIGGERS
+from main import CANWriter
+from bench_writer import NullPort
+
+ABS_Z = 0x02
+
+
+def producer(fd, seconds, rate, burst, sent):
+    event = EvdevReader.EVENT
+    interval = burst / rate
+    deadline = time.perf_counter()
+    end = deadline + seconds
+    value = -32768
+    while deadline < end:
+        now = time.time()
+        sec, usec = int(now), int((now % 1) * 1e6)
+        reports = []
+        for _ in range(burst):
+            value = value + 97 if value < 32000 else -32768
+            reports.append(event.pack(sec, usec, EV_ABS, ABS_Z, value) + event.pack(sec, usec, EV_SYN, 0, 0))
+        sent.append(time.perf_counter())
+        os.write(fd, b''.join(reports))
+        deadline += interval
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PerEventReader(EvdevReader):
+    # poll başına tek olay okur, eksenleri birleştirmez
+    def __init__(self, fd):
+        super().__init__(fd, axes=frozenset(), debounce=0.0)
+
+    def _drain(self):
+        data = os.read(self.fd, self.EVENT.size)
+        self.events_read += 1
+        return data
+
+
+def run(name, seconds, rate, burst):
+    read_fd, write_fd = os.pipe()
+    if name == 'per_event':
+        reader = PerEventReader(read_fd)
+    else:
+        reader = EvdevReader(read_fd, axes=TRIGGERS)
+
+    # Gerçek handler: normalize + GamepadState + scheduler.enable
+    handle_input = CANWriter(NullPort()).handle_input
+    sent = []
+    calls = 0
+    latencies = []
+    thread = threading.Thread(target=producer, args=(write_fd, seconds, rate, burst, sent))
+    cpu_start = time.thread_time()
+    thread.start()
+    while True:
+        alive = thread.is_alive()
+        events = reader.poll(0.05)
+        for control, value, timestamp in events:
+            calls += 1
+            handle_input(control, value, timestamp)
+            # Yayınlanan değer, o ana kadar yazılan en son olaya aittir
+            latencies.append(time.perf_counter() - sent[-1])
+        if not alive and not events:
+            break
+    cpu = time.thread_time() - cpu_start
+    thread.join()
+    os.close(write_fd)
+    reader.close()
+    os.close(read_fd)
+
+    latencies_us = sorted(l * 1e6 for l in latencies) or [0.0]
+    print(f"{name:>9}: {reader.events_read:>6} olay okundu, {calls:>6} handler çağrısı, "
+          f"CPU {cpu * 1000:7.1f} ms, gecikme medyan {statistics.median(latencies_us):6.1f} us "
+          f"p99 {latencies_us[int(len(latencies_us) * 0.99) - 1]:7.1f} us")
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--rate', type=int, default=1000, help="eksen güncellemesi/s")
+    parser.add_argument('--burst', type=int, default=8, help="tek write'taki rapor sayısı")
+    args = parser.parse_args()
+
+    cpu = {name: run(name, args.seconds, args.rate, args.burst) for name in ('per_event', 'batched')}
+    print(f"CPU oranı: {cpu['per_event'] / max(cpu['batched'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
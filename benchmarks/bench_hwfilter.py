@@ -0,0 +1,68 @@
+# Kalabalık bir bus'ta adaptör kabul filtresinin etkisi: SimulatedAdapterTransport
+# (tanınmayan ID'ler dahil) -> CANReceiver.process_chunk -> VehicleModel.
+#   none  - ayar komutu yok, her frame USB'den gelir ve Python'da çözülür
+#   hw    - kabul filtresi adaptörde (maske kapsamı tam değil)
+#   hw+sw - ek olarak FrameDecoder.id_filter (main.py'nin varsayılanı)
+# Alım thread'inin CPU süresi thread_time ile ölçülür (üretici thread hariç).
+#
+#   python3 benchmarks/bench_hwfilter.py --rate 20000 --seconds 3
+
+import argparse
+import os
+import select
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication
+
+from main import CANReceiver
+from protocol import CANProtocol, acceptance_filter
+from transport import SimulatedAdapterTransport
+from vehicle import VehicleModel
+
+
+def run(app, mode, rate, seconds):
+    transport = SimulatedAdapterTransport(rate=rate, seed=1)
+    receiver = CANReceiver(transport)
+    vehicle = VehicleModel()
+    vehicle.attach(receiver.dispatcher)
+    subscribed = receiver.dispatcher.ids()
+    if mode != 'none':
+        filter_id, mask, is_extended = acceptance_filter(subscribed)
+        transport.write(CANProtocol().pack_setting_frame(500000, filter_id, mask, is_extended))
+    if mode == 'hw+sw':
+        receiver.decoder.id_filter = frozenset(subscribed)
+
+    fd = transport.fileno()
+    cpu_start = time.thread_time()
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if select.select([fd], [], [], 0.1)[0]:
+            receiver.process_chunk(transport.read(transport.in_waiting or 1))
+        app.processEvents()  # VehicleModel'in GUI yayın timer'ı
+    elapsed = time.perf_counter() - start
+    cpu = time.thread_time() - cpu_start
+    transport.close()
+
+    metrics = receiver.metrics
+    handled = sum(metrics.frames.snapshot().values())
+    print(f"{mode:>6} {transport.generated / elapsed:>10,.0f} {metrics.bytes_read / elapsed / 1024:>10.1f} "
+          f"{handled / elapsed:>10,.0f} {receiver.decoder.filtered:>9} {cpu / elapsed * 100:>8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rate', type=float, default=20000, help="bus'taki frame/s")
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    print(f"{'mod':>6} {'bus f/s':>10} {'USB KiB/s':>10} {'işlenen/s':>10} {'sw elenen':>9} {'RX CPU':>9}")
+    for mode in ('none', 'hw', 'hw+sw'):
+        run(app, mode, args.rate, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
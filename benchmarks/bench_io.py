@@ -0,0 +1,173 @@
+# Uçtan uca I/O karşılaştırması: thread başına döngü (--io threads) ile
+# tek asyncio döngüsü (can_io.CanIoCore). Aynı anda:
+#   RX  - pty'nin karşı ucundan saniyede --rate frame yazılır, handle_frame'e varış ölçülür
+#   TX  - pipe'a yazılan evdev buton olayından CAN frame'inin pty'ye çıkışına kadar geçen süre
+#   yük - gaz trigger'ı basılı: 50 ms'de bir periyodik gönderim
+#
+#   python3 benchmarks/bench_io.py --seconds 3 --rate 2000
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import tty
+
+import serial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import CANProtocol, FrameDecoder
+from gamepad import EvdevReader, EV_KEY, EV_ABS, EV_SYN
+from main import CANReceiver, CANWriter, CANReceiverThread, GamepadThread
+from can_io import CanIoCore
+
+BTN_BASE2 = 0x127     # Control.A -> frame 130, bırakınca 140
+ABS_Z = 0x02
+PRESS_GAP = 0.03      # debounce penceresinden (20 ms) uzun
+
+
+def open_pty_pair():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    port = serial.Serial(os.ttyname(slave), 2000000, timeout=1)
+    os.close(slave)
+    return master, port
+
+
+def evdev(type_, code, value):
+    now = time.time()
+    event = EvdevReader.EVENT
+    return (event.pack(int(now), int(now % 1 * 1e6), type_, code, value)
+            + event.pack(int(now), int(now % 1 * 1e6), EV_SYN, 0, 0))
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+def run(mode, seconds, rate):
+    master, port = open_pty_pair()
+    input_r, input_w = os.pipe()
+    receiver = CANReceiver(port)
+    writer = CANWriter(port)
+
+    rx_arrivals = {}
+    original_handle = receiver.handle_frame
+
+    def on_frame(frame_id, length, data):
+        if frame_id == 0x601:
+            rx_arrivals[int.from_bytes(data, 'big')] = time.perf_counter()
+        original_handle(frame_id, length, data)
+
+    receiver.handle_frame = on_frame
+    receiver.dispatcher.register(0x601, lambda frame_id, length, data: None)
+
+    # pty'nin karşı ucu: CANWriter çıkışını çöz
+    tx_arrivals = []
+    stop_reader = threading.Event()
+
+    def read_master():
+        decoder = FrameDecoder()
+        while not stop_reader.is_set():
+            try:
+                chunk = os.read(master, 4096)
+            except OSError:
+                return
+            now = time.perf_counter()
+            for frame_id, length, data in decoder.feed(chunk):
+                tx_arrivals.append((frame_id, now))
+
+    master_thread = threading.Thread(target=read_master, daemon=True)
+    master_thread.start()
+
+    cpu_start = time.process_time()
+    if mode == 'threads':
+        receiver_thread = CANReceiverThread(receiver)
+        receiver_thread.start()
+        send_thread = threading.Thread(target=writer.send_loop)
+        send_thread.start()
+        gamepad_thread = GamepadThread(writer, device=input_r)
+        gamepad_thread.start()
+    else:
+        core = CanIoCore(receiver, writer)
+        core.add_input(EvdevReader(input_r))
+        core.run_in_thread()
+    time.sleep(0.2)
+    # QThread'ler threading modülünde görünmez; işletim sistemi thread'lerini say
+    threads = len(os.listdir('/proc/self/task')) - 2  # ana thread ve pty okuyucusu hariç
+
+    os.write(input_w, evdev(EV_ABS, ABS_Z, 30000))  # gaz basılı
+    protocol = CANProtocol()
+    rx_sent = {}
+    presses = []
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    next_press = start
+    pressed = 0
+    seq = 0
+    while time.perf_counter() - start < seconds:
+        now = time.perf_counter()
+        if now >= next_press:
+            pressed ^= 1
+            presses.append((130 if pressed else 140, time.perf_counter()))
+            os.write(input_w, evdev(EV_KEY, BTN_BASE2, pressed))
+            next_press = now + PRESS_GAP
+        rx_sent[seq] = time.perf_counter()
+        os.write(master, protocol.pack_can_frame(0x601, seq.to_bytes(4, 'big')))
+        seq += 1
+        delay = start + seq * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    time.sleep(0.2)
+
+    shutdown_start = time.perf_counter()
+    if mode == 'threads':
+        receiver.stop_receiving()
+        writer.stop()
+        gamepad_thread.stop()
+        receiver_thread.wait()
+        send_thread.join()
+        gamepad_thread.wait()
+    else:
+        core.stop()
+        core.join()
+    shutdown = time.perf_counter() - shutdown_start
+    cpu = time.process_time() - cpu_start
+
+    stop_reader.set()
+    port.close()
+    os.close(master)
+    os.close(input_w)
+
+    rx = sorted((rx_arrivals[s] - rx_sent[s]) * 1e6 for s in rx_arrivals)
+    tx = []
+    for frame_id, sent_at in presses:
+        arrival = next((t for fid, t in tx_arrivals if fid == frame_id and t >= sent_at), None)
+        if arrival is not None:
+            tx.append((arrival - sent_at) * 1e6)
+    tx.sort()
+    periodic = sum(1 for fid, _ in tx_arrivals if fid == 138)
+
+    print(f"{mode:>8}: thread {threads}, CPU {cpu:.2f}s, kapanış {shutdown * 1000:.1f} ms")
+    print(f"          RX {len(rx)}/{seq} medyan {statistics.median(rx) if rx else 0:.0f} us "
+          f"p99 {percentile(rx, 0.99):.0f} us")
+    print(f"          giriş->TX {len(tx)}/{len(presses)} medyan {statistics.median(tx) if tx else 0:.0f} us "
+          f"p99 {percentile(tx, 0.99):.0f} us, periyodik gaz frame'i {periodic}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--rate', type=int, default=2000, help="RX frame/s")
+    parser.add_argument('--io', choices=['threads', 'asyncio', 'both'], default='both')
+    args = parser.parse_args()
+
+    for mode in ('threads', 'asyncio') if args.io == 'both' else (args.io,):
+        run(mode, args.seconds, args.rate)
+
+
+if __name__ == "__main__":
+    main()
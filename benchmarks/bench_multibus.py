@@ -0,0 +1,75 @@
+# İki yoğun bus'ın (sentetik adaptörler) thread ve process işçileriyle
+# okunması. Ana süreçte dispatch edilen frame/s, ana sürecin CPU süresi
+# (process_time, alt süreçler hariç) ve birleşik akışın zaman sırası ölçülür.
+# --filter ile her bus'ta ID'lerin yalnızca yarısı geçer.
+#
+#   python3 benchmarks/bench_multibus.py --seconds 3 --rate 20000
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multibus import MultiBus, parse_bus
+
+POWERTRAIN_IDS = (0x2601, 0x2801, 0x111, 0x112)
+BODY_IDS = (0x2901, 0x3001, 0x3101, 0x211)
+
+
+def bus_spec(name, ids, rate, use_filter):
+    spec = f"{name}=synthetic?rate={rate}&ids={','.join(f'{hex(i)}:1' for i in ids)}"
+    if use_filter:
+        spec += f"&filter={','.join(hex(i) for i in ids[:len(ids) // 2])}"
+    return spec
+
+
+def run(worker, seconds, rate, use_filter):
+    configs = [parse_bus(bus_spec('pt', POWERTRAIN_IDS, rate, use_filter)),
+               parse_bus(bus_spec('body', BODY_IDS, rate, use_filter))]
+    buses = MultiBus(configs, worker).open()
+
+    delivered = [0]
+    out_of_order = [0]
+    last = [0.0]
+
+    def deliver(timestamp, size, frames):
+        if timestamp < last[0]:
+            out_of_order[0] += 1
+        last[0] = timestamp
+        delivered[0] += len(frames)
+
+    thread = threading.Thread(target=buses.run, args=(deliver,))
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    thread.start()
+    time.sleep(seconds)
+    buses.stop()
+    thread.join()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    stats = buses.stats
+    buses.close()
+
+    filtered = sum(bus['filtered'] for bus in stats.values())
+    print(f"{worker:>8} {'filtre' if use_filter else '-':>7} {delivered[0] / elapsed:>12,.0f} "
+          f"{filtered / elapsed:>12,.0f} {cpu / elapsed * 100:>9.0f}% {out_of_order[0]:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--rate', type=int, default=20000, help="bus başına frame/s")
+    args = parser.parse_args()
+
+    print(f"2 bus x {args.rate} frame/s, {args.seconds}s")
+    print(f"{'işçi':>8} {'filtre':>7} {'dispatch f/s':>12} {'filtrelenen/s':>12} {'ana CPU':>10} {'sıra dışı':>9}")
+    for use_filter in (False, True):
+        for worker in ('thread', 'process'):
+            run(worker, args.seconds, args.rate, use_filter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Donanım olmadan sürekli yük testi: SyntheticTransport -> CANReceiver
+# (select modu, FrameDecoder, dispatcher) -> VehicleModel (coalescing +
+# GUI timer). Üretilen/alınan frame hızı, çözücü istatistikleri ve ID başına
+# GUI'ye yayınlanan güncelleme sayıları raporlanır.
+#
+#   python3 benchmarks/bench_pipeline.py --rate 10000 --seconds 5
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from main import CANReceiver, CANReceiverThread
+from transport import SyntheticTransport
+from vehicle import VehicleModel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rate', type=float, default=5000, help="frame/s")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+
+    transport = SyntheticTransport(rate=args.rate, seed=1)
+    receiver = CANReceiver(transport)
+    vehicle = VehicleModel()
+    vehicle.attach(receiver.dispatcher)
+    thread = CANReceiverThread(receiver)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    thread.start()
+    QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    receiver.stop_receiving()
+    thread.wait()
+    transport.close()
+
+    decoder = receiver.decoder
+    print(f"üretilen={transport.generated} ({transport.generated / elapsed:,.0f}/s) "
+          f"çözülen={decoder.frames} ({decoder.frames / elapsed:,.0f}/s) "
+          f"atılan bayt={decoder.dropped_bytes}")
+    print(f"process CPU: {cpu:.2f}s / {elapsed:.2f}s ({100 * cpu / elapsed:.0f}%)")
+    for frame_id, stats in sorted(vehicle.frame_stats().items()):
+        print(f"  {hex(frame_id)}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# /dev/ttyUSB1 yerine bir pty çifti kullanarak CANReceiver'ın boşta CPU
+# kullanımını ve frame gecikmesini ölçer.
+#
+#   python3 benchmarks/bench_receive.py --mode select --idle 3 --frames 2000
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import tty
+
+import serial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import CANProtocol, CANReceiver
+
+
+def open_pty_pair():
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    port = serial.Serial(os.ttyname(slave), 2000000, timeout=1)
+    os.close(slave)
+    return master, port
+
+
+def measure(mode, idle_seconds, frame_count, gap):
+    master, port = open_pty_pair()
+    receiver = CANReceiver(port, receive_mode=mode)
+
+    arrivals = {}
+    done = threading.Event()
+
+    def on_frame(frame_id, length, data):
+        arrivals[int.from_bytes(data, 'big')] = time.perf_counter()
+        if len(arrivals) == frame_count:
+            done.set()
+
+    receiver.handle_frame = on_frame
+
+    cpu_box = {}
+
+    def run():
+        receiver.start_receiving()
+        cpu_box['cpu'] = time.thread_time()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+
+    # Boşta: hat sessizken ana thread uyur, process CPU süresinin tamamı alıcıya aittir
+    cpu_start = time.process_time()
+    time.sleep(idle_seconds)
+    idle_cpu = time.process_time() - cpu_start
+
+    protocol = CANProtocol()
+    sent = {}
+    for seq in range(frame_count):
+        packet = protocol.pack_can_frame(0x601, seq.to_bytes(4, 'big'))
+        sent[seq] = time.perf_counter()
+        os.write(master, packet)
+        if gap:
+            time.sleep(gap)
+    done.wait(5)
+
+    receiver.stop_receiving()
+    thread.join()
+    port.close()
+    os.close(master)
+
+    latencies = sorted((arrivals[seq] - sent[seq]) * 1e6 for seq in arrivals)
+    return idle_cpu, cpu_box.get('cpu', 0.0), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=['select', 'blocking'], default='select')
+    parser.add_argument('--idle', type=float, default=3.0, help="sessiz hat süresi (s)")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--gap', type=float, default=0.0005, help="frame'ler arası bekleme (s)")
+    args = parser.parse_args()
+
+    idle_cpu, total_cpu, latencies = measure(args.mode, args.idle, args.frames, args.gap)
+
+    print(f"mode={args.mode}")
+    print(f"idle CPU: {idle_cpu:.3f}s / {args.idle:.1f}s ({100 * idle_cpu / args.idle:.1f}%)")
+    print(f"receiver thread CPU toplam: {total_cpu:.3f}s")
+    if latencies:
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"latency us: median={statistics.median(latencies):.1f} "
+              f"p99={p99:.1f} max={latencies[-1]:.1f} ({len(latencies)}/{args.frames} frames)")
+    else:
+        print("hiç frame alınamadı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# GUI thread maliyeti: main.qml offscreen yüklenir, tipik bus hızlarında ve
+# gürültülü değerlerle (hızda ±1 km/h, sıcaklıkta ±0.1 °C titreşim, 15 cm
+# üstünde gezinen mesafe) frame'ler ayrı bir thread'den dispatcher'a verilir.
+# Saniye başına GUI thread CPU süresi (render dahil: QSG_RENDER_LOOP=basic),
+# QML'e giden notify sayısı ve çizilen kare sayısı raporlanır.
+#   idle     - frame yok (yol animasyonunun taban maliyeti)
+#   exact    - yalnızca değişen değerler yayınlanır (deadband kapalı)
+#   deadband - signals.json'daki deadband/bands/saturate ile
+#
+#   python3 benchmarks/bench_render.py --seconds 5
+
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('QSG_RENDER_LOOP', 'basic')  # render GUI thread'inde: ölçüme dahil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QGuiApplication
+from PySide6.QtQml import QQmlApplicationEngine
+
+from dispatch import FrameDispatcher
+from vehicle import VehicleModel
+
+WARMUP = 3.5  # açılış animasyonu (fullSequence)
+
+# frame_id -> saniyedeki frame
+BUS_RATES = {0x2601: 100, 0x2301: 50, 0x2801: 10, 0x2901: 20, 0x3001: 20, 0x3101: 50}
+
+
+def frame_source(t, rng):
+    # Zamanın fonksiyonu olarak gürültülü ham değerler
+    speed = 60 + 20 * math.sin(t / 4) + rng.choice((-1, 0, 1))
+    distance = 25 + 15 * math.sin(t / 3) + rng.randint(-2, 2)
+    blink = int(t * 1.5) % 2
+    return {
+        0x2601: int(speed) + 15,
+        0x2301: max(0, int(distance)),
+        0x2801: 250 + rng.choice((-1, 0, 1)),
+        0x2901: blink,
+        0x3001: 0,
+        0x3101: 1 if int(t / 5) % 2 else 0,
+    }
+
+
+def produce(dispatcher, stop, rates):
+    rng = random.Random(1)
+    start = time.perf_counter()
+    due = {frame_id: start for frame_id in rates}
+    while not stop.is_set():
+        now = time.perf_counter()
+        values = None
+        for frame_id, rate in rates.items():
+            if now >= due[frame_id]:
+                values = values or frame_source(now - start, rng)
+                dispatcher.dispatch(frame_id, 1, bytes((values[frame_id] & 0xFF,)))
+                due[frame_id] += 1.0 / rate
+        time.sleep(0.001)
+
+
+def run(app, mode, seconds, rate_scale):
+    dispatcher = FrameDispatcher(unknown=lambda *frame: None)
+    vehicle = VehicleModel(deadbands={} if mode == 'exact' else None)
+    vehicle.attach(dispatcher)
+
+    notifies = [0]
+    for name in ('speed', 'distance', 'temperature', 'leftSignal', 'rightSignal', 'brake'):
+        getattr(vehicle, name + 'Changed').connect(lambda: notifies.__setitem__(0, notifies[0] + 1))
+
+    engine = QQmlApplicationEngine()
+    engine.setOutputWarningsToStandardError(False)
+    context = engine.rootContext()
+    context.setContextProperty("vehicle", vehicle)
+    for name in ("canMessageModel", "canMetrics"):
+        context.setContextProperty(name, None)
+    engine.load(os.path.join(ROOT, "main.qml"))
+    window = engine.rootObjects()[0]
+    frames = [0]
+    window.frameSwapped.connect(lambda: frames.__setitem__(0, frames[0] + 1))
+
+    stop = threading.Event()
+    producer = None
+    if mode != 'idle':
+        rates = {frame_id: rate * rate_scale for frame_id, rate in BUS_RATES.items()}
+        producer = threading.Thread(target=produce, args=(dispatcher, stop, rates))
+        producer.start()
+
+    result = {}
+
+    def begin():
+        result['cpu'] = time.thread_time()
+        result['start'] = time.perf_counter()
+        result['notifies'] = notifies[0]
+        result['frames'] = frames[0]
+        QTimer.singleShot(int(seconds * 1000), app.quit)
+
+    QTimer.singleShot(int(WARMUP * 1000), begin)
+    app.exec()
+    elapsed = time.perf_counter() - result['start']
+    cpu = time.thread_time() - result['cpu']
+    stop.set()
+    if producer is not None:
+        producer.join()
+
+    received = sum(stats['received'] for stats in vehicle.frame_stats().values())
+    print(f"{mode:>9} {received / (elapsed + WARMUP):>9,.0f} {(notifies[0] - result['notifies']) / elapsed:>10.1f} "
+          f"{(frames[0] - result['frames']) / elapsed:>8.1f} {cpu / elapsed * 1000:>12.1f} "
+          f"{sum(vehicle.suppressed.values()):>10}")
+    engine.deleteLater()
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--rate-scale', type=float, default=1.0, help="BUS_RATES çarpanı")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv[:1])
+    print(f"{'mod':>9} {'frame/s':>9} {'notify/s':>10} {'kare/s':>8} {'GUI ms/s':>12} {'bastırılan':>10}")
+    for mode in ('idle', 'exact', 'deadband'):
+        run(app, mode, args.seconds, args.rate_scale)
+
+
+if __name__ == "__main__":
+    main()
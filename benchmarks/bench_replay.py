@@ -0,0 +1,63 @@
+# Bir CAN trace dosyasını donanım olmadan alım hattına (dispatcher +
+# VehicleModel) olabildiğince hızlı besleyip frames/sec ölçer.
+# Trace verilmezse sentetik bir kayıt oluşturulur.
+#
+#   python3 benchmarks/bench_replay.py [--trace drive.cantrace] [--frames 200000]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication
+
+from cantrace import TraceRecorder, TraceReplay
+from main import CANReceiver
+from vehicle import VehicleModel
+
+FRAME_IDS = (0x2301, 0x2601, 0x2801, 0x2901, 0x3001, 0x3101)
+
+
+def make_trace(path, frame_count):
+    recorder = TraceRecorder(path)
+    for seq in range(frame_count):
+        recorder.record(FRAME_IDS[seq % len(FRAME_IDS)], 1, bytes((seq & 0xFF,)))
+    recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trace')
+    parser.add_argument('--frames', type=int, default=200000)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+
+    path = args.trace
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic.cantrace")
+        make_trace(path, args.frames)
+
+    receiver = CANReceiver(None)
+    vehicle = VehicleModel()
+    vehicle.attach(receiver.dispatcher)
+    receiver.replay = TraceReplay(path)
+    receiver.replay_realtime = False
+
+    start = time.perf_counter()
+    receiver.start_receiving()
+    elapsed = time.perf_counter() - start
+    app.processEvents()
+
+    count = len(receiver.replay)
+    receiver.replay.close()
+    print(f"{count} frame, {elapsed:.3f}s, {count / elapsed:,.0f} frame/s")
+    for frame_id, stats in sorted(vehicle.frame_stats().items()):
+        print(f"  {hex(frame_id)}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# Bozuk akışta yeniden senkronizasyon: geçerli frame'lerden oluşan bir akışa
+# gürültü eklenir / bitler çevrilir / baytlar silinir, sonra çözücülere
+# read() boyutunda parçalar halinde verilir. Her çözücü için:
+#   kurtarılan - bozulmamış frame'lerden kaçı aynen çözüldü
+#   sahte      - akışta olmayan (bozuk veriden üretilmiş) frame sayısı
+#   CPU        - process_time
+#   resync     - senkron kaybı başına atılan bayt (medyan / max)
+#
+#   legacy   - eski döngü: hatada tampon bir bayt kaydırılıp kopyalanır
+#   variable - FrameDecoder (type/DLC kontrolü, find ile resync)
+#   fixed    - FixedFrameDecoder (20 baytlık checksum'lı format)
+#
+#   python3 benchmarks/bench_resync.py --frames 100000 --rate 0.001
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import FRAME_FORMATS
+from bench_decoder import legacy_parse
+
+CORRUPTIONS = ('noise', 'aa', 'flip', 'drop')
+BURST = 512
+
+
+def make_frames(count, rng):
+    ids = (0x2301, 0x2601, 0x2801, 0x2901, 0x3001, 0x3101, 0x123, 0x7FF)
+    frames = []
+    for _ in range(count):
+        frame_id = rng.choice(ids)
+        # Payload'larda 0xAA/0x55 sık olsun: sahte başlık ve sonlandırıcı
+        data = bytes(rng.choice((0xAA, 0x55, rng.randrange(256))) for _ in range(rng.randint(0, 8)))
+        frames.append((frame_id, data))
+    return frames
+
+
+def corrupt(frames, packer, mode, rate, rng):
+    # -> (akış, bozulmamış frame'ler)
+    out = bytearray()
+    intact = []
+    for frame_id, data in frames:
+        packet = bytearray(packer.pack(frame_id, data, frame_id > 0x7FF))
+        touched = False
+        if mode == 'noise' and rng.random() < rate * 20:
+            out += bytes(rng.randrange(256) for _ in range(rng.randint(1, 12)))
+        elif mode == 'aa' and rng.random() < rate * 20:
+            out += bytes((0xAA, rng.choice((0xC8, 0xAA, 0x08, 0xFF))))
+        elif mode == 'flip':
+            for i in range(len(packet)):
+                if rng.random() < rate:
+                    packet[i] ^= 1 << rng.randrange(8)
+                    touched = True
+        elif mode == 'drop':
+            for i in reversed(range(len(packet))):
+                if rng.random() < rate:
+                    del packet[i]
+                    touched = True
+        out += packet
+        if not touched:
+            intact.append((frame_id, data))
+    return bytes(out), intact
+
+
+def legacy_frames(chunks, losses):
+    # bench_decoder.legacy_decode, çözülen frame'leri ve kayıpları da döndürür
+    buffer = bytearray()
+    lost = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while True:
+            header_pos = buffer.find(0xAA)
+            if header_pos == -1:
+                lost += len(buffer)
+                buffer.clear()
+                break
+            if header_pos > 0:
+                lost += header_pos
+                buffer = buffer[header_pos:]
+            if len(buffer) < 2:
+                break
+            type_byte = buffer[1]
+            data_length = type_byte & 0x0F
+            min_len = 6 + data_length + 1 if (type_byte >> 5) & 0x01 else 4 + data_length + 1
+            if len(buffer) < min_len:
+                break
+            try:
+                frame_id, length, data = legacy_parse(buffer[:min_len])
+                buffer = buffer[min_len:]
+                if lost:
+                    losses.append(lost)
+                    lost = 0
+                yield frame_id, length, bytes(data)
+            except ValueError:
+                buffer = buffer[1:]
+                lost += 1
+
+
+def decoder_frames(decoder_cls):
+    def run(chunks, losses):
+        decoder = decoder_cls()
+        decoder.on_resync = lambda lost, reason: losses.append(lost)
+        for chunk in chunks:
+            yield from decoder.feed(chunk)
+    return run
+
+
+def measure(decode, stream, intact):
+    chunks = [stream[i:i + BURST] for i in range(0, len(stream), BURST)]
+    losses = []
+    start = time.process_time()
+    decoded = [(frame_id, data) for frame_id, dlc, data in decode(chunks, losses)]
+    cpu = time.process_time() - start
+
+    expected = Counter(intact)
+    got = Counter(decoded)
+    recovered = sum((expected & got).values())
+    false_frames = sum((got - expected).values())  # akışta bozulmamış hali olmayan frame'ler
+    return {
+        'recovered': recovered / len(intact) if intact else 1.0,
+        'false': false_frames,
+        'fps': len(decoded) / cpu if cpu else 0.0,
+        'cpu': cpu,
+        'resyncs': len(losses),
+        'lost_median': int(statistics.median(losses)) if losses else 0,
+        'lost_max': max(losses) if losses else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--rate', type=float, default=0.001, help="bayt başına bozulma olasılığı")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    frames = make_frames(args.frames, rng)
+    decoders = {
+        'legacy': ('variable', legacy_frames),
+        'variable': ('variable', decoder_frames(FRAME_FORMATS['variable'][0])),
+        'fixed': ('fixed', decoder_frames(FRAME_FORMATS['fixed'][0])),
+    }
+
+    print(f"{args.frames} frame, bozulma oranı {args.rate}")
+    print(f"{'bozulma':>8} {'çözücü':>9} {'kurtarılan':>11} {'sahte':>7} {'frame/s':>11} "
+          f"{'CPU s':>7} {'resync':>7} {'kayıp med/max B':>16}")
+    for mode in CORRUPTIONS:
+        streams = {}
+        for name, (frame_format, decode) in decoders.items():
+            if frame_format not in streams:
+                packer = FRAME_FORMATS[frame_format][1]()
+                streams[frame_format] = corrupt(frames, packer, mode, args.rate, random.Random(args.seed))
+            stream, intact = streams[frame_format]
+            result = measure(decode, stream, intact)
+            print(f"{mode:>8} {name:>9} {result['recovered']:>10.2%} {result['false']:>7} "
+                  f"{result['fps']:>11,.0f} {result['cpu']:>7.2f} {result['resyncs']:>7} "
+                  f"{result['lost_median']:>8}/{result['lost_max']}")
+
+
+if __name__ == "__main__":
+    main()
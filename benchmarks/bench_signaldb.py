@@ -0,0 +1,80 @@
+# Frame -> fiziksel değer çözme hızı (frame/s):
+#   hex      - eski yol: data.hex() sinyali + QML'de parseInt(hex, 16) ve ölçekleme
+#   frombytes - int.from_bytes + ID başına Python dönüşüm fonksiyonu
+#   signaldb - signals.json'dan derlenmiş struct çözücüler
+#
+# Isınma koşusundan sonra yöntemler sırayla --repeat kez koşulur ve her
+# yöntemin en iyi koşusu raporlanır (paylaşılan makinelerde tek koşu 2 kata
+# kadar oynayabiliyor).
+#
+#   python3 benchmarks/bench_signaldb.py --frames 500000 --repeat 7
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signaldb import default_signal_db
+
+# Eski main.qml / vehicle.py dönüşümleri
+LEGACY = {
+    0x2601: ('speed', lambda raw: max(0, raw - 15)),
+    0x2301: ('distance', lambda raw: raw),
+    0x2801: ('temperature', lambda raw: raw / 10),
+    0x2901: ('leftSignal', bool),
+    0x3001: ('rightSignal', bool),
+    0x3101: ('brake', bool),
+}
+
+
+def make_frames(count, seed=1):
+    rng = random.Random(seed)
+    ids = list(LEGACY)
+    return [(rng.choice(ids), bytes((rng.randrange(256),))) for _ in range(count)]
+
+
+def hex_roundtrip(frames):
+    for frame_id, data in frames:
+        name, convert = LEGACY[frame_id]
+        convert(int(data.hex(), 16))
+
+
+def frombytes(frames):
+    for frame_id, data in frames:
+        name, convert = LEGACY[frame_id]
+        convert(int.from_bytes(data, 'big'))
+
+
+def signaldb(frames):
+    decoders = {frame_id: message.decode for frame_id, message in default_signal_db().rx.items()}
+    for frame_id, data in frames:
+        decoders[frame_id](data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=5, help="yöntem başına koşu; en iyisi alınır")
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames)
+    methods = (hex_roundtrip, frombytes, signaldb)
+    for fn in methods:
+        fn(frames[:10000])  # ısınma: derleme, önbellekler
+    results = dict.fromkeys(fn.__name__ for fn in methods)
+    for _ in range(args.repeat):
+        for fn in methods:
+            start = time.perf_counter()
+            fn(frames)
+            rate = args.frames / (time.perf_counter() - start)
+            results[fn.__name__] = max(results[fn.__name__] or 0.0, rate)
+    for name, rate in results.items():
+        print(f"{name:>13}: {rate:>12,.0f} frame/s")
+    print(f"signaldb / hex: {results['signaldb'] / results['hex_roundtrip']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
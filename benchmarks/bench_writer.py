@@ -0,0 +1,78 @@
+# CANWriter gönderim yolunun paket/s karşılaştırması:
+#   legacy  - her komut için pack_can_frame + ayrı write (eski send_can_command)
+#   batched - FramePacker şablonları + tick başına tek write
+#
+# Seri port yerine yalnızca write çağrılarını sayan bir sahte port kullanılır.
+#
+#   python3 benchmarks/bench_writer.py --ticks 100000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import CANProtocol, FramePacker
+
+# Tipik bir send_loop tick'i: gaz, fren ve basılı tutulan iki buton
+TICK_COMMANDS = (
+    (138, (200).to_bytes(1, 'big')),
+    (139, (120).to_bytes(1, 'big')),
+    (130, (10).to_bytes(1, 'big')),
+    (136, (4).to_bytes(1, 'big')),
+)
+
+
+class NullPort:
+    is_open = True
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data)
+        return len(data)
+
+
+def legacy(port, ticks):
+    protocol = CANProtocol()
+    for _ in range(ticks):
+        for frame_id, data in TICK_COMMANDS:
+            packet = protocol.pack_can_frame(frame_id, data)
+            if packet and port and port.is_open:
+                port.write(packet)
+
+
+def batched(port, ticks):
+    packer = FramePacker()
+    for _ in range(ticks):
+        batch = bytearray()
+        for frame_id, data in TICK_COMMANDS:
+            packer.pack_into(batch, frame_id, data)
+        if port and port.is_open:
+            port.write(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=100000)
+    args = parser.parse_args()
+
+    packets = args.ticks * len(TICK_COMMANDS)
+    results = {}
+    for fn in (legacy, batched):
+        port = NullPort()
+        start = time.perf_counter()
+        fn(port, args.ticks)
+        elapsed = time.perf_counter() - start
+        results[fn.__name__] = packets / elapsed
+        print(f"{fn.__name__:>8}: {packets / elapsed:>12,.0f} paket/s, "
+              f"{port.writes} write, {port.bytes} bayt")
+    print(f"hızlanma: {results['batched'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
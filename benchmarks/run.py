@@ -0,0 +1,456 @@
+# Sıcak yolların regresyon takımı: sentetik veriyle, başsız (offscreen) çalışır.
+# Her ölçüm JSON'a yazılır ve baseline.json ile karşılaştırılır; frame/s gibi
+# "yüksek iyi" metrikler toleransın altına düşerse, gecikme yüzdelikleri
+# toleransın üstüne çıkarsa çıkış kodu 1 olur (CI bunu hata sayar).
+#
+#   pack          - CANProtocol.pack_can_frame
+#   parse         - CANReceiver.parse_can_packet (tek paket; canlı alım framing'de)
+#   framing       - FrameDecoder.feed (start_receiving döngüsü), read() parça
+#                   boyutu x bayt başına bozulma oranı matrisi
+#   gamepad       - CANWriter.handle_gamepad_event
+#   send_tick     - CANWriter.send_loop tick'i (zamanlayıcı + paketleme + flush)
+#   qml_delivery  - dispatch -> VehicleModel -> QML binding gecikmesi
+#
+# Takım --runs kez koşulur; karşılaştırılan değer metrik başına en iyi koşu,
+# baseline'a yazılan ise koşuların medyanıdır (tipik değer). Baseline makineye
+# özgüdür; CI makinesinde bir kez --update-baseline ile yeniden üretilmelidir.
+# Tolerans sırası: --tolerance, baseline kaydındaki "tolerance", benchmark'ın
+# @benchmark ile bildirdiği tür başına değer, en son KINDS varsayılanı.
+#
+#   python3 benchmarks/run.py                      # ölç, karşılaştır
+#   python3 benchmarks/run.py --quick --only framing
+#   python3 benchmarks/run.py --update-baseline --runs 5
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer, QUrl, Slot
+from PySide6.QtGui import QGuiApplication
+from PySide6.QtQml import QQmlComponent, QQmlEngine
+
+from dispatch import FrameDispatcher
+from main import CANReceiver, CANWriter
+from protocol import CANProtocol, FRAME_FORMATS
+from vehicle import VehicleModel
+from bench_resync import corrupt, make_frames
+from bench_writer import NullPort
+
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(HERE, 'results.json')
+
+# Metrik türü -> (birim, yön, varsayılan tolerans). Paylaşılan tek çekirdekli
+# makinelerde tek bir ölçüm koşudan koşuya 0.6x-1.8x oynayabiliyor; karşılaştırılan
+# değer koşuların en iyisi olduğundan bu gürültünün çoğu elenir. Benchmark'lar
+# kendi toleranslarını @benchmark ile verir: 2 kat yavaşlama her birinde
+# regresyondur. Adanmış bir runner'da --tolerance ile daha da sıkılaştırılabilir.
+KINDS = {
+    'rate': ('1/s', 'higher', 0.4),
+    'latency': ('us', 'lower', 0.9),
+}
+
+MIN_TIME = 0.1  # throughput tekrarı başına en kısa ölçüm süresi (s)
+
+CHUNK_SIZES = (64, 512, 4096)
+CORRUPTION_RATES = (0.0, 0.001, 0.01)
+
+# inputs paketi olayı; zaman damgası None: giriş gecikmesi ölçülmez
+GamepadEvent = namedtuple('GamepadEvent', 'code state timestamp')
+
+BENCHMARKS = {}
+TOLERANCES = {}  # benchmark -> {tür: tolerans}
+
+
+def benchmark(name, **tolerances):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        TOLERANCES[name] = tolerances
+        return fn
+    return register
+
+
+def default_tolerance(name, kind):
+    # "framing.chunk64...p50_us" -> framing benchmark'ının bu türdeki toleransı
+    return TOLERANCES.get(name.split('.', 1)[0], {}).get(kind, KINDS[kind][2])
+
+
+# === ÖLÇÜM === #
+class Results:
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, kind, value):
+        unit, better, _ = KINDS[kind]
+        self.metrics[name] = {'value': round(value, 3), 'unit': unit, 'better': better, 'kind': kind}
+
+    def add_percentiles(self, name, runs, percentiles=(50, 99)):
+        # runs: tekrar başına süre listeleri (ns); her yüzdelik için en iyi tekrar
+        runs = [sorted(samples) for samples in runs if samples]
+        for p in percentiles:
+            value = min(samples[min(len(samples) - 1, len(samples) * p // 100)] for samples in runs)
+            self.add(f"{name}.p{p}_us", 'latency', value / 1000)
+
+    def merge(self, other):
+        # Takımın tekrarlanan koşuları: metrik başına en iyi değer kalır;
+        # paylaşılan makinelerde gürültü yalnızca yavaşlatır
+        for name, metric in other.metrics.items():
+            current = self.metrics.get(name)
+            if current is None or (metric['value'] > current['value']) == (metric['better'] == 'higher'):
+                self.metrics[name] = metric
+
+    @classmethod
+    def median(cls, runs):
+        # Baseline için tipik değer: koşuların medyanı (şanslı bir koşu değil)
+        merged = cls()
+        for name, metric in runs[0].metrics.items():
+            values = sorted(run.metrics[name]['value'] for run in runs if name in run.metrics)
+            merged.metrics[name] = dict(metric, value=values[len(values) // 2])
+        return merged
+
+
+def best_rate(fn, count, repeat):
+    # fn() count işlem yapar; her tekrar en az MIN_TIME sürer, en iyi
+    # tekrarın işlem/s değeri alınır (paylaşılan makinelerde gürültüye karşı)
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIME:
+                break
+        best = max(best, calls * count / elapsed)
+    return best
+
+
+def timed_calls(fn, items, repeat):
+    # Tekrar başına çağrı süreleri (ns)
+    clock = time.perf_counter_ns
+    runs = []
+    for _ in range(repeat):
+        samples = []
+        append = samples.append
+        for item in items:
+            start = clock()
+            fn(item)
+            append(clock() - start)
+        runs.append(samples)
+    return runs
+
+
+# === BENCHMARKS === #
+@benchmark('pack', rate=0.4)
+def bench_pack(results, scale, repeat):
+    protocol = CANProtocol()
+    rng = random.Random(1)
+    frames = [(frame_id, bytes(rng.randrange(256) for _ in range(rng.randint(0, 8))), frame_id > 0x7FF)
+              for frame_id, _ in make_frames(int(20000 * scale), rng)]
+    pack = protocol.pack_can_frame
+
+    def run():
+        for frame_id, data, is_extended in frames:
+            pack(frame_id, data, is_extended)
+
+    results.add('pack.frames_per_s', 'rate', best_rate(run, len(frames), repeat))
+
+
+@benchmark('parse', rate=0.4, latency=0.9)
+def bench_parse(results, scale, repeat):
+    receiver = CANReceiver(None, receive_mode='blocking')
+    packer = FRAME_FORMATS['variable'][1]()
+    rng = random.Random(2)
+    packets = [packer.pack(frame_id, data, frame_id > 0x7FF) for frame_id, data in make_frames(int(20000 * scale), rng)]
+    parse = receiver.parse_can_packet
+
+    def run():
+        for packet in packets:
+            parse(packet)
+
+    results.add('parse.frames_per_s', 'rate', best_rate(run, len(packets), repeat))
+    results.add_percentiles('parse', timed_calls(parse, packets, repeat))
+
+
+@benchmark('framing', rate=0.3, latency=0.75)
+def bench_framing(results, scale, repeat):
+    frames = make_frames(int(50000 * scale), random.Random(3))
+    decoder_cls, packer_cls = FRAME_FORMATS['variable']
+    for rate in CORRUPTION_RATES:
+        stream, _ = corrupt(frames, packer_cls(), 'flip', rate, random.Random(3))
+        for size in CHUNK_SIZES:
+            chunks = [stream[i:i + size] for i in range(0, len(stream), size)]
+            decoder = decoder_cls()
+            decoded = [0]
+
+            def run():
+                decoder.reset()
+                count = 0
+                for chunk in chunks:
+                    for _ in decoder.feed(chunk):
+                        count += 1
+                decoded[0] = count
+
+            name = f"framing.chunk{size}.corrupt{rate:g}"
+            fps = best_rate(run, 1, repeat) * decoded[0]
+            results.add(f"{name}.frames_per_s", 'rate', fps)
+            decoder.reset()
+            results.add_percentiles(name, timed_calls(lambda chunk: sum(1 for _ in decoder.feed(chunk)), chunks, repeat))
+
+
+@benchmark('gamepad', rate=0.4, latency=0.9)
+def bench_gamepad(results, scale, repeat):
+    writer = CANWriter(NullPort())
+    # Trigger taraması, d-pad ve buton basış/bırakışları karışık
+    rng = random.Random(4)
+    events = []
+    for _ in range(int(20000 * scale)):
+        kind = rng.random()
+        if kind < 0.6:
+            events.append(GamepadEvent(rng.choice(('ABS_Z', 'ABS_RZ')), rng.randint(-32768, 32767), None))
+        elif kind < 0.8:
+            events.append(GamepadEvent(rng.choice(('ABS_HAT0X', 'ABS_HAT0Y')), rng.choice((-1, 0, 1)), None))
+        else:
+            events.append(GamepadEvent(rng.choice(('BTN_BASE2', 'BTN_BASE', 'BTN_WEST', 'BTN_NORTH')),
+                                       rng.choice((0, 1)), None))
+    handle = writer.handle_gamepad_event
+
+    def run():
+        for event in events:
+            handle(event)
+
+    results.add('gamepad.events_per_s', 'rate', best_rate(run, len(events), repeat))
+    results.add_percentiles('gamepad', timed_calls(handle, events, repeat))
+    writer.stop()
+
+
+@benchmark('send_tick', rate=0.4, latency=0.9)
+def bench_send_tick(results, scale, repeat):
+    # Gaz, fren ve iki buton basılı; sahte saat her okumada bir periyot
+    # ilerler, böylece send_loop hiç uyumadan tick üst üste çalışır
+    writer = CANWriter(NullPort())
+    ticks = int(20000 * scale)
+    now = [time.monotonic()]
+
+    def clock():
+        now[0] += writer.send_interval
+        return now[0]
+
+    writer.scheduler.clock = clock
+    for control, value in (('ABS_Z', 20000), ('ABS_RZ', 10000), ('BTN_BASE2', 1), ('BTN_NORTH', 1)):
+        writer.handle_gamepad_event(GamepadEvent(control, value, None))
+
+    samples = []
+    flush_tick = writer._flush_tick
+    last = [0]
+
+    def timed_flush():
+        flush_tick()
+        stamp = time.perf_counter_ns()
+        if last[0]:
+            samples.append(stamp - last[0])
+        last[0] = stamp
+        if len(samples) >= ticks:
+            writer.scheduler.stop()
+
+    writer._flush_tick = timed_flush
+    writer.send_loop()
+    # Tek uzun koşu tekrarlara bölünür; tick/s de en iyi parçadan (kısa bir
+    # kesinti tüm koşunun ortalamasını düşürmesin)
+    size = len(samples) // repeat
+    runs = [samples[i * size:(i + 1) * size] for i in range(repeat)]
+    results.add('send_tick.ticks_per_s', 'rate', max(len(run) * 1e9 / sum(run) for run in runs))
+    results.add_percentiles('send_tick', runs)
+
+
+class DeliveryProbe(QObject):
+    # QML binding'i her yeni hız değerinde mark() çağırır
+    def __init__(self, sent):
+        super().__init__()
+        self.sent = sent
+        self.samples = []
+
+    @Slot(int)
+    def mark(self, speed):
+        sent_at = self.sent.pop(speed, None)
+        if sent_at is not None:
+            self.samples.append(time.perf_counter_ns() - sent_at)
+
+
+QML_PROBE = b"""
+import QtQuick
+QtObject {
+    property int speed: vehicle.speed
+    onSpeedChanged: probe.mark(speed)
+}
+"""
+
+
+@benchmark('qml_delivery', rate=0.2, latency=0.9)
+def bench_qml_delivery(results, scale, repeat):
+    # Receiver thread'i yerine bir üretici thread 0x2601 frame'lerini
+    # dispatcher'a verir; ölçülen, dispatch anından QML'deki onSpeedChanged'e
+    # kadar geçen süre (GUI timer'ı ile birleştirme dahil, deadband kapalı)
+    app = QGuiApplication.instance()
+    dispatcher = FrameDispatcher(unknown=lambda *frame: None)
+    vehicle = VehicleModel(deadbands={})
+    vehicle.attach(dispatcher)
+
+    sent = {}
+    probe = DeliveryProbe(sent)
+    engine = QQmlEngine()
+    engine.rootContext().setContextProperty('vehicle', vehicle)
+    engine.rootContext().setContextProperty('probe', probe)
+    component = QQmlComponent(engine)
+    component.setData(QML_PROBE, QUrl())
+    root = component.create()
+    if root is None:
+        raise RuntimeError(component.errorString())
+
+    seconds = max(1.0, 4.0 * scale)
+    rate = 200  # frame/s
+    stop = threading.Event()
+
+    def produce():
+        raw = 16
+        interval = 1.0 / rate
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            raw = raw + 1 if raw < 255 else 16
+            sent[raw - 15] = time.perf_counter_ns()
+            dispatcher.dispatch(0x2601, 1, bytes((raw,)))
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    producer = threading.Thread(target=produce)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    producer.start()
+    start = time.perf_counter()
+    app.exec()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    producer.join()
+
+    if not probe.samples:
+        raise RuntimeError("QML'e hiç değer ulaşmadı")
+    results.add('qml_delivery.updates_per_s', 'rate', len(probe.samples) / elapsed)
+    results.add_percentiles('qml_delivery', [probe.samples])
+    # vehicle bu fonksiyonla birlikte silinir; binding null görmesin
+    root.deleteLater()
+    engine.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+# === BASELINE === #
+def compare(metrics, baseline, tolerance=None):
+    # -> [(metrik, değer, baseline, izin verilen sınır, durum)]
+    rows = []
+    for name, metric in metrics.items():
+        entry = baseline.get(name)
+        if entry is None:
+            rows.append((name, metric['value'], None, None, 'yeni'))
+            continue
+        allowed = tolerance
+        if allowed is None:
+            allowed = entry.get('tolerance', default_tolerance(name, metric['kind']))
+        reference = entry['value']
+        if metric['better'] == 'higher':
+            limit = reference * (1 - allowed)
+            status = 'REGRESYON' if metric['value'] < limit else 'ok'
+        else:
+            limit = reference * (1 + allowed)
+            status = 'REGRESYON' if metric['value'] > limit else 'ok'
+        rows.append((name, metric['value'], reference, limit, status))
+    return rows
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['metrics']
+    except FileNotFoundError:
+        return None
+
+
+def write_json(path, metrics, args):
+    document = {
+        'version': 1,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'quick': args.quick,
+        'runs': args.runs,
+        'metrics': metrics,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Protokol ve pipeline sıcak yolları için regresyon takımı")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="sonuç JSON dosyası")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="koşuların medyanını baseline olarak yaz (--runs 5 önerilir)")
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help="tüm metrikler için göreli tolerans (ör. 0.2); varsayılan baseline'daki değer")
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help="yalnızca bu benchmark")
+    parser.add_argument('--quick', action='store_true', help="daha az iterasyon (CI duman testi)")
+    parser.add_argument('--repeat', type=int, default=5, help="benchmark içi tekrar; en iyisi alınır")
+    parser.add_argument('--runs', type=int, default=3, help="takımın kaç kez koşulacağı; metrik başına en iyisi alınır")
+    args = parser.parse_args(argv)
+
+    # qml_delivery ve VehicleModel timer'ları için
+    app = QGuiApplication(sys.argv[:1])
+    app.setApplicationName('can-bench')
+    scale = 0.2 if args.quick else 1.0
+    results = Results()
+    runs = []
+    for run in range(args.runs):
+        current = Results()
+        for name in args.only or BENCHMARKS:
+            start = time.perf_counter()
+            BENCHMARKS[name](current, scale, args.repeat)
+            print(f"# {run + 1}/{args.runs} {name}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        results.merge(current)
+        runs.append(current)
+
+    write_json(args.output, results.metrics, args)
+    if args.update_baseline:
+        write_json(args.baseline, Results.median(runs).metrics, args)
+        print(f"baseline güncellendi: {args.baseline}")
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"baseline yok ({args.baseline}), karşılaştırma atlandı", file=sys.stderr)
+        baseline = {}
+    rows = compare(results.metrics, baseline, args.tolerance)
+    print(f"{'metrik':<42} {'değer':>14} {'baseline':>14} {'sınır':>14}  durum")
+    for name, value, reference, limit, status in rows:
+        print(f"{name:<42} {value:>14,.1f} {'-' if reference is None else f'{reference:,.1f}':>14} "
+              f"{'-' if limit is None else f'{limit:,.1f}':>14}  {status}")
+
+    regressions = [row for row in rows if row[4] == 'REGRESYON']
+    if regressions:
+        print(f"{len(regressions)} metrikte regresyon", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# === BOOT TIMING === #
+# Kontaktan ilk kareye kadar geçen sürenin aşama aşama dökümü.
+# mark() ana akıştaki ardışık aşamaları (bir önceki mark'tan bu yana),
+# span() ise paralel çalışan işleri (ör. seri port açma) kendi süresiyle kaydeder.
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+
+class BootTimer:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self._lock = threading.Lock()
+        self.phases = []  # (isim, başlangıç ofseti, süre) saniye
+
+    def _add(self, name, begin, end):
+        with self._lock:
+            self.phases.append((name, begin - self.start, end - begin))
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self._add(name, self._last, now)
+        self._last = now
+
+    @contextmanager
+    def span(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, begin, time.perf_counter())
+
+    def total(self):
+        with self._lock:
+            return max((offset + duration for _, offset, duration in self.phases), default=0.0)
+
+    def report(self):
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1] + phase[2])
+        return {
+            'total_ms': self.total() * 1000,
+            'phases': [
+                {'name': name, 'start_ms': offset * 1000, 'duration_ms': duration * 1000}
+                for name, offset, duration in phases
+            ],
+        }
+
+    def log_report(self):
+        report = self.report()
+        lines = [f"  {p['name']:<16} +{p['start_ms']:8.1f} ms  {p['duration_ms']:8.1f} ms" for p in report['phases']]
+        log.info("Açılış süresi %.1f ms:\n%s", report['total_ms'], "\n".join(lines))
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
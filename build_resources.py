@@ -0,0 +1,70 @@
+# === RESOURCE BUILD === #
+# --fast-boot için QML, font ve görselleri tek bir ikili kaynak dosyasına
+# (resources.rcc) paketler ve QML derleme önbelleğini önceden doldurur.
+#
+#   python build_resources.py            # resources.rcc + .qmlcache/
+#   python build_resources.py --no-cache # yalnızca resources.rcc
+#
+# qmlcachegen'in AOT çıktısı C++ olduğu için Python uygulamasına bağlanamaz;
+# onun yerine Qt'nin disk önbelleği (.qmlc) burada bir kez üretilir ve
+# main.py --fast-boot aynı dizini QML_DISK_CACHE_PATH olarak kullanır.
+# QML dosyaları değişince betiği yeniden çalıştırın.
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QRC_PATH = os.path.join(BASE_DIR, 'resources.qrc')
+RCC_PATH = os.path.join(BASE_DIR, 'resources.rcc')
+QML_CACHE_DIR = os.path.join(BASE_DIR, '.qmlcache')
+QML_FILES = ('main.qml', 'Road.qml', 'Debug.qml')
+
+
+def build_rcc(qrc=QRC_PATH, output=RCC_PATH):
+    rcc = shutil.which('pyside6-rcc')
+    if rcc is None:
+        raise SystemExit("pyside6-rcc bulunamadı (PySide6 kurulu mu?)")
+    # PNG/TTF zaten sıkıştırılmış; açılışta zlib maliyeti olmasın
+    subprocess.run([rcc, '--binary', '--no-compress', qrc, '-o', output], check=True)
+    print(f"{output}: {os.path.getsize(output) / 1024:.0f} KiB")
+
+
+def warm_qml_cache(rcc=RCC_PATH, cache_dir=QML_CACHE_DIR):
+    # QML derlemesi yalnızca QGuiApplication ile yapılabilir; pencere açılmasın
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ['QML_DISK_CACHE_PATH'] = cache_dir
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+
+    from PySide6.QtCore import QResource, QUrl
+    from PySide6.QtGui import QGuiApplication
+    from PySide6.QtQml import QQmlComponent, QQmlEngine
+
+    app = QGuiApplication(sys.argv[:1])
+    if not QResource.registerResource(rcc):
+        raise SystemExit(f"{rcc} yüklenemedi")
+    engine = QQmlEngine()
+    for name in QML_FILES:
+        # Component oluşturmak nesne yaratmadan derler ve .qmlc yazar
+        component = QQmlComponent(engine, QUrl('qrc:/' + name))
+        if component.isError():
+            raise SystemExit(f"{name}: {component.errorString()}")
+    del component, engine, app
+    print(f"{cache_dir}: {len(os.listdir(cache_dir))} derlenmiş QML dosyası")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fast-boot kaynaklarını derle")
+    parser.add_argument('--no-cache', action='store_true', help="QML disk önbelleğini doldurma")
+    args = parser.parse_args()
+
+    build_rcc()
+    if not args.no_cache:
+        warm_qml_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# === ASYNCIO I/O CORE === #
+# Seri port RX/TX, periyodik gönderim ve gamepad girişini tek bir asyncio
+# döngüsünde toplar. fd'ler add_reader ile izlenir; tüm write'lar döngü
+# thread'inden yapıldığı için porta sırayla yazılır. Döngü ya ayrı bir I/O
+# thread'inde (run_in_thread) ya da qasync ile Qt'nin ana döngüsünde çalışır.
+#
+# fileno'su olmayan portlar (ör. Windows COM) executor thread'ine düşer.
+# inputs paketinin okuması kesilemediği için o yedek yol daemon thread'dir.
+
+import asyncio
+import logging
+import threading
+
+from gamepad import EventReader
+
+log = logging.getLogger(__name__)
+
+
+class CanIoCore:
+    def __init__(self, receiver, writer):
+        self.receiver = receiver
+        self.writer = writer
+        self.loop = None
+        self._stopping = None
+        self._readers = []   # add_reader ile kaydedilen fd'ler
+        self._tasks = []
+        self._inputs = []
+        self._thread = None
+
+    # --- döngü içinde --- #
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        receiver = self.receiver
+
+        if (receiver.replay is not None or receiver.buses is not None
+                or not self._add_reader(receiver.serial_connection, self._on_serial_readable)):
+            # Kayıttan oynatma, multibus ya da fd'siz port: mevcut bloklanan döngü executor'da
+            self._tasks.append(self.loop.run_in_executor(None, receiver.start_receiving))
+        else:
+            receiver.running = True
+            receiver.decoder.reset()
+            log.info("CAN Receiver başlatıldı (asyncio)...")
+
+        self._tasks.append(asyncio.ensure_future(self.writer.send_loop_async()))
+        for reader in self._inputs:
+            self._start_input(reader)
+
+        await self._stopping.wait()
+        await self._shutdown()
+
+    def _add_reader(self, source, callback):
+        if source is None or not hasattr(source, 'fileno'):
+            return False
+        try:
+            fd = source.fileno()
+            self.loop.add_reader(fd, callback)
+        except (NotImplementedError, OSError, AttributeError):
+            return False  # add_reader desteklemeyen döngü (Windows Proactor)
+        self._readers.append(fd)
+        return True
+
+    def _remove_reader(self, fd):
+        if fd in self._readers:
+            self._readers.remove(fd)
+            self.loop.remove_reader(fd)
+
+    def _on_serial_readable(self):
+        receiver = self.receiver
+        ser = receiver.serial_connection
+        try:
+            chunk = ser.read(ser.in_waiting or 1)
+        except OSError as e:
+            receiver.metrics.errors['serial'] += 1
+            log.error("Seri port hatası: %s", e)
+            self._remove_reader(ser.fileno())
+            receiver.running = False
+            return
+        if chunk:
+            receiver.process_chunk(chunk)
+
+    def _start_input(self, reader):
+        handle_input = self.writer.handle_input
+
+        if isinstance(reader, EventReader):
+            def on_readable():
+                try:
+                    for control, value, timestamp in reader.poll(0):
+                        handle_input(control, value, timestamp)
+                except OSError as e:
+                    log.warning("Gamepad hatası: %s", e)
+                    self._remove_reader(reader.fileno())
+                    return
+                if reader.batcher.has_pending:
+                    # Debounce penceresi kapanınca bekleyen kenarı yayınla
+                    self.loop.call_later(reader.batcher.debounce, settle)
+
+            def settle():
+                for control, value, timestamp in reader.batcher.settle():
+                    handle_input(control, value, timestamp)
+
+            if self._add_reader(reader, on_readable):
+                return
+
+        # inputs paketi: okuma bloklanır, ayrı thread'de çalışsın
+        loop = self.loop
+        stopping = self._stopping
+
+        def blocking_loop():
+            while not stopping.is_set():
+                events = reader.poll(0.2)
+                if events:
+                    try:
+                        loop.call_soon_threadsafe(self._dispatch_inputs, events)
+                    except RuntimeError:
+                        return  # döngü kapandı
+
+        threading.Thread(target=blocking_loop, name='gamepad-inputs', daemon=True).start()
+
+    def _dispatch_inputs(self, events):
+        handle_input = self.writer.handle_input
+        for control, value, timestamp in events:
+            handle_input(control, value, timestamp)
+
+    async def _shutdown(self):
+        # Sıra: yeni veri almayı kes, bekleyen işleri bitir, son tick'i gönder
+        for fd in list(self._readers):
+            self._remove_reader(fd)
+        self.receiver.stop_receiving()
+        self.writer.stop()
+        if self._tasks:
+            results = await asyncio.gather(*self._tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    log.error("I/O görevi hata ile bitti: %r", result)
+        self._tasks.clear()
+        self.writer._flush_tick()
+        for reader in self._inputs:
+            reader.close()
+        log.info("I/O döngüsü durdu.")
+
+    # --- dışarıdan (herhangi bir thread) --- #
+    def add_input(self, reader):
+        # gamepad.open_gamepad() sonucu; döngü çalışıyorsa hemen bağlanır
+        self._inputs.append(reader)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._start_input, reader)
+
+    def stop(self):
+        if self.loop is not None and self._stopping is not None:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+    def run_in_thread(self):
+        # Kendi döngüsü olan tek bir I/O thread'i
+        started = threading.Event()
+
+        def target():
+            async def main():
+                started_task = asyncio.ensure_future(self.run())
+                await asyncio.sleep(0)
+                started.set()
+                await started_task
+            asyncio.run(main())
+
+        self._thread = threading.Thread(target=target, name='can-io')
+        self._thread.start()
+        started.wait()
+        return self._thread
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,109 @@
+# === CAN TRACE === #
+# Çözülmüş frame'lerin sabit boyutlu kayıtlarla tutulduğu ikili log.
+#
+#   dosya başlığı: b'CANTRC1\0'
+#   kayıt (22 bayt, little endian):
+#       uint64 timestamp_ns (time.monotonic_ns)
+#       uint32 frame_id
+#       uint8  dlc
+#       uint8  bayrak (şimdilik 0)
+#       8s     payload (sıfırla doldurulmuş)
+#
+# TraceRecorder kayıtları bir kuyruğa atar ve arka plandaki thread tamponlu
+# olarak diske yazar; alım döngüsü hiçbir zaman disk I/O'da beklemez.
+# TraceReplay dosyayı mmap ile açar ve frame'leri orijinal zamanlamayla ya da
+# olabildiğince hızlı geri besler.
+
+import mmap
+import queue
+import struct
+import threading
+import time
+
+TRACE_MAGIC = b'CANTRC1\0'
+RECORD = struct.Struct('<QIBB8s')
+
+
+class TraceRecorder:
+    def __init__(self, path, flush_interval=0.5, buffer_size=1 << 16):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._file.write(TRACE_MAGIC)
+        self._thread = threading.Thread(target=self._write_loop, name="TraceRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, frame_id, length, data):
+        # Alım thread'inden çağrılır: yalnızca kuyruğa ekler, bloklanmaz
+        self._queue.put((time.monotonic_ns(), frame_id, length, data))
+
+    __call__ = record
+
+    def _write_loop(self):
+        pack = RECORD.pack
+        write = self._file.write
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._file.flush()
+                continue
+            if item is None:
+                break
+            timestamp, frame_id, length, data = item
+            write(pack(timestamp, frame_id, length, 0, data))
+            self.recorded += 1
+        self._file.flush()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+
+class TraceReplay:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+            self.close()
+            raise ValueError(f"CAN trace dosyası değil: {path}")
+        self._stopped = threading.Event()
+
+    def __len__(self):
+        return (len(self._mmap) - len(TRACE_MAGIC)) // RECORD.size
+
+    def frames(self):
+        # (timestamp_ns, frame_id, dlc, data)
+        for timestamp, frame_id, dlc, _, data in RECORD.iter_unpack(
+                memoryview(self._mmap)[len(TRACE_MAGIC):len(TRACE_MAGIC) + len(self) * RECORD.size]):
+            yield timestamp, frame_id, dlc, data[:dlc]
+
+    def play(self, handler, realtime=True, speed=1.0):
+        # handler(frame_id, dlc, data); realtime=False ise beklemeden besler
+        self._stopped.clear()
+        start_wall = None
+        start_trace = None
+        count = 0
+        for timestamp, frame_id, dlc, data in self.frames():
+            if self._stopped.is_set():
+                break
+            if realtime:
+                if start_wall is None:
+                    start_wall, start_trace = time.monotonic_ns(), timestamp
+                delay = (timestamp - start_trace) / speed - (time.monotonic_ns() - start_wall)
+                if delay > 0 and self._stopped.wait(delay / 1e9):
+                    break
+            handler(frame_id, dlc, data)
+            count += 1
+        return count
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
@@ -0,0 +1,48 @@
+# === FRAME COALESCING === #
+# Receiver thread'i her frame için GUI thread'ine sinyal göndermek yerine
+# ID başına yalnızca en son değeri yazar; GUI tarafı ekran tazeleme hızında
+# (Road.qml'deki 16 ms timer ile aynı) tek bir anlık görüntü okur.
+#
+# Kilit kullanılmaz: yazıcı tek bir thread'dir ve her ID için (sıra, değer)
+# tuple'ını tek bir dict ataması ile yayınlar. Okuyucu sıra numarası
+# değişmeyen ID'leri atlar, böylece yarım kalmış bir güncelleme göremez.
+
+
+class FrameCoalescer:
+    def __init__(self):
+        self._latest = {}     # key -> (seq, value), yalnızca yazıcı thread günceller
+        self.received = {}    # key -> offer sayısı (yazıcı thread)
+        self.published = {}   # key -> drain ile yayınlanan sayısı (okuyucu thread)
+        self._applied = {}    # key -> son yayınlanan seq (okuyucu thread)
+
+    def offer(self, key, value):
+        seq = self.received.get(key, 0) + 1
+        self.received[key] = seq
+        self._latest[key] = (seq, value)
+
+    def drain(self):
+        # [(key, value), ...] son drain'den bu yana değişen ID'ler
+        updates = []
+        applied = self._applied
+        for key, (seq, value) in self._latest.copy().items():
+            if applied.get(key) != seq:
+                applied[key] = seq
+                self.published[key] = self.published.get(key, 0) + 1
+                updates.append((key, value))
+        return updates
+
+    def pending(self):
+        # Henüz yayınlanmamış güncellemesi olan ID sayısı (okuyucu thread)
+        applied = self._applied
+        return sum(1 for key, (seq, _) in self._latest.copy().items() if applied.get(key) != seq)
+
+    def stats(self):
+        result = {}
+        for key, received in self.received.copy().items():
+            published = self.published.get(key, 0)
+            result[key] = {
+                'received': received,
+                'published': published,
+                'coalesced': received - published,
+            }
+        return result
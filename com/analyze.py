@@ -0,0 +1,338 @@
+# Uzun sürüş kayıtlarının çevrimdışı analizi için NumPy tabanlı toplu çözücü.
+#
+# İki girdi biçimi desteklenir:
+#   raw   - adaptörden ham okunan bayt akışı (0xAA ... 0x55 çerçeveleri)
+#   trace - cantrace.py'nin ürettiği sabit boyutlu kayıt dosyası
+#
+# Dosya parça parça (varsayılan 64 MB) işlenir; her parçadaki tüm
+# standard/extended frame'ler tek bir vektörel geçişte bulunur ve sütunlar
+# (timestamp, offset, frame_id, dlc, payload, value) halinde döner. value
+# ham payload tamsayısıdır; ID istatistikleri signals.json'daki ölçek/ofset
+# uygulanmış fiziksel değer üzerinden (mesajın ilk sinyali) hesaplanır.
+# Ham akışta zaman damgası yoktur; bayt konumundan baud hızına göre tahmin
+# edilir (bayt başına 10 bit).
+#
+#   python3 com/analyze.py drive.bin --baud 2000000
+#   python3 com/analyze.py drive.cantrace --json
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cantrace import TRACE_MAGIC, RECORD
+from signaldb import DEFAULT_SIGNALS_PATH, load_signal_db
+
+TRACE_DTYPE = np.dtype([
+    ('timestamp_ns', '<u8'),
+    ('frame_id', '<u4'),
+    ('dlc', 'u1'),
+    ('flags', 'u1'),
+    ('data', 'u1', (8,)),
+])
+assert TRACE_DTYPE.itemsize == RECORD.size
+
+_BYTE_INDEX = np.arange(8)
+
+
+def payload_values(payload, dlc):
+    # Payload'ın ilk dlc baytını big-endian tamsayı olarak yorumla
+    # (QML'deki parseInt(dataHex, 16) ile aynı)
+    shifts = (dlc[:, None].astype(np.int64) - 1 - _BYTE_INDEX) * 8
+    mask = shifts >= 0
+    parts = payload.astype(np.uint64) << np.where(mask, shifts, 0).astype(np.uint64)
+    return np.where(mask, parts, 0).sum(axis=1, dtype=np.uint64)
+
+
+def signal_values(signal, payload, dlc, min_length=0):
+    # SignalDef'in derlenmiş çözücüsüyle aynı dönüşüm, vektörel; çözücünün
+    # reddedeceği kısa frame'ler NaN olur
+    if signal.payload:
+        if signal.endian == 'big':
+            raw = payload_values(payload, dlc)
+        else:
+            mask = _BYTE_INDEX < dlc[:, None]
+            parts = payload.astype(np.uint64) << (_BYTE_INDEX * 8).astype(np.uint64)
+            raw = np.where(mask, parts, 0).sum(axis=1, dtype=np.uint64)
+    else:
+        positions = np.arange(signal.size)
+        shifts = (positions[::-1] if signal.endian == 'big' else positions) * 8
+        field = payload[:, signal.byte:signal.end].astype(np.uint64) << shifts.astype(np.uint64)
+        raw = field.sum(axis=1, dtype=np.uint64)
+        if not signal.whole_field:
+            raw = (raw >> np.uint64(signal.bit)) & np.uint64((1 << signal.bits) - 1)
+    values = raw.astype(np.float64)
+    if signal.signed:
+        values = np.where(values >= 2.0 ** (signal.bits - 1), values - 2.0 ** signal.bits, values)
+    if signal.scale != 1:
+        divisor = 1 / signal.scale
+        values = values / int(divisor) if divisor.is_integer() else values * signal.scale
+    if signal.offset:
+        values = values + signal.offset
+    if signal.minimum is not None:
+        values = np.maximum(values, signal.minimum)
+    if signal.maximum is not None:
+        values = np.minimum(values, signal.maximum)
+    if signal.type == 'bool':
+        values = (values != 0).astype(np.float64)
+    elif signal.type == 'int' and signal.scale != 1:
+        values = np.round(values)
+    if min_length:
+        values[dlc < min_length] = np.nan
+    return values
+
+
+def _resolve_overlaps(starts, ends):
+    # Açgözlü seçim: bir önceki kabul edilen frame ile çakışan sonraki aday
+    # atılır. Çakışmalar nadir olduğundan birkaç vektörel tur yeterlidir.
+    keep = np.ones(len(starts), dtype=bool)
+    while True:
+        kept = np.flatnonzero(keep)
+        bad = starts[kept[1:]] < ends[kept[:-1]]
+        if not bad.any():
+            return keep
+        first_in_chain = bad & ~np.concatenate(([False], bad[:-1]))
+        keep[kept[1:][first_in_chain]] = False
+
+
+def decode_raw(buf, base_offset=0, final=False):
+    # buf: uint8 dizi. (sütunlar, tüketilen bayt sayısı) döner; tüketilmeyen
+    # kuyruk bir sonraki parçanın başına eklenmelidir.
+    #
+    # Sonuç protocol.FrameDecoder ile aynıdır: geçerli başlıklar (type üst
+    # bitleri 0b11, DLC <= 8) sırayla ve çakışmadan seçilir. Frame'i parçanın
+    # sonunu aşan ilk geçerli başlıkta durulur ve oradan taşınır; o noktadan
+    # sonraki adaylar (ör. yarım frame'in payload'ındaki 0xAA) kabul edilmez.
+    n = len(buf)
+    cand = np.flatnonzero(buf == 0xAA)
+
+    has_type = cand + 1 < n
+    type_byte = buf[np.minimum(cand + 1, max(n - 1, 0))]
+    dlc = type_byte & 0x0F
+    extended = (type_byte & 0x20) != 0
+    data_start = cand + np.where(extended, 6, 4)
+    tail = data_start + dlc
+
+    # type baytı henüz gelmemiş başlık da beklemede sayılır
+    header_ok = ~has_type | (((type_byte & 0xC0) == 0xC0) & (dlc <= 8))
+    complete = has_type & (tail < n)
+    ok = header_ok & ~complete
+    ok[complete] = header_ok[complete] & (buf[tail[complete]] == 0x55)
+    pending = ok & ~complete
+    cand, dlc, extended, data_start, tail, pending = \
+        cand[ok], dlc[ok], extended[ok], data_start[ok], tail[ok], pending[ok]
+
+    # Bekleyen başlık parçanın sonrasına kadar uzanır: ondan sonraki her aday
+    # onunla çakışır ve elenir
+    keep = _resolve_overlaps(cand, np.where(pending, n + 1, tail + 1))
+    carry_from = cand[keep & pending]
+    keep &= ~pending
+    cand, dlc, extended, data_start, tail = cand[keep], dlc[keep], extended[keep], data_start[keep], tail[keep]
+
+    b = buf.astype(np.uint32)
+    std_id = (b[np.minimum(cand + 2, n - 1)] << 8) | b[np.minimum(cand + 3, n - 1)]
+    ext_id = ((b[np.minimum(cand + 2, n - 1)] << 24) | (b[np.minimum(cand + 3, n - 1)] << 16)
+              | (b[np.minimum(cand + 4, n - 1)] << 8) | b[np.minimum(cand + 5, n - 1)])
+    frame_id = np.where(extended, ext_id, std_id).astype(np.uint32)
+
+    index = data_start[:, None] + _BYTE_INDEX
+    payload = np.where(_BYTE_INDEX < dlc[:, None], buf[np.minimum(index, n - 1)], 0).astype(np.uint8)
+
+    consumed = n if final or not len(carry_from) else int(carry_from[0])
+
+    columns = {
+        'offset': cand.astype(np.int64) + base_offset,
+        'frame_id': frame_id,
+        'dlc': dlc.astype(np.uint8),
+        'payload': payload,
+    }
+    return columns, consumed
+
+
+def iter_raw_chunks(path, chunk_size, baud):
+    carry = np.empty(0, dtype=np.uint8)
+    base_offset = 0
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size)
+            final = not data
+            buf = np.concatenate((carry, np.frombuffer(data, dtype=np.uint8))) if len(carry) else \
+                np.frombuffer(data, dtype=np.uint8)
+            columns, consumed = decode_raw(buf, base_offset, final)
+            columns['timestamp'] = columns['offset'] * (10.0 / baud)
+            columns['value'] = payload_values(columns['payload'], columns['dlc'])
+            yield columns
+            if final:
+                return
+            carry = buf[consumed:].copy()
+            base_offset += consumed
+
+
+def iter_trace_chunks(path, chunk_size):
+    records = np.memmap(path, dtype=TRACE_DTYPE, mode='r', offset=len(TRACE_MAGIC))
+    step = max(1, chunk_size // TRACE_DTYPE.itemsize)
+    first_ts = int(records['timestamp_ns'][0]) if len(records) else 0
+    for start in range(0, len(records), step):
+        chunk = records[start:start + step]
+        dlc = np.asarray(chunk['dlc'])
+        payload = np.asarray(chunk['data'])
+        yield {
+            'timestamp': (np.asarray(chunk['timestamp_ns']) - first_ts) / 1e9,
+            'offset': np.arange(start, start + len(chunk), dtype=np.int64),
+            'frame_id': np.asarray(chunk['frame_id']),
+            'dlc': dlc,
+            'payload': payload,
+            'value': payload_values(payload, dlc),
+        }
+
+
+class IdStatistics:
+    # ID başına parçalar arasında biriken istatistikler. signal_db verilirse
+    # min/max/ortalama tanımlı ID'lerde fiziksel değer üzerinden (payload
+    # sütunu gerekir), yoksa ham value sütunu üzerinden
+    def __init__(self, signal_db=None):
+        self.ids = {}
+        self.signal_db = signal_db
+
+    def update(self, columns):
+        # ID başına gruplama tek bir stabil sıralama ile yapılır; Python
+        # döngüsü yalnızca benzersiz ID'ler üzerinde döner
+        frame_ids = columns['frame_id']
+        if not len(frame_ids):
+            return
+        unique, inverse = np.unique(frame_ids, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        group = inverse[order]
+        ts = columns['timestamp'][order]
+        vs = columns['value'][order].astype(np.float64)
+
+        groups = len(unique)
+        counts = np.bincount(group, minlength=groups)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        if self.signal_db is not None:
+            self._decode_groups(vs, unique, starts, counts, columns['payload'][order], columns['dlc'][order])
+        valid = ~np.isnan(vs)
+        vmin = np.fmin.reduceat(vs, starts)
+        vmax = np.fmax.reduceat(vs, starts)
+        vsum = np.bincount(group, weights=np.where(valid, vs, 0.0), minlength=groups)
+        vcount = np.bincount(group, weights=valid, minlength=groups)
+
+        # Aynı ID'nin ardışık frame'leri arasındaki boşluklar
+        same = group[1:] == group[:-1]
+        gap_group = group[1:][same]
+        gaps = np.diff(ts)[same]
+        gap_count = np.bincount(gap_group, minlength=groups)
+        gap_sum = np.bincount(gap_group, weights=gaps, minlength=groups)
+        gap_sumsq = np.bincount(gap_group, weights=gaps * gaps, minlength=groups)
+        gap_max = np.zeros(groups)
+        np.maximum.at(gap_max, gap_group, gaps)
+
+        first_ts = ts[starts]
+        last_ts = ts[starts + counts - 1]
+        for i, frame_id in enumerate(unique.tolist()):
+            s = self.ids.get(frame_id)
+            if s is None:
+                s = self.ids[frame_id] = {
+                    'count': 0, 'values': 0, 'first_ts': float(first_ts[i]), 'last_ts': None,
+                    'min': float('inf'), 'max': float('-inf'), 'sum': 0.0,
+                    'gaps': 0, 'gap_sum': 0.0, 'gap_sumsq': 0.0, 'gap_max': 0.0,
+                }
+            elif s['last_ts'] is not None:
+                # Önceki parçanın son frame'i ile bu parçanın ilki arası
+                gap = float(first_ts[i]) - s['last_ts']
+                s['gaps'] += 1
+                s['gap_sum'] += gap
+                s['gap_sumsq'] += gap * gap
+                s['gap_max'] = max(s['gap_max'], gap)
+            s['count'] += int(counts[i])
+            s['last_ts'] = float(last_ts[i])
+            if vcount[i]:
+                s['values'] += int(vcount[i])
+                s['min'] = min(s['min'], float(vmin[i]))
+                s['max'] = max(s['max'], float(vmax[i]))
+                s['sum'] += float(vsum[i])
+            if gap_count[i]:
+                s['gaps'] += int(gap_count[i])
+                s['gap_sum'] += float(gap_sum[i])
+                s['gap_sumsq'] += float(gap_sumsq[i])
+                s['gap_max'] = max(s['gap_max'], float(gap_max[i]))
+
+    def _decode_groups(self, vs, unique, starts, counts, payload, dlc):
+        # Sıralı sütunlarda her ID ardışık bir dilim: toplam iş O(N)
+        rx = self.signal_db.rx
+        for i, frame_id in enumerate(unique.tolist()):
+            message = rx.get(frame_id)
+            if message is not None:
+                rows = slice(starts[i], starts[i] + counts[i])
+                vs[rows] = signal_values(message.signals[0], payload[rows], dlc[rows], message.min_length)
+
+    def summary(self):
+        result = {}
+        for frame_id, s in sorted(self.ids.items()):
+            duration = s['last_ts'] - s['first_ts']
+            gap_mean = s['gap_sum'] / s['gaps'] if s['gaps'] else 0.0
+            gap_var = s['gap_sumsq'] / s['gaps'] - gap_mean ** 2 if s['gaps'] else 0.0
+            result[hex(frame_id)] = {
+                'count': s['count'],
+                'rate_hz': (s['count'] - 1) / duration if duration > 0 else 0.0,
+                'min': s['min'] if s['values'] else None,
+                'max': s['max'] if s['values'] else None,
+                'mean': s['sum'] / s['values'] if s['values'] else None,
+                'period_ms': gap_mean * 1e3,
+                'jitter_ms': max(gap_var, 0.0) ** 0.5 * 1e3,
+                'max_gap_ms': s['gap_max'] * 1e3,
+            }
+        return result
+
+
+def _cell(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def detect_format(path):
+    with open(path, 'rb') as f:
+        return 'trace' if f.read(len(TRACE_MAGIC)) == TRACE_MAGIC else 'raw'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CAN kaydı toplu analizi")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=['auto', 'raw', 'trace'], default='auto')
+    parser.add_argument('--baud', type=int, default=2000000, help="ham akışta zaman tahmini için")
+    parser.add_argument('--chunk-mb', type=int, default=64)
+    parser.add_argument('--json', action='store_true', help="sonucu JSON olarak yaz")
+    parser.add_argument('--signals', default=DEFAULT_SIGNALS_PATH, metavar='PATH',
+                        help="fiziksel değerler için sinyal tanım dosyası (bkz. signaldb.py)")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path) if args.format == 'auto' else args.format
+    chunk_size = args.chunk_mb << 20
+    chunks = iter_trace_chunks(args.path, chunk_size) if fmt == 'trace' else \
+        iter_raw_chunks(args.path, chunk_size, args.baud)
+
+    stats = IdStatistics(load_signal_db(args.signals))
+    total = 0
+    for columns in chunks:
+        stats.update(columns)
+        total += len(columns['frame_id'])
+
+    summary = stats.summary()
+    if args.json:
+        print(json.dumps({'format': fmt, 'frames': total, 'ids': summary}, indent=2))
+        return
+
+    print(f"{args.path}: {fmt}, {total} frame")
+    print(f"{'ID':>10} {'adet':>10} {'Hz':>9} {'min':>8} {'max':>8} {'ort':>10} {'periyot ms':>11} {'jitter ms':>10}")
+    for frame_id, s in summary.items():
+        print(f"{frame_id:>10} {s['count']:>10} {s['rate_hz']:>9.1f} {_cell(s['min'], '.1f'):>8} "
+              f"{_cell(s['max'], '.1f'):>8} {_cell(s['mean'], '.2f'):>10} {s['period_ms']:>11.2f} "
+              f"{s['jitter_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,17 @@
+import os
+import sys
 import serial
 from pyjoystick.sdl2 import run_event_loop
 import threading
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport import open_transport
+
+# USB-CAN cihazının COM portu ya da transport (bkz. transport.py)
+PORT = sys.argv[1] if len(sys.argv) > 1 else 'COM6'
+
 # === CAN PROTOCOL SINIFI === #
 class CANProtocol:
     PACKET_HEADER = 0xaa
@@ -44,9 +53,9 @@ can_protocol_handler = CANProtocol()
 
 # === SERİ PORTU AÇ === #
 try:
-    ser = serial.Serial('COM6', 2000000, timeout=1)
+    ser = open_transport(PORT, 2000000, timeout=1)
     print("Port açıldı, joystick ile paket gönderimi başlıyor...")
-except serial.SerialException as e:
+except (serial.SerialException, OSError) as e:
     print(f"Port açılamadı: {e}")
     ser = None
 
@@ -93,7 +102,7 @@ def message_loop():
                     try:
                         ser.write(packet)
                         print(f"-> {key_name} için gönderildi: {packet.hex()}")
-                    except serial.SerialException as e:
+                    except (serial.SerialException, OSError) as e:
                         print(f"Seri porta yazılırken hata: {e}")
         time.sleep(0.1)  # 100ms
 
@@ -0,0 +1,207 @@
+# === DEBUG MESSAGE MODEL === #
+# Debug.qml için sabit kapasiteli halka tampon üzerinde bir liste modeli.
+# Receiver thread'i frame'leri yalnızca bir deque'ya ekler; GUI thread'i
+# 100 ms'de bir toplu olarak alır ve sadece satır ekleme/silme bildirimi
+# yayınlar. Zaman damgası ve hex metni satır ekranda gösterildiğinde üretilir.
+# Mesaj adları ve fiziksel değerler signals.json'dan gelir.
+
+import struct
+import time
+from collections import deque
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, Signal, Slot, Property, QByteArray
+
+from signaldb import default_signal_db
+
+TIMESTAMP_ROLE = Qt.UserRole + 1
+NAME_ROLE = Qt.UserRole + 2
+FRAME_ID_ROLE = Qt.UserRole + 3
+LENGTH_ROLE = Qt.UserRole + 4
+DATA_HEX_ROLE = Qt.UserRole + 5
+VALUE_ROLE = Qt.UserRole + 6
+
+
+def _decimal_value(signal_db, frame_id, data):
+    # Tanımlı mesajlarda fiziksel değer, diğerlerinde payload'ın tamsayı değeri
+    if frame_id in signal_db:
+        try:
+            values = signal_db.decode(frame_id, data)
+        except (struct.error, ValueError):
+            pass
+        else:
+            if len(values) == 1:
+                value = values[0][1]
+                return int(value) if isinstance(value, bool) else value
+            return ", ".join(f"{name}={value:g}" for name, value in values)
+    return int.from_bytes(data, 'big')
+
+
+class CanMessageModel(QAbstractListModel):
+    capacityChanged = Signal()
+    pausedChanged = Signal()
+    activeChanged = Signal()
+    filterChanged = Signal()
+
+    def __init__(self, capacity=1000, flush_interval_ms=100, parent=None, signal_db=None):
+        super().__init__(parent)
+        self.signal_db = signal_db if signal_db is not None else default_signal_db()
+        self._capacity = capacity
+        self._storage = [None] * capacity
+        self._head = 0   # en yeni kaydın bir sonrası
+        self._count = 0
+        self._pending = deque(maxlen=capacity)
+        self._paused = False
+        self._active = False
+        self._filter_ids = None  # None: tüm ID'ler
+        self._filter_text = ""
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self._flush)
+        self._timer.start()
+
+    # Receiver thread'inden çağrılır
+    def push(self, frame_id, length, data):
+        if not self._active or self._paused:
+            return
+        filter_ids = self._filter_ids
+        if filter_ids is not None and frame_id not in filter_ids:
+            return
+        self._pending.append((time.time(), frame_id, length, data))
+
+    @Slot()
+    def _flush(self):
+        if not self._pending:
+            return
+        batch = []
+        pending = self._pending
+        while pending:
+            batch.append(pending.popleft())
+        if len(batch) > self._capacity:
+            batch = batch[-self._capacity:]
+
+        parent = QModelIndex()
+        added = len(batch)
+        overflow = self._count + added - self._capacity
+        if overflow > 0:
+            first = self._count - overflow
+            self.beginRemoveRows(parent, first, self._count - 1)
+            self._count = first
+            self.endRemoveRows()
+
+        self.beginInsertRows(parent, 0, added - 1)
+        storage = self._storage
+        head = self._head
+        for record in batch:
+            storage[head] = record
+            head = (head + 1) % self._capacity
+        self._head = head
+        self._count += added
+        self.endInsertRows()
+
+    def _record(self, row):
+        return self._storage[(self._head - 1 - row) % self._capacity]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._count:
+            return None
+        timestamp, frame_id, length, data = self._record(index.row())
+        if role == TIMESTAMP_ROLE:
+            return time.strftime('%H:%M:%S', time.localtime(timestamp)) + f".{int(timestamp * 1000) % 1000:03d}"
+        if role == NAME_ROLE:
+            return self.signal_db.name(frame_id)
+        if role == FRAME_ID_ROLE:
+            return f"{frame_id:X}"
+        if role == LENGTH_ROLE:
+            return length
+        if role == DATA_HEX_ROLE or role == Qt.DisplayRole:
+            return data.hex()
+        if role == VALUE_ROLE:
+            return _decimal_value(self.signal_db, frame_id, data)
+        return None
+
+    def roleNames(self):
+        return {
+            TIMESTAMP_ROLE: QByteArray(b"timestamp"),
+            NAME_ROLE: QByteArray(b"name"),
+            FRAME_ID_ROLE: QByteArray(b"frameId"),
+            LENGTH_ROLE: QByteArray(b"length"),
+            DATA_HEX_ROLE: QByteArray(b"dataHex"),
+            VALUE_ROLE: QByteArray(b"value"),
+        }
+
+    @Slot()
+    def clear(self):
+        self.beginResetModel()
+        self._pending.clear()
+        self._storage = [None] * self._capacity
+        self._head = 0
+        self._count = 0
+        self.endResetModel()
+
+    def get_capacity(self):
+        return self._capacity
+
+    def set_capacity(self, capacity):
+        if capacity == self._capacity or capacity <= 0:
+            return
+        records = [self._record(row) for row in range(min(self._count, capacity))]
+        self.beginResetModel()
+        self._capacity = capacity
+        self._storage = [None] * capacity
+        self._pending = deque(self._pending, maxlen=capacity)
+        for i, record in enumerate(reversed(records)):
+            self._storage[i] = record
+        self._count = len(records)
+        self._head = self._count % capacity
+        self.endResetModel()
+        self.capacityChanged.emit()
+
+    capacity = Property(int, get_capacity, set_capacity, notify=capacityChanged)
+
+    def get_paused(self):
+        return self._paused
+
+    def set_paused(self, paused):
+        if paused != self._paused:
+            self._paused = paused
+            self.pausedChanged.emit()
+
+    paused = Property(bool, get_paused, set_paused, notify=pausedChanged)
+
+    def get_active(self):
+        return self._active
+
+    def set_active(self, active):
+        # Pencere kapalıyken receiver thread'inde hiçbir şey biriktirilmez
+        if active != self._active:
+            self._active = active
+            if not active:
+                self._pending.clear()
+            self.activeChanged.emit()
+
+    active = Property(bool, get_active, set_active, notify=activeChanged)
+
+    def get_filter(self):
+        return self._filter_text
+
+    def set_filter(self, text):
+        # "2601, 2301" gibi virgülle ayrılmış hex ID listesi; boş ise hepsi
+        if text == self._filter_text:
+            return
+        ids = set()
+        for item in text.replace(' ', '').split(','):
+            if not item:
+                continue
+            try:
+                ids.add(int(item, 16))
+            except ValueError:
+                return
+        self._filter_text = text
+        self._filter_ids = frozenset(ids) if ids else None
+        self.filterChanged.emit()
+
+    filter = Property(str, get_filter, set_filter, notify=filterChanged)
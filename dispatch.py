@@ -0,0 +1,64 @@
+# === FRAME DISPATCH === #
+# Frame ID -> handler tablosu. Alım döngüsü her frame için tek bir dict
+# araması yapar; handler'lar signals.json'dan derlenen çözücülerle
+# VehicleModel.attach tarafından kaydedilir. Kayıtsız ID'ler UnknownFrameSink'e
+# gider; ham frame'lerin tamamı debug konsolunda (CanMessageModel) görünür.
+
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class UnknownFrameSink:
+    # Tanınmayan ID'leri sayar, her frame'de log yazmak yerine
+    # en fazla `interval` saniyede bir özet basar.
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self.counts = {}
+        self.total = 0
+        self._last_report = 0.0
+
+    def __call__(self, frame_id, length, data):
+        self.counts[frame_id] = self.counts.get(frame_id, 0) + 1
+        self.total += 1
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            summary = ", ".join(f"{hex(i)}: {n}" for i, n in sorted(self.counts.items()))
+            log.warning("Bilinmeyen ID'ler (toplam %d): %s", self.total, summary)
+
+
+class FrameDispatcher:
+    def __init__(self, unknown=None):
+        self._handlers = {}
+        self.unknown = unknown if unknown is not None else UnknownFrameSink()
+
+    def register(self, frame_id: int, handler):
+        handlers = self._handlers.get(frame_id)
+        if handlers is None:
+            self._handlers[frame_id] = handler
+        elif isinstance(handlers, _FanOut):
+            handlers.handlers.append(handler)
+        else:
+            self._handlers[frame_id] = _FanOut([handlers, handler])
+
+    def unregister(self, frame_id: int):
+        self._handlers.pop(frame_id, None)
+
+    def ids(self):
+        return set(self._handlers)
+
+    def dispatch(self, frame_id, length, data):
+        self._handlers.get(frame_id, self.unknown)(frame_id, length, data)
+
+
+class _FanOut:
+    def __init__(self, handlers):
+        self.handlers = handlers
+
+    def __call__(self, frame_id, length, data):
+        for handler in self.handlers:
+            handler(frame_id, length, data)
+
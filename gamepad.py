@@ -0,0 +1,302 @@
+# === GAMEPAD STATE === #
+# Gamepad durumu string anahtarlı bir dict yerine Control enum'u ile
+# indekslenen sabit boyutlu bir listede tutulur. Tek yazıcı gamepad
+# thread'idir; her değişiklikte değişmez bir tuple (snapshot) yayınlanır.
+# Okuyucular (CANWriter gönderim thread'i) referansı tek seferde okuduğu için
+# kilit almadan tutarlı bir durum görür.
+
+import logging
+import os
+import select
+import struct
+from enum import IntEnum
+
+log = logging.getLogger(__name__)
+
+
+class Control(IntEnum):
+    A = 0         # BTN_BASE2
+    B = 1         # BTN_BASE
+    X = 2         # BTN_WEST
+    Y = 3         # BTN_NORTH
+    HAT_X = 4     # D-pad X axis
+    HAT_Y = 5     # D-pad Y axis
+    THROTTLE = 6  # Left trigger (Gaz)
+    BRAKE = 7     # Right trigger (Fren)
+
+
+# inputs paketinin olay adı -> Control
+EVENT_CODES = {
+    'BTN_BASE2': Control.A,
+    'BTN_BASE': Control.B,
+    'BTN_WEST': Control.X,
+    'BTN_NORTH': Control.Y,
+    'ABS_HAT0X': Control.HAT_X,
+    'ABS_HAT0Y': Control.HAT_Y,
+    'ABS_Z': Control.THROTTLE,
+    'ABS_RZ': Control.BRAKE,
+}
+
+BUTTONS = (Control.A, Control.B, Control.X, Control.Y)
+TRIGGERS = frozenset((Control.THROTTLE, Control.BRAKE))
+
+# Linux evdev (type, code) -> Control; linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+EVDEV_CODES = {
+    (EV_KEY, 0x127): Control.A,       # BTN_BASE2
+    (EV_KEY, 0x126): Control.B,       # BTN_BASE
+    (EV_KEY, 0x134): Control.X,       # BTN_WEST
+    (EV_KEY, 0x133): Control.Y,       # BTN_NORTH
+    (EV_ABS, 0x10): Control.HAT_X,    # ABS_HAT0X
+    (EV_ABS, 0x11): Control.HAT_Y,    # ABS_HAT0Y
+    (EV_ABS, 0x02): Control.THROTTLE, # ABS_Z
+    (EV_ABS, 0x05): Control.BRAKE,    # ABS_RZ
+}
+
+# Eski joystick arayüzü (/dev/input/jsN)
+JS_BUTTON = 0x01
+JS_AXIS = 0x02
+JS_INIT = 0x80
+
+DEBOUNCE = 0.02  # buton başına, olay zaman damgalarıyla (s)
+
+
+class GamepadState:
+    __slots__ = ('_values', 'snapshot')
+
+    def __init__(self):
+        self._values = [0] * len(Control)
+        self.snapshot = tuple(self._values)
+
+    def __getitem__(self, control):
+        return self._values[control]
+
+    def set(self, control, value):
+        # Yalnızca yazıcı thread çağırır; değer değiştiyse True döner
+        if self._values[control] == value:
+            return False
+        self._values[control] = value
+        self.snapshot = tuple(self._values)
+        return True
+
+    def any_pressed(self, controls=BUTTONS):
+        values = self._values
+        return any(values[control] == 1 for control in controls)
+
+
+# === INPUT BACKEND === #
+# Ham olaylar fd'den toplu okunur ve struct.iter_unpack ile tek geçişte çözülür.
+# Eksenler (trigger'lar) bir poll içinde son değere indirgenir; butonlar ve
+# d-pad ise buton başına, olayın kendi zaman damgasıyla debounce edilir.
+# poll() -> [(anahtar, değer, zaman damgası), ...]; anahtar mapping'deki değerdir
+# (CANWriter için Control, start.py için kendi etiketi).
+
+class InputBatcher:
+    def __init__(self, axes=TRIGGERS, debounce=DEBOUNCE):
+        self.axes = axes
+        self.debounce = debounce
+        self._state = {}
+        self._last_edge = {}
+        self._pending = {}  # debounce penceresinde gelen son ham değer
+
+    def process(self, events):
+        out = []
+        latest_axes = {}
+        axes = self.axes
+        last_ts = None
+        for key, value, timestamp in events:
+            last_ts = timestamp
+            if key in axes:
+                latest_axes[key] = (value, timestamp)
+            else:
+                self._edge(key, value, timestamp, out)
+        if last_ts is not None:
+            self._settle(out, last_ts)
+        for key, (value, timestamp) in latest_axes.items():
+            if self._state.get(key) != value:
+                self._state[key] = value
+                out.append((key, value, timestamp))
+        return out
+
+    def settle(self):
+        # Olay gelmeden en az bir debounce süresi geçti: bekleyenler kalıcı
+        out = []
+        self._settle(out, None)
+        return out
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    def _edge(self, key, value, timestamp, out):
+        last = self._last_edge.get(key)
+        if last is not None and timestamp - last < self.debounce:
+            # Sıçrama olabilir; son değer pencere kapanınca değerlendirilir
+            self._pending[key] = value
+            return
+        self._pending.pop(key, None)
+        if self._state.get(key) != value:
+            self._state[key] = value
+            self._last_edge[key] = timestamp
+            out.append((key, value, timestamp))
+
+    def _settle(self, out, now):
+        for key, value in list(self._pending.items()):
+            last = self._last_edge[key]
+            if now is not None and now - last < self.debounce:
+                continue
+            del self._pending[key]
+            if self._state.get(key) != value:
+                self._state[key] = value
+                # Boşta yerleşince zaman damgası pencerenin kapandığı an kabul edilir
+                self._last_edge[key] = last + self.debounce if now is None else now
+                out.append((key, value, self._last_edge[key]))
+
+
+class EventReader:
+    EVENT = None  # struct.Struct, alt sınıf belirler
+    READ_EVENTS = 64
+
+    def __init__(self, path, mapping=None, axes=TRIGGERS, debounce=DEBOUNCE):
+        # path bir int ise hazır fd olarak kullanılır (test/benchmark için pipe)
+        if isinstance(path, int):
+            self.fd = path
+        else:
+            self.fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        os.set_blocking(self.fd, False)
+        self.path = path
+        self.mapping = mapping
+        self.batcher = InputBatcher(axes, debounce)
+        self._partial = b''
+        self.events_read = 0
+
+    def fileno(self):
+        return self.fd
+
+    def decode(self, data):
+        raise NotImplementedError
+
+    def _drain(self):
+        chunks = [self._partial] if self._partial else []
+        size = self.EVENT.size * self.READ_EVENTS
+        while True:
+            try:
+                chunk = os.read(self.fd, size)
+            except BlockingIOError:
+                break
+            if not chunk:
+                if not chunks:
+                    raise OSError("Gamepad bağlantısı kesildi")
+                break
+            chunks.append(chunk)
+            if len(chunk) < size:
+                break
+        data = b''.join(chunks)
+        usable = len(data) - len(data) % self.EVENT.size
+        self._partial = data[usable:]
+        self.events_read += usable // self.EVENT.size
+        return data[:usable]
+
+    def poll(self, timeout=None):
+        # Bekleyen debounce varsa pencere kapanınca uyanıp onu yayınla
+        if self.batcher.has_pending:
+            timeout = self.batcher.debounce if timeout is None else min(timeout, self.batcher.debounce)
+        readable, _, _ = select.select((self.fd,), (), (), timeout)
+        if not readable:
+            return self.batcher.settle()
+        return self.batcher.process(self.decode(self._drain()))
+
+    def close(self):
+        if not isinstance(self.path, int):
+            os.close(self.fd)
+
+
+class EvdevReader(EventReader):
+    # struct input_event: timeval (long, long), __u16 type, __u16 code, __s32 value
+    EVENT = struct.Struct('llHHi')
+
+    def __init__(self, path, mapping=EVDEV_CODES, axes=TRIGGERS, debounce=DEBOUNCE):
+        super().__init__(path, mapping, axes, debounce)
+
+    def decode(self, data):
+        mapping = self.mapping
+        events = []
+        for sec, usec, type_, code, value in self.EVENT.iter_unpack(data):
+            if type_ == EV_SYN:
+                continue
+            key = (type_, code) if mapping is None else mapping.get((type_, code))
+            if key is not None:
+                events.append((key, value, sec + usec * 1e-6))
+        return events
+
+
+class JoystickReader(EventReader):
+    # struct js_event: __u32 time (ms), __s16 value, __u8 type, __u8 number
+    EVENT = struct.Struct('IhBB')
+
+    def __init__(self, path='/dev/input/js0', mapping=None, axes=frozenset(), debounce=DEBOUNCE):
+        super().__init__(path, mapping, axes, debounce)
+
+    def decode(self, data):
+        mapping = self.mapping
+        events = []
+        for time_ms, value, type_, number in self.EVENT.iter_unpack(data):
+            if type_ & JS_INIT:
+                continue  # açılışta gelen mevcut durum, kenar değil
+            key = (type_, number) if mapping is None else mapping.get((type_, number))
+            if key is not None:
+                events.append((key, value, time_ms * 1e-3))
+        return events
+
+
+class InputsReader:
+    # evdev olmayan sistemler için inputs paketi üzerinden aynı poll() arayüzü
+    def __init__(self, device, debounce=DEBOUNCE):
+        self.device = device
+        self.batcher = InputBatcher(TRIGGERS, debounce)
+
+    def poll(self, timeout=None):
+        # inputs okuması bloklanır; timeout uygulanamaz
+        events = [(EVENT_CODES[e.code], e.state, e.timestamp) for e in self.device.read() if e.code in EVENT_CODES]
+        return self.batcher.process(events)
+
+    def close(self):
+        pass
+
+
+def find_evdev_gamepad(devices_path='/proc/bus/input/devices'):
+    # js handler'ı olan ilk cihazın event düğümü
+    try:
+        with open(devices_path) as f:
+            blocks = f.read().split('\n\n')
+    except OSError:
+        return None
+    for block in blocks:
+        for line in block.splitlines():
+            if line.startswith('H: Handlers='):
+                handlers = line.split('=', 1)[1].split()
+                if any(h.startswith('js') for h in handlers):
+                    for h in handlers:
+                        if h.startswith('event'):
+                            return '/dev/input/' + h
+    return None
+
+
+def open_gamepad(path=None):
+    # Öncelik: verilen/bulunan evdev düğümü, yoksa inputs paketi; hiçbiri yoksa None
+    path = path or find_evdev_gamepad()
+    if path is not None:
+        try:
+            return EvdevReader(path)
+        except OSError as e:
+            # Yanlış --gamepad yolu ya da /dev/input izni; açılış durmasın
+            log.warning("Gamepad açılamadı (%s): %s", path, e)
+    try:
+        from inputs import devices
+    except ImportError:
+        return None
+    if devices.gamepads:
+        return InputsReader(devices.gamepads[0])
+    return None
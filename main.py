@@ -1,62 +1,66 @@
+import time
+from boot import BootTimer
+BOOT = BootTimer()  # doğrudan çalıştırmada import süresi de ölçülsün
+
+import argparse
+import logging
 import serial
 import threading
-import time
-from inputs import get_gamepad, devices
+import os
+import selectors
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from PySide6.QtCore import QObject, Signal, QThread, QTimer, QMutex
+from PySide6.QtCore import Qt, QObject, QThread, QResource
 from PySide6.QtGui import QGuiApplication
 from PySide6.QtQml import QQmlApplicationEngine
 
-import os
-
-# === CAN PROTOCOL === #
-class CANProtocol:
-    PACKET_HEADER = 0xaa
-    END_CODE = 0x55
-
-    FRAME_TYPE_STANDARD = 0b0 << 5
-    FRAME_TYPE_EXTENDED = 0b1 << 5
-    FRAME_FORMAT_DATA = 0b0 << 4
-    FRAME_FORMAT_REMOTE = 0b1 << 4
-    BASE_TYEP_BITS = 0b11000000
-
-    def pack_can_frame(self, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False) -> bytes:
-        if not (0 <= len(data) <= 8):
-            raise ValueError("Data length max 8 byte olabilir.")
-        if is_extended:
-            if not (0 <= frame_id < (1 << 29)):
-                raise ValueError(f"Extended Frame ID must be between 0 and {(1 << 29) - 1}.")
-        else:
-            if not (0 <= frame_id < (1 << 11)):
-                raise ValueError(f"Standard Frame ID must be between 0 and {(1 << 11) - 1}.")
+from protocol import CANProtocol, FRAME_FORMATS, acceptance_filter
+from dispatch import FrameDispatcher
+from vehicle import VehicleModel
+from scheduler import PeriodicScheduler
+from gamepad import Control, GamepadState, EVENT_CODES, BUTTONS, TRIGGERS, open_gamepad
+from cantrace import TraceRecorder, TraceReplay
+from transport import open_transport
+from signaldb import default_signal_db, load_signal_db, DEFAULT_SIGNALS_PATH
+from metrics import ReceiverMetrics, WriterMetrics, RateLimitedLog, MetricsBridge
 
-        tyep_byte = self.BASE_TYEP_BITS
-        tyep_byte |= self.FRAME_TYPE_EXTENDED if is_extended else self.FRAME_TYPE_STANDARD
-        tyep_byte |= self.FRAME_FORMAT_REMOTE if is_remote else self.FRAME_FORMAT_DATA
-        tyep_byte |= (len(data) & 0b00001111)
+from build_resources import RCC_PATH, QML_CACHE_DIR
 
-        packed_frame = bytearray([self.PACKET_HEADER, tyep_byte])
-        id_bytes = frame_id.to_bytes(4 if is_extended else 2, 'big')
-        packed_frame.extend(id_bytes)
-        packed_frame.extend(data)
-        packed_frame.append(self.END_CODE)
+BOOT.mark('imports')
 
-        return bytes(packed_frame)
+log = logging.getLogger(__name__)
+throttled_log = RateLimitedLog(log)
 
 # === CAN RECEIVER === #
 class CANReceiver(QObject):
-    canDistanceDataReceived = Signal(int, int, str)  # frame_id, length, data_hex
-    canMotorDataReceived = Signal(int, int, str)
-    canTempDataReceived = Signal(int, int, str)
-    canLeftSignalDataReceived = Signal(int, int, str)
-    canRightSignalDataReceived = Signal(int, int, str)
-    canBreakSignalDataReceived = Signal(int, int, str)
-
-    def __init__(self, serial_connection):
+    def __init__(self, serial_connection, receive_mode=None, frame_format='variable'):
         super().__init__()
         self.serial_connection = serial_connection
         self.running = False
 
+        # 'select': fd üzerinde selector ile bekle (POSIX)
+        # 'blocking': read(1) ile bloklan, sonra kalan baytları boşalt
+        if receive_mode is None:
+            receive_mode = 'select' if hasattr(serial_connection, 'fileno') else 'blocking'
+        if receive_mode not in ('select', 'blocking'):
+            raise ValueError(f"Bilinmeyen receive_mode: {receive_mode}")
+        self.receive_mode = receive_mode
+        self.recorder = None  # TraceRecorder: çözülen her frame'i kaydeder
+        self.monitor = None   # CanMessageModel.push: debug konsolu
+        self.replay = None    # TraceReplay: seri port yerine kayıttan besle
+        self.buses = None     # multibus.MultiBus: birden çok adaptörün birleşik akışı
+        self.replay_realtime = True
+        self._wake_r = None
+        self._wake_w = None
+        self.decoder = FRAME_FORMATS[frame_format][0]()
+        self.decoder.on_resync = self._on_resync
+        self.metrics = ReceiverMetrics()
+
+        # Gösterge değerleri VehicleModel.attach ile kaydedilen handler'lardan,
+        # debug konsolu monitor (CanMessageModel) üzerinden akar
+        self.dispatcher = FrameDispatcher()
+
     def parse_can_packet(self, packet):
         try:
             if len(packet) < 5:
@@ -67,6 +71,10 @@ class CANReceiver(QObject):
             type_byte = packet[1]
             frame_type = (type_byte >> 5) & 0x01
             data_length = type_byte & 0x0F
+            if type_byte & 0xC0 != 0xC0:
+                raise ValueError("Geçersiz type baytı")
+            if data_length > 8:
+                raise ValueError("DLC 8'den büyük")
 
             if frame_type == 0:  # Standard frame
                 if len(packet) < 4 + data_length + 1:
@@ -87,74 +95,125 @@ class CANReceiver(QObject):
             return frame_id, data_length, frame_data
 
         except Exception as e:
-            print(f"Parse hatası: {e}, Paket: {packet.hex()}")
+            throttled_log.warning('parse', "Parse hatası: %s, Paket: %s", e, packet.hex())
             raise
 
+    def handle_frame(self, frame_id, length, data):
+        self.metrics.frames.increment(frame_id)
+        if self.recorder is not None:
+            self.recorder.record(frame_id, length, data)
+        if self.monitor is not None:
+            self.monitor(frame_id, length, data)
+        self.dispatcher.dispatch(frame_id, length, data)
+
+    def _open_selector(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self.serial_connection.fileno(), selectors.EVENT_READ)
+        # stop_receiving() bu pipe'a yazarak select'i hemen uyandırır
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        return selector
+
+    def _close_selector(self, selector):
+        selector.close()
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    def _wait_and_read(self, selector):
+        # Veri gelene kadar CPU harcamadan bekle, sonra bekleyen her şeyi tek seferde oku
+        if selector is not None:
+            selector.select()
+            if not self.running:
+                return b''
+            return self.serial_connection.read(self.serial_connection.in_waiting or 1)
+
+        first = self.serial_connection.read(1)  # timeout'a kadar bloklanır
+        if not first:
+            return b''
+        waiting = self.serial_connection.in_waiting
+        return first + self.serial_connection.read(waiting) if waiting else first
+
     def start_receiving(self):
+        if self.replay is not None:
+            self.running = True
+            log.info("CAN Receiver kayıttan oynatılıyor: %s", self.replay.path)
+            count = self.replay.play(self.handle_frame, realtime=self.replay_realtime)
+            log.info("Kayıt bitti, %d frame oynatıldı.", count)
+            self.running = False
+            return
+
+        if self.buses is not None:
+            self.running = True
+            log.info("CAN Receiver %d bus'tan okuyor...", len(self.buses.workers))
+            self.buses.run(self._process_bus_chunk)
+            self.running = False
+            return
+
         self.running = True
-        self.buffer = bytearray()
-        print("CAN Receiver başlatıldı...")
+        self.decoder.reset()
+        log.info("CAN Receiver başlatıldı...")
 
-        while self.running:
+        selector = self._open_selector() if self.receive_mode == 'select' else None
+        try:
+            while self.running:
+                try:
+                    new_data = self._wait_and_read(selector)
+                    if new_data:
+                        self.process_chunk(new_data)
+                except (serial.SerialException, OSError) as e:
+                    self.metrics.errors['serial'] += 1
+                    log.error("Seri port hatası: %s", e)
+                    self.running = False
+        finally:
+            if selector is not None:
+                self._close_selector(selector)
+
+    def process_chunk(self, chunk):
+        # Bir read() parçasını çöz ve dağıt; thread döngüsü ve can_io.CanIoCore ortak kullanır
+        metrics = self.metrics
+        read_at = time.perf_counter_ns()
+        metrics.record_read(len(chunk))
+        self.dispatch_frames(self.decoder.feed(chunk))
+        # Okuma parçası başına bir örnek: read() dönüşü -> son handler
+        metrics.latency_us.record((time.perf_counter_ns() - read_at) // 1000)
+
+    def _process_bus_chunk(self, timestamp, size, frames):
+        # multibus: işçide çözülmüş parça; gecikme bus'taki read() anından ölçülür
+        metrics = self.metrics
+        metrics.record_read(size)
+        self.dispatch_frames(frames)
+        metrics.latency_us.record((time.monotonic() - timestamp) * 1e6)
+
+    def dispatch_frames(self, frames):
+        # (frame_id, dlc, data) dizisi; multibus birleşik akışı da buradan geçer
+        for frame_id, length, data in frames:
             try:
-                if self.serial_connection.in_waiting > 0:
-                    new_data = self.serial_connection.read(self.serial_connection.in_waiting)
-                    self.buffer.extend(new_data)
-
-                    while True:
-                        header_pos = self.buffer.find(0xAA)
-                        if header_pos == -1:
-                            self.buffer.clear()
-                            break
-
-                        if header_pos > 0:
-                            self.buffer = self.buffer[header_pos:]
-
-                        if len(self.buffer) < 2:
-                            break
-
-                        type_byte = self.buffer[1]
-                        data_length = type_byte & 0x0F
-                        frame_type = (type_byte >> 5) & 0x01
-
-                        min_len = 6 + data_length + 1 if frame_type else 4 + data_length + 1
-                        if len(self.buffer) < min_len:
-                            break
-
-                        try:
-                            frame_id, length, data = self.parse_can_packet(self.buffer[:min_len])
-
-                            if frame_id == 0x2301:
-                                self.canDistanceDataReceived.emit(frame_id, length, data.hex())
-                            elif frame_id == 0x2601:
-                                self.canMotorDataReceived.emit(frame_id, length, data.hex())
-                            elif frame_id == 0x2801:
-                                self.canTempDataReceived.emit(frame_id, length, data.hex())
-                            elif frame_id == 0x2901:
-                                self.canLeftSignalDataReceived.emit(frame_id, length, data.hex())
-                            elif frame_id == 0x3001:
-                                self.canRightSignalDataReceived.emit(frame_id, length, data.hex())
-                            elif frame_id == 0x3101:
-                                self.canBreakSignalDataReceived.emit(frame_id, length, data.hex())
-                            else:
-                                print(f"Bilinmeyen ID: {hex(frame_id)}")
-
-                            self.buffer = self.buffer[min_len:]
-
-                        except Exception as e:
-                            print(f"Paket işleme hatası: {e}")
-                            if len(self.buffer) > 1:
-                                self.buffer = self.buffer[1:]
-                            else:
-                                self.buffer.clear()
-                            continue
-
-            except serial.SerialException as e:
-                print(f"Seri port hatası: {e}")
-                self.running = False
+                self.handle_frame(frame_id, length, data)
+            except Exception as e:
+                self.metrics.errors['handler'] += 1
+                throttled_log.warning('handler', "Paket işleme hatası (ID %s): %s", hex(frame_id), e)
+
+    def _on_resync(self, lost, reason):
+        # Senkron kaybı başına tek kayıt; paket dökümü yok
+        self.metrics.resync_bytes.record(lost)
+        throttled_log.warning('resync', "Senkron kaybı: %d bayt atıldı (%s)", lost, reason)
 
     def stop_receiving(self):
         self.running = False
+        if self.replay is not None:
+            self.replay.stop()
+        elif self.buses is not None:
+            self.buses.stop()
+        elif self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b'\x00')
+            except OSError:
+                pass
+        elif self.receive_mode == 'blocking' and hasattr(self.serial_connection, 'cancel_read'):
+            self.serial_connection.cancel_read()
 
 class CANReceiverThread(QThread):
     def __init__(self, receiver):
@@ -165,207 +224,513 @@ class CANReceiverThread(QThread):
         self.receiver.start_receiving()
 
 class CANWriter(QObject):
-    def __init__(self, serial_connection):
+    # Control -> signals.json'daki tx mesajı; ID ve payload'lar oradan derlenir
+    BUTTON_MESSAGES = {
+        Control.A: 'ButtonA',
+        Control.B: 'ButtonB',
+        Control.X: 'ButtonX',
+        Control.Y: 'ButtonY',
+    }
+    RELEASE_MESSAGE = 'ButtonRelease'
+    DPAD_MESSAGES = {
+        (Control.HAT_X, -1): 'DpadLeft',
+        (Control.HAT_X, 1): 'DpadRight',
+        (Control.HAT_Y, -1): 'DpadUp',
+        (Control.HAT_Y, 1): 'DpadDown',
+    }
+    TRIGGER_MESSAGES = {Control.THROTTLE: ('Throttle', 'throttle'), Control.BRAKE: ('Brake', 'brake')}
+    TRIGGER_TASKS = {Control.THROTTLE: 'throttle', Control.BRAKE: 'brake'}
+
+    def __init__(self, serial_connection, signal_db=None, frame_format='variable'):
         super().__init__()
         self.serial_connection = serial_connection
+
+        # Sabit komut tabloları: Control -> (frame_id, payload)
+        db = signal_db if signal_db is not None else default_signal_db()
+        self.button_commands = {control: db.command(name)[:2] for control, name in self.BUTTON_MESSAGES.items()}
+        self.release_command = db.command(self.RELEASE_MESSAGE)[:2]
+        self.dpad_commands = {key: db.command(name)[:2] for key, name in self.DPAD_MESSAGES.items()}
+        # Trigger: (frame_id, değer -> payload)
+        self.trigger_encoders = {}
+        for control, (name, signal) in self.TRIGGER_MESSAGES.items():
+            message = db.message(name)
+            self.trigger_encoders[control] = (message.frame_id, message.encoder(signal))
+
         self.can_protocol = CANProtocol()
-        self.lock = QMutex()
+        self.packer = FRAME_FORMATS[frame_format][1](self.can_protocol)
+        self.metrics = WriterMetrics()
         self.running = True
-        
-        # Gamepad state tracking
-        self.current_state = {
-            'BTN_BASE2': 0,  # A button
-            'BTN_BASE': 0,   # B button
-            'BTN_WEST': 0,   # X button
-            'BTN_NORTH': 0,  # Y button
-            'ABS_HAT0X': 0,  # D-pad X axis
-            'ABS_HAT0Y': 0,  # D-pad Y axis
-            'ABS_Z': 0,      # Left trigger (Gaz)
-            'ABS_RZ': 0      # Right trigger (Fren)
-        }
-        
-        # Debounce tracking
-        self.last_event_time = 0
-        self.debounce_delay = 0.1  # 100ms
-        self.last_send_time = 0
+        # Gamepad olayları ve periyodik tick aynı porta farklı thread'lerden yazabilir
+        self._write_lock = threading.Lock()
+        self._input_timestamp = None  # gönderilmeyi bekleyen en eski girişin zamanı
+
+        # Gamepad state tracking; gamepad thread yazar, gönderim thread'i
+        # kilitsiz olarak self.state.snapshot okur
+        self.state = GamepadState()
+
+        # Debounce buton başına gamepad okuyucusunda yapılır (gamepad.InputBatcher)
         self.send_interval = 0.05  # 50ms
 
+        # Periyodik mesajlar; yalnızca ilgili trigger/buton aktifken çalışır
+        self._tick_batch = bytearray()
+        self.scheduler = PeriodicScheduler()
+        self.scheduler.add('throttle', self.send_interval, self._send_throttle, enabled=False)
+        self.scheduler.add('brake', self.send_interval, self._send_brake, enabled=False)
+        self.scheduler.add('buttons', self.send_interval, self._send_held_buttons, enabled=False)
+
     def handle_gamepad_event(self, event):
-        current_time = time.time()
-        
+        # inputs paketi olayları için
+        control = EVENT_CODES.get(event.code)
+        if control is not None:
+            self.handle_input(control, event.state, event.timestamp)
+
+    def handle_input(self, control, value, timestamp=None):
+        # Debounce edilmiş, eksenleri birleştirilmiş olay (gamepad.EventReader.poll)
+        if timestamp is not None and self._input_timestamp is None:
+            self._input_timestamp = timestamp
+
         # Trigger butonları için özel işleme
-        if event.code in ['ABS_Z', 'ABS_RZ']:
+        if control in TRIGGERS:
             # Trigger değerlerini normalize et (0-255 arası)
-            value = max(0, min(255, int((event.state + 32768) / 256)))
-            self.current_state[event.code] = value
-            self.last_event_time = current_time
+            value = (value + 32768) >> 8
+            value = 0 if value < 0 else 255 if value > 255 else value
+            if self.state.set(control, value):
+                self.scheduler.enable(self.TRIGGER_TASKS[control], value > 10)
             return
-            
-        if current_time - self.last_event_time < self.debounce_delay:
+
+        if not self.state.set(control, value):
             return
-            
-        if event.code in self.current_state and self.current_state[event.code] != event.state:
-            self.current_state[event.code] = event.state
-            self.last_event_time = current_time
-            
-            if event.code == "ABS_HAT0X":
-                self.process_dpad_x(event.state)
-            elif event.code == "ABS_HAT0Y":
-                self.process_dpad_y(event.state)
-            else:
-                self.process_button(event.code, event.state)
+
+        if control == Control.HAT_X:
+            self.process_dpad_x(value)
+        elif control == Control.HAT_Y:
+            self.process_dpad_y(value)
+        else:
+            self.process_button(control, value)
+            # Basış anında zaten gönderildi, tekrar bir periyot sonra başlar
+            self.scheduler.enable('buttons', self.state.any_pressed(), delay=self.send_interval)
 
     def process_dpad_x(self, state):
-        self.current_state['ABS_HAT0X'] = state
-        if state == -1:  # Left
-            self.send_can_command(132, (8).to_bytes(1, 'big'))
-        elif state == 1:  # Right
-            self.send_can_command(133, (7).to_bytes(1, 'big'))
+        command = self.dpad_commands.get((Control.HAT_X, state))
+        if command:
+            self.send_can_command(*command)
 
     def process_dpad_y(self, state):
-        self.current_state['ABS_HAT0Y'] = state
-        if state == -1:  # Up
-            self.send_can_command(134, (6).to_bytes(1, 'big'))
-        elif state == 1:  # Down
-            self.send_can_command(135, (5).to_bytes(1, 'big'))
-    
-    def process_button(self, button_code, state):
-        if button_code in ['BTN_BASE2', 'BTN_BASE', 'BTN_WEST', 'BTN_NORTH']:
-            if state == 1:  # Button pressed
-                if button_code == "BTN_BASE2":  # A
-                    self.send_can_command(130, (10).to_bytes(1, 'big'))
-                elif button_code == "BTN_BASE":  # B
-                    self.send_can_command(131, (9).to_bytes(1, 'big'))
-                elif button_code == "BTN_WEST":  # X
-                    self.send_can_command(136, (4).to_bytes(1, 'big'))
-                elif button_code == "BTN_NORTH":  # Y
-                    self.send_can_command(137, (3).to_bytes(1, 'big'))
-            elif state == 0:  # Button released
-                # Send a "release" command or stop sending for this button
-                self.send_can_command(140, (0).to_bytes(1, 'big'))  # Example release command
+        command = self.dpad_commands.get((Control.HAT_Y, state))
+        if command:
+            self.send_can_command(*command)
+
+    def process_button(self, control, state, batch=None):
+        command = self.button_commands.get(control)
+        if command is None:
+            return
+        if state == 1:  # Button pressed
+            self.send_can_command(*command, batch)
+        elif state == 0:  # Button released
+            # Send a "release" command or stop sending for this button
+            self.send_can_command(*self.release_command, batch)
 
     def send_loop(self):
-        while self.running:
-            current_time = time.time()
-            if current_time - self.last_send_time >= self.send_interval:
-                self.lock.lock()
-                try:
-                    # Trigger (gaz/fren) değerlerini sürekli gönder
-                    if self.current_state['ABS_Z'] > 10:  # Gaz (Left trigger)
-                        value = self.current_state['ABS_Z']
-                        self.send_can_command(138, value.to_bytes(1, 'big'))
-                        
-                    if self.current_state['ABS_RZ'] > 10:  # Fren (Right trigger)
-                        value = self.current_state['ABS_RZ']
-                        self.send_can_command(139, value.to_bytes(1, 'big'))
-                        
-                    # Diğer buton durumlarını kontrol et
-                    for btn, state in self.current_state.items():
-                        if btn in ['BTN_BASE2', 'BTN_BASE', 'BTN_WEST', 'BTN_NORTH'] and state == 1:
-                            self.process_button(btn, state)
-                            
-                finally:
-                    self.lock.unlock()
-                    self.last_send_time = current_time
-                    
-            time.sleep(0.01)  # Daha hassas kontrol
-
-    def send_can_command(self, frame_id, data):
+        # Bir sonraki deadline'a kadar uyur; aynı uyanışta üretilen frame'ler
+        # _flush_tick ile tek bir write olarak gider
+        self.scheduler.run(after_tick=self._flush_tick)
+
+    async def send_loop_async(self):
+        await self.scheduler.run_async(after_tick=self._flush_tick)
+
+    def _send_throttle(self):
+        # Gaz (Left trigger)
+        self._send_trigger(Control.THROTTLE)
+
+    def _send_brake(self):
+        # Fren (Right trigger)
+        self._send_trigger(Control.BRAKE)
+
+    def _send_trigger(self, control):
+        value = self.state.snapshot[control]
+        if value > 10:
+            frame_id, encode = self.trigger_encoders[control]
+            self.send_can_command(frame_id, encode(value), self._tick_batch)
+
+    def _send_held_buttons(self):
+        snapshot = self.state.snapshot
+        for control in BUTTONS:
+            if snapshot[control] == 1:
+                self.send_can_command(*self.button_commands[control], self._tick_batch)
+
+    def _flush_tick(self):
+        batch, self._tick_batch = self._tick_batch, bytearray()
+        self.flush(batch)
+
+    def send_jitter_stats(self):
+        # Periyodik mesaj başına deadline gecikmesi (ms)
+        return self.scheduler.jitter_stats()
+
+    def send_can_command(self, frame_id, data, batch=None):
+        # batch verilirse frame yalnızca tampona eklenir, flush() ile gönderilir
         try:
-            packet = self.can_protocol.pack_can_frame(frame_id, data)
-            if packet and self.serial_connection and self.serial_connection.is_open:
-                self.serial_connection.write(packet)
-                print(f"Sent: {frame_id} -> {packet.hex()}")
+            if batch is not None:
+                self.packer.pack_into(batch, frame_id, data)
+            else:
+                self._write(self.packer.pack(frame_id, data))
+            self.metrics.frames.increment(frame_id)
         except Exception as e:
-            print(f"Error sending CAN command: {e}")
+            self.metrics.errors += 1
+            throttled_log.warning('send', "Error sending CAN command: %s", e)
+
+    def flush(self, batch):
+        if not batch:
+            return
+        try:
+            self._write(batch)
+        except Exception as e:
+            self.metrics.errors += 1
+            throttled_log.warning('send', "Error sending CAN command: %s", e)
+
+    def _write(self, packet):
+        if self.serial_connection and self.serial_connection.is_open:
+            with self._write_lock:
+                self.serial_connection.write(packet)
+            self.metrics.record_write(len(packet))
+            timestamp = self._input_timestamp
+            if timestamp is not None:
+                # evdev/inputs zaman damgası gerçek saat (CLOCK_REALTIME)
+                self._input_timestamp = None
+                latency = time.time() - timestamp
+                if 0 <= latency < 10:
+                    self.metrics.input_latency_us.record(latency * 1e6)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Sent: %s", packet.hex())
 
     def stop(self):
         self.running = False
+        self.scheduler.stop()
 
 class GamepadThread(QThread):
-    def __init__(self, can_writer):
+    POLL_TIMEOUT = 0.2  # stop() en geç bu kadar sürede fark edilir
+
+    def __init__(self, can_writer, device=None):
         super().__init__()
         self.can_writer = can_writer
         self.running = True
-        self.gamepad = None
-        
-        # Gamepad bağlantısını kontrol et
-        if not devices.gamepads:
-            print("No gamepad found!")
+
+        # Gamepad bağlantısını kontrol et (evdev, yoksa inputs paketi)
+        self.gamepad = open_gamepad(device)
+        if self.gamepad is None:
+            log.warning("No gamepad found!")
         else:
-            self.gamepad = devices.gamepads[0]
-            print(f"Gamepad found: {self.gamepad}")
+            log.info("Gamepad found: %s", getattr(self.gamepad, 'path', None) or self.gamepad.device)
 
     def run(self):
-        print("Gamepad thread started")
+        log.info("Gamepad thread started")
+        handle_input = self.can_writer.handle_input
         while self.running:
             try:
                 if self.gamepad:
-                    events = self.gamepad.read()
-                    for event in events:
-                        self.can_writer.handle_gamepad_event(event)
+                    for control, value, timestamp in self.gamepad.poll(self.POLL_TIMEOUT):
+                        handle_input(control, value, timestamp)
                 else:
                     time.sleep(1)  # Gamepad yoksa bekle
             except Exception as e:
-                print(f"Gamepad error: {e}")
+                throttled_log.warning('gamepad', "Gamepad error: %s", e)
                 time.sleep(1)
+        if self.gamepad:
+            self.gamepad.close()
 
     def stop(self):
         self.running = False
 
-def main():
-    # Seri portu aç
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CAN gösterge paneli")
+    parser.add_argument('--port', default='/dev/ttyUSB1',
+                        help="seri port ya da transport: pty, loopback, synthetic?rate=5000 (bkz. transport.py)")
+    parser.add_argument('--baud', type=int, default=2000000)
+    parser.add_argument('--record', metavar='PATH', help="çözülen frame'leri ikili trace dosyasına kaydet")
+    parser.add_argument('--replay', metavar='PATH', help="seri port yerine trace dosyasını oynat")
+    parser.add_argument('--replay-fast', action='store_true', help="kaydı beklemeden, olabildiğince hızlı oynat")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="DEBUG gönderilen her paketi de yazar")
+    parser.add_argument('--metrics-interval', type=float, default=30.0, metavar='SEC',
+                        help="metrik özetinin log'a yazılma aralığı (0: kapalı)")
+    parser.add_argument('--fast-boot', action='store_true',
+                        help="QML'i resources.rcc + derlenmiş önbellekten yükle, seri portu paralel aç "
+                             "(önce: python build_resources.py)")
+    parser.add_argument('--bus', action='append', metavar='NAME=URL',
+                        help="adaptör başına bir bus (tekrarlanabilir), --port yerine; "
+                             "URL'de ?filter=0x2601,0x2801 ile bus başına ID filtresi")
+    parser.add_argument('--bus-worker', choices=['thread', 'process'], default='thread',
+                        help="bus okuyucuları: thread ya da ayrı süreç (çok çekirdek)")
+    parser.add_argument('--tx-bus', metavar='NAME', help="gönderimlerin yapılacağı bus (varsayılan: ilk --bus)")
+    parser.add_argument('--can-bitrate', type=int, choices=sorted(CANProtocol.BITRATE_CODES),
+                        help="verilirse açılışta adaptöre bu CAN hızı ve abone olunan ID'lerin kabul "
+                             "filtresiyle ayar komutu gönderilir (varsayılan: adaptör ayarına dokunma)")
+    parser.add_argument('--no-hw-filter', action='store_true',
+                        help="--can-bitrate ile birlikte: filtreyi açık bırak, tüm ID'leri al "
+                             "(debug konsolunda bilinmeyen ID'leri görmek için)")
+    parser.add_argument('--frame-format', choices=sorted(FRAME_FORMATS), default='variable',
+                        help="adaptör çerçeve formatı; fixed: 20 baytlık checksum'lı sabit çerçeve")
+    parser.add_argument('--signals', default=DEFAULT_SIGNALS_PATH, metavar='PATH',
+                        help="sinyal tanım dosyası (araç varyantı), bkz. signaldb.py")
+    parser.add_argument('--io', choices=['asyncio', 'qasync', 'threads'], default='asyncio',
+                        help="asyncio: tek I/O thread'i, qasync: Qt ana döngüsü (qasync gerekir), "
+                             "threads: RX/TX/gamepad için ayrı thread'ler")
+    parser.add_argument('--gamepad', metavar='DEV', help="evdev düğümü (varsayılan: ilk joystick, /proc/bus/input/devices)")
+    parser.add_argument('--boot-report', metavar='PATH', help="açılış aşama sürelerini JSON olarak yaz")
+    # Qt'nin kendi argümanları (-platform offscreen vb.) QGuiApplication'a kalır
+    return parser.parse_known_args(argv)
+
+
+def open_serial(args, boot):
+    with boot.span('serial_open'):
+        try:
+            ser = open_transport(args.port, args.baud, timeout=1)
+        except (serial.SerialException, OSError, ValueError) as e:
+            log.error("Seri port açılamadı: %s", e)
+            return None
+    log.info("Seri port açıldı.")
+    if hasattr(ser, 'peer_name'):
+        log.info("pty karşı ucu: %s", ser.peer_name)
+    return ser
+
+
+def open_buses(args, boot, id_filter=None):
+    from multibus import MultiBus, parse_bus
+    with boot.span('serial_open'):
+        buses = None
+        try:
+            configs = [parse_bus(spec, args.baud, args.frame_format) for spec in args.bus]
+            # Çözücüler worker'larda (süreç kipinde alt süreçte) kurulur: yazılım filtresi açmadan önce
+            for config in configs:
+                if config.ids is None:
+                    config.ids = id_filter
+            buses = MultiBus(configs, args.bus_worker).open()
+            return buses, buses.port(args.tx_bus)
+        except (OSError, ValueError) as e:
+            log.error("Bus açılamadı: %s", e)
+            if buses is not None:
+                buses.close()
+            return None, None
+
+
+def configure_adapter(port, args, frame_ids, name="Adaptör"):
+    # Ayar komutu: CAN hızı + abone olunan ID'lerden hesaplanan kabul filtresi (None: açık filtre)
+    filter_id, mask, is_extended = acceptance_filter(frame_ids or ())
+    command = CANProtocol().pack_setting_frame(args.can_bitrate, filter_id, mask, is_extended,
+                                               fixed_format=args.frame_format == 'fixed')
+    try:
+        port.write(command)
+    except (serial.SerialException, OSError) as e:
+        log.warning("%s ayarlanamadı: %s", name, e)
+        return False
+    log.info("%s ayarlandı: %d kbit/s, filtre %s maske %s (%d ID)", name, args.can_bitrate // 1000,
+             hex(filter_id), hex(mask), len(frame_ids or ()))
+    return True
+
+
+def close_ports(ser, buses):
+    if buses is not None:
+        buses.close()
+        log.info("Bus'lar kapatıldı.")
+    elif ser and ser.is_open:
+        ser.close()
+        log.info("Seri port kapatıldı.")
+
+
+def qml_source(fast_boot):
+    # fast-boot: tek bir mmap'lenebilir .rcc ve önceden doldurulmuş .qmlc önbelleği
+    if fast_boot:
+        if QResource.registerResource(RCC_PATH):
+            return "qrc:/main.qml"
+        log.warning("%s yok, QML dosyadan yükleniyor (python build_resources.py)", RCC_PATH)
+    return "main.qml"
+
+
+def main(argv=None, boot=None):
+    boot = boot or BOOT
+    args, qt_args = parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
     try:
-        ser = serial.Serial('/dev/ttyUSB1', 2000000, timeout=1)
-        print("Seri port açıldı.")
-    except serial.SerialException as e:
-        print(f"Seri port açılamadı: {e}")
+        signal_db = load_signal_db(args.signals)
+    except (OSError, ValueError, KeyError) as e:
+        log.error("Sinyal tanımları yüklenemedi (%s): %s", args.signals, e)
         return
 
+    if args.fast_boot and os.path.isdir(QML_CACHE_DIR):
+        os.environ.setdefault('QML_DISK_CACHE_PATH', QML_CACHE_DIR)
+
+    # Seri portu aç (kayıttan oynatmada gerekmez); fast-boot'ta QML yüklenirken arka planda açılır
+    ser = None
+    pending_serial = None
+    buses = None
+    # Adaptör ayarı isteğe bağlı: yalnızca --can-bitrate verilince gönderilir
+    configure = args.can_bitrate is not None and not args.replay
+    id_filter = VehicleModel.frame_ids(signal_db) if configure and not args.no_hw_filter else None
+    if args.bus and not args.replay:
+        buses, ser = open_buses(args, boot, id_filter)
+        if buses is None:
+            return
+    elif not args.replay:
+        if args.fast_boot:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='serial-open')
+            pending_serial = executor.submit(open_serial, args, boot)
+            executor.shutdown(wait=False)
+        else:
+            ser = open_serial(args, boot)
+            if ser is None:
+                return
+    boot.mark('args')
+
     # PySide uygulaması başlat
-    app = QGuiApplication()
+    app = QGuiApplication(sys.argv[:1] + qt_args)
+    boot.mark('qt_app')
+
+    # Gösterge değerleri
+    vehicle = VehicleModel(signal_db=signal_db)
+
+    # QML engine setup; debug modeli ve metrikler ilk kareden sonra bağlanır
+    engine = QQmlApplicationEngine()
+    context = engine.rootContext()
+    context.setContextProperty("vehicle", vehicle)
+    context.setContextProperty("canMessageModel", None)
+    context.setContextProperty("canMetrics", None)
+    engine.load(qml_source(args.fast_boot))
+    boot.mark('qml_load')
+
+    if not engine.rootObjects():
+        if pending_serial is not None:
+            ser = pending_serial.result()  # arka planda açılan portu da kapat
+        close_ports(ser, buses)
+        return -1
+
+    if pending_serial is not None:
+        ser = pending_serial.result()
+        boot.mark('serial_wait')
+        if ser is None:
+            return
 
     # CANReceiver ve thread'i oluştur
-    can_receiver = CANReceiver(ser)
-    receiver_thread = CANReceiverThread(can_receiver)
-    receiver_thread.start()
+    can_receiver = CANReceiver(ser, frame_format=args.frame_format)
+    can_receiver.buses = buses
+    if args.replay:
+        can_receiver.replay = TraceReplay(args.replay)
+        can_receiver.replay_realtime = not args.replay_fast
+    if args.record:
+        can_receiver.recorder = TraceRecorder(args.record)
+    vehicle.attach(can_receiver.dispatcher)
+
+    # Donanım kabul filtresi: yalnızca abone olunan ID'ler USB'den gelsin.
+    # Maske kapsamı tam olmadığından kalanlar çözücüde, payload üretilmeden elenir
+    # (bus kipinde filtre open_buses'ta worker çözücülerine verildi).
+    if configure:
+        if buses is not None:
+            for worker in buses.workers:
+                configure_adapter(worker.port, args, worker.config.ids if id_filter else None,
+                                  worker.config.name)
+        elif configure_adapter(ser, args, id_filter) and id_filter:
+            can_receiver.decoder.id_filter = id_filter
 
     # CANWriter oluştur
-    can_writer = CANWriter(ser)
+    can_writer = CANWriter(ser, signal_db, args.frame_format)
+
+    # RX, periyodik TX ve gamepad tek bir asyncio döngüsünde (can_io.py);
+    # --io threads eski thread başına döngü düzenidir
+    core = None
+    io_loop = None
+    receiver_thread = send_thread = None
+    if args.io == 'threads':
+        receiver_thread = CANReceiverThread(can_receiver)
+        receiver_thread.start()
+        send_thread = threading.Thread(target=can_writer.send_loop, name='can-send')
+        send_thread.start()
+    else:
+        from can_io import CanIoCore
+        core = CanIoCore(can_receiver, can_writer)
+        if args.io == 'qasync':
+            import asyncio
+            import qasync
+            io_loop = qasync.QEventLoop(app)
+            asyncio.set_event_loop(io_loop)
+            io_task = io_loop.create_task(core.run())
+        else:
+            core.run_in_thread()
+    boot.mark('can_io')
+
+    # Göstergeler ekrana geldikten sonra kritik olmayan parçalar
+    late = {}
+
+    def start_deferred():
+        from debug_model import CanMessageModel
+
+        # Debug konsolu modeli
+        can_message_model = CanMessageModel(signal_db=signal_db)
+        can_receiver.monitor = can_message_model.push
+        # Alım/gönderim metrikleri: debug konsolundaki overlay + periyodik log
+        metrics = MetricsBridge(can_receiver, can_writer, vehicle, dump_interval=args.metrics_interval)
+        context.setContextProperty("canMessageModel", can_message_model)
+        context.setContextProperty("canMetrics", metrics)
+        late['models'] = (can_message_model, metrics)
+
+        # Gamepad: I/O döngüsüne bağla ya da kendi thread'ini başlat
+        if core is not None:
+            gamepad = open_gamepad(args.gamepad)
+            if gamepad is None:
+                log.warning("No gamepad found!")
+            else:
+                core.add_input(gamepad)
+        else:
+            late['gamepad'] = GamepadThread(can_writer, args.gamepad)
+            late['gamepad'].start()
+        boot.mark('deferred')
 
-    # Gamepad thread'i başlat
-    gamepad_thread = GamepadThread(can_writer)
-    gamepad_thread.start()
+        boot.log_report()
+        if args.boot_report:
+            boot.write(args.boot_report)
 
-    # CANWriter gönderim döngüsünü thread ile başlat
-    send_thread = threading.Thread(target=can_writer.send_loop)
-    send_thread.daemon = True
-    send_thread.start()
+    window = engine.rootObjects()[0]
 
-    # QML engine setup
-    engine = QQmlApplicationEngine()
-    engine.rootContext().setContextProperty("canReceiver", can_receiver)
-    engine.load("main.qml")
-    
-    if not engine.rootObjects():
-        return -1
+    def on_first_frame():
+        window.frameSwapped.disconnect(on_first_frame)
+        boot.mark('first_frame')
+        start_deferred()
 
-    # Uygulamayı çalıştır
-    ret = app.exec()
-
-    # Kapanış işlemleri
-    can_receiver.stop_receiving()
-    can_writer.stop()
-    gamepad_thread.stop()
-    receiver_thread.quit()
-    receiver_thread.wait()
-    gamepad_thread.wait()
-    
-    if ser and ser.is_open:
-        ser.close()
-        print("Seri port kapatıldı.")
+    # frameSwapped render thread'inden gelebilir; kuyruklu bağlantı ana thread'de çalıştırır
+    window.frameSwapped.connect(on_first_frame, Qt.ConnectionType.QueuedConnection)
 
+    # Uygulamayı çalıştır
+    if io_loop is not None:
+        with io_loop:
+            ret = io_loop.run_forever()  # app.exec() sonucu; pencere kapanınca döner
+            # Kapanış işlemleri: I/O görevlerini aynı döngüde sırayla bitir
+            core.stop()
+            io_loop.run_until_complete(io_task)
+    else:
+        ret = app.exec()
+
+    # Kapanış işlemleri (qasync kipinde I/O döngüsü yukarıda kapandı)
+    if core is not None:
+        if io_loop is None:
+            core.stop()
+            core.join()
+    else:
+        can_receiver.stop_receiving()
+        can_writer.stop()
+        gamepad_thread = late.get('gamepad')
+        if gamepad_thread is not None:
+            gamepad_thread.stop()
+        receiver_thread.wait()
+        send_thread.join()
+        if gamepad_thread is not None:
+            gamepad_thread.wait()
+
+    if can_receiver.recorder is not None:
+        can_receiver.recorder.close()
+        log.info("Trace kaydedildi: %d frame -> %s", can_receiver.recorder.recorded, args.record)
+    if can_receiver.replay is not None:
+        can_receiver.replay.close()
+
+    close_ports(ser, buses)
     return ret
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
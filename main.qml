@@ -24,9 +24,6 @@ Window {
     property color darkSecondTextColor: "#A69BAC"
     property var debugWindow: null
 
-    property int max_buffer_size: 100
-    property int messageLength: 0
-
     FontLoader{
         id:interRegular
         source: "fonts/inter/Inter_28pt-Regular.ttf"
@@ -54,7 +51,7 @@ Window {
     // Warning Box
     Rectangle{
         id: distanceWarning
-        visible: false
+        visible: vehicle.distance >= 0 && vehicle.distance <= 15
         width: mainWindow.width * (0.2)
         height: mainWindow.height * (0.2)
         anchors.top: parent.top
@@ -62,13 +59,13 @@ Window {
         anchors.topMargin: 20
         color: mainWindow.isDark ? mainWindow.darkBoxColor : mainWindow.lightBoxColor
         radius: 10
-        border.width: 1
-        border.color: mainWindow.lightAccent
+        border.width: vehicle.distance <= 5 ? 3 : (vehicle.distance <= 10 ? 2 : 1)
+        border.color: vehicle.distance <= 5 ? 'red' : (vehicle.distance <= 10 ? 'yellow' : mainWindow.lightAccent)
         Text{
             id:distanceText
             font.family: interRegular.name
             font.pointSize: 84
-            text: "15"
+            text: Math.max(vehicle.distance, 0)
             color: mainWindow.isDark ? mainWindow.darkTextColor : mainWindow.lightTextColor
             anchors.centerIn: parent
         }
@@ -111,6 +108,7 @@ Window {
         }
         Image{
             id: ready
+            visible: vehicle.speed <= 0
             source: "images/ready.png"
             width: 50
             height: 50
@@ -138,7 +136,7 @@ Window {
             id:speedText
             font.family: interRegular.name
             font.pointSize: 120
-            text: ""
+            text: vehicle.speed
             color: mainWindow.isDark ? mainWindow.darkTextColor : mainWindow.lightTextColor
             anchors.verticalCenter: parent.verticalCenter
             anchors.right: parent.right
@@ -176,7 +174,7 @@ Window {
         anchors.topMargin: 250
         radius: 10
         border.width: 2
-        border.color: mainWindow.lightAccent
+        border.color: vehicle.brake ? "red" : mainWindow.lightAccent
         Column{
             id: timeAndTemp
             spacing: 10
@@ -185,6 +183,7 @@ Window {
                 id: tempText
                 font.family: interRegular
                 font.pointSize: 36
+                text: isNaN(vehicle.temperature) ? "" : vehicle.temperature + "°C"
                 color: mainWindow.isDark ? mainWindow.darkSecondTextColor : mainWindow.lightSecondTextColor
             }
             Text{
@@ -205,6 +204,9 @@ Window {
     // Road
     Road{
         id: road
+        leftSignalOpen: vehicle.leftSignal
+        rightSignalOpen: vehicle.rightSignal
+        breakSignalOpen: vehicle.brake
     }
 
 
@@ -366,105 +368,35 @@ Window {
         MouseArea {
                 anchors.fill: parent
                 onClicked: {
-                    console.log("Debug button clicked"); // Debug için
                     if (!debugWindow) {
-                        console.log("Creating debug window");
                         var component = Qt.createComponent("Debug.qml");
                         if (component.status === Component.Ready) {
                             debugWindow = component.createObject(mainWindow);
-                            console.log("Debug window created successfully");
                         } else {
                             console.error("Error loading component:", component.errorString());
                         }
                     }
                     if (debugWindow) {
                         debugWindow.visible = !debugWindow.visible;
-                        console.log("Debug window visibility toggled:", debugWindow.visible);
                     }
                 }
             }
     }
 
+    // Road.speed sürtünme timer'ı tarafından da yazıldığı için binding değil,
+    // yalnızca hız gerçekten değiştiğinde atanır
     Connections {
-            target: canReceiver
-            function onCanMotorDataReceived(frameId, length, dataHex) {
-                var rawValue = parseInt(dataHex, 16) - 15;
-                road.speed =(rawValue < 0) ? 0 :  rawValue * 30 / 200;
-                speedText.text = (rawValue < 0) ? 0 : rawValue
-                if(rawValue <= 0){
-                    ready.visible = true;
-                }
-                else{
-                    ready.visible = false;
-                }
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
-            }
-            function onCanDistanceDataReceived(frameId, length, dataHex){
-                var rawValue = parseInt(dataHex, 16)
-                if(rawValue <= 15)
-                {
-                    if(rawValue <= 5){
-                        distanceWarning.border.color = 'red';
-                        distanceWarning.border.width = 3;
-                    }
-                    else if(rawValue <= 10){
-                        distanceWarning.border.color = 'yellow';
-                        distanceWarning.border.width = 2;
-                    }
-                    else{
-                        distanceWarning.border.color = mainWindow.lightAccent;
-                        distanceWarning.border.width = 1;
-                    }
-
-
-                    distanceWarning.visible = true;
-                }
-                else distanceWarning.visible = false;
-                distanceText.text = (rawValue < 0) ? 0 : rawValue
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
-            }
-            function onCanTempDataReceived(frameId, length, dataHex){
-                var rawValue = parseInt(dataHex, 16) / 10
-                tempText.text = rawValue + "°C"
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
-            }
-
-            function onCanLeftSignalDataReceived(frameId, length, dataHex){
-                console.log("selamunaleykum")
-                var rawValue = parseInt(dataHex, 16);
-                road.leftSignalOpen = rawValue
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
-            }
-            function onCanRightSignalDataReceived(frameId, length, dataHex){
-                console.log("selamunaleykum")
-                var rawValue = parseInt(dataHex, 16);
-                road.rightSignalOpen = rawValue
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
-            }
-            function onCanBreakSignalDataReceived(frameId, length, dataHex){
-                var rawValue = parseInt(dataHex, 16)
-                road.breakSignalOpen = rawValue
-                if(rawValue){
-                    tempAndDateBox.border.color = "red"
-                }
-                else{
-                    tempAndDateBox.border.color = mainWindow.lightAccent
-                }
-                if (debugWindow && mainWindow.messageLength < max_buffer_size) {
-                   debugWindow.addCanMessage(frameId, length, dataHex)
-                }
+            target: vehicle
+            function onSpeedChanged() {
+                road.speed = vehicle.speed * 30 / 200;
             }
+    }
 
+    // Debug modeli yalnızca pencere görünürken frame biriktirir
+    Binding {
+        target: canMessageModel
+        property: "active"
+        value: debugWindow !== null && debugWindow.visible
     }
 
     Component.onCompleted: {
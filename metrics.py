@@ -0,0 +1,233 @@
+# === METRICS === #
+# Alım/gönderim hattı için düşük maliyetli sayaçlar. Sayaçlar önceden ayrılmış
+# array'lerde tutulur; sıcak yolda yalnızca indeksli artırma yapılır.
+# MetricsBridge bunları saniyede bir QML'e (overlay) Property olarak sunar
+# ve belirli aralıklarla log'a döker.
+
+import logging
+import time
+from array import array
+
+from PySide6.QtCore import QObject, Signal, Property, QTimer, Slot
+
+log = logging.getLogger(__name__)
+
+MAX_IDS = 64          # ID başına sayaç yuvası; fazlası 'other' yuvasına düşer
+HISTOGRAM_BUCKETS = 24  # 2^0 .. 2^23 (µs ya da bayt)
+
+
+class Histogram:
+    # log2 kovalı histogram; record() yalnızca bir bit_length ve indeksli artırma
+    __slots__ = ('counts', 'total', 'maximum')
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.counts = array('Q', bytes(8 * buckets))
+        self.total = 0
+        self.maximum = 0
+
+    def record(self, value):
+        value = int(value)
+        bucket = value.bit_length()
+        counts = self.counts
+        counts[bucket if bucket < len(counts) else len(counts) - 1] += 1
+        self.total += 1
+        if value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, fraction):
+        # Kovanın üst sınırı olarak yaklaşık değer
+        if not self.total:
+            return 0
+        target = self.total * fraction
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min((1 << bucket) - 1 if bucket else 0, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'max': self.maximum,
+        }
+
+
+class IdCounters:
+    # frame_id -> önceden ayrılmış array yuvası
+    __slots__ = ('slots', 'counts', 'other')
+
+    def __init__(self, max_ids=MAX_IDS):
+        self.slots = {}
+        self.counts = array('Q', bytes(8 * (max_ids + 1)))
+        self.other = max_ids
+
+    def slot(self, frame_id):
+        slot = self.slots.get(frame_id)
+        if slot is None:
+            slot = len(self.slots) if len(self.slots) < self.other else self.other
+            if slot != self.other:
+                self.slots[frame_id] = slot
+        return slot
+
+    def increment(self, frame_id):
+        slot = self.slots.get(frame_id)
+        self.counts[slot if slot is not None else self.slot(frame_id)] += 1
+
+    def snapshot(self):
+        result = {frame_id: self.counts[slot] for frame_id, slot in list(self.slots.items())}
+        if self.counts[self.other]:
+            result['other'] = self.counts[self.other]
+        return result
+
+
+class ReceiverMetrics:
+    def __init__(self):
+        self.frames = IdCounters()
+        self.reads = 0
+        self.bytes_read = 0
+        self.read_sizes = Histogram()        # bayt
+        self.latency_us = Histogram()        # read() dönüşünden son sinyal emit'ine kadar
+        self.resync_bytes = Histogram()      # senkron kaybı başına atılan bayt
+        self.errors = {'handler': 0, 'serial': 0}
+
+    def record_read(self, size):
+        self.reads += 1
+        self.bytes_read += size
+        self.read_sizes.record(size)
+
+
+class WriterMetrics:
+    def __init__(self):
+        self.frames = IdCounters()
+        self.writes = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.input_latency_us = Histogram()  # gamepad olayı -> ilk port write'ı
+
+    def record_write(self, size):
+        self.writes += 1
+        self.bytes_written += size
+
+
+class RateLimitedLog:
+    # Aynı anahtar için en fazla `interval` saniyede bir log yazar,
+    # arada bastırılan mesaj sayısını bir sonrakine ekler
+    def __init__(self, logger, interval=5.0):
+        self.logger = logger
+        self.interval = interval
+        self._last = {}
+        self._suppressed = {}
+
+    def log(self, level, key, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if now - self._last.get(key, -self.interval) < self.interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        self._last[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            msg += f" (son {self.interval:g}s içinde {suppressed} benzer mesaj bastırıldı)"
+        self.logger.log(level, msg, *args)
+
+    def warning(self, key, msg, *args):
+        self.log(logging.WARNING, key, msg, *args)
+
+
+def _rates(current, previous, dt):
+    return {key: (value - previous.get(key, 0)) / dt for key, value in current.items()}
+
+
+class MetricsBridge(QObject):
+    summaryChanged = Signal()
+
+    def __init__(self, receiver, writer=None, vehicle=None, interval_ms=1000, dump_interval=30.0, parent=None):
+        super().__init__(parent)
+        self.receiver = receiver
+        self.writer = writer
+        self.vehicle = vehicle
+        self.dump_interval = dump_interval
+        self._summary = {}
+        self._text = ""
+        self._prev = None
+        self._last_dump = time.monotonic()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+    def collect(self):
+        rx = self.receiver.metrics
+        buses = self.receiver.buses
+        if buses is not None:
+            # --bus: çözme bus işçilerinde, tek port çözücüsü kullanılmıyor
+            decoder = buses.decoder_stats()
+        else:
+            decoder = self.receiver.decoder
+            decoder = {'frames': decoder.frames, 'dropped_bytes': decoder.dropped_bytes, 'resyncs': decoder.resyncs,
+                       'filtered': decoder.filtered, 'errors': dict(decoder.errors)}
+        now = time.monotonic()
+        counters = {
+            'time': now,
+            'rx_frames': rx.frames.snapshot(),
+            'rx_bytes': rx.bytes_read,
+            'tx_frames': self.writer.metrics.frames.snapshot() if self.writer else {},
+        }
+        prev = self._prev or counters
+        dt = (now - prev['time']) or 1.0
+        self._prev = counters
+
+        summary = {
+            'rx_fps': _rates(counters['rx_frames'], prev['rx_frames'], dt),
+            'rx_bytes_per_s': (counters['rx_bytes'] - prev['rx_bytes']) / dt,
+            'rx_reads': rx.reads,
+            'read_size': rx.read_sizes.summary(),
+            'latency_us': rx.latency_us.summary(),
+            'decoder': decoder,
+            'resync_bytes': rx.resync_bytes.summary(),
+            'rx_errors': dict(rx.errors),
+        }
+        if self.writer is not None:
+            tx = self.writer.metrics
+            summary['tx_fps'] = _rates(counters['tx_frames'], prev['tx_frames'], dt)
+            summary['tx_writes'] = tx.writes
+            summary['tx_errors'] = tx.errors
+            summary['input_latency_us'] = tx.input_latency_us.summary()
+        if buses is not None:
+            summary['buses'] = {name: dict(stats) for name, stats in buses.stats.items()}
+        if self.vehicle is not None:
+            summary['coalescing'] = self.vehicle.frame_stats()
+            summary['deadband_suppressed'] = dict(self.vehicle.suppressed)
+        return summary
+
+    @Slot()
+    def refresh(self):
+        summary = self.collect()
+        total_fps = sum(summary['rx_fps'].values())
+        latency = summary['latency_us']
+        self._summary = summary
+        self._text = (f"RX {total_fps:.0f} f/s  {summary['rx_bytes_per_s'] / 1024:.1f} KiB/s  "
+                      f"atılan {summary['decoder']['dropped_bytes']} B / {summary['decoder']['resyncs']} resync  "
+                      f"gecikme p50/p99 {latency['p50']}/{latency['p99']} µs")
+        self.summaryChanged.emit()
+
+        now = time.monotonic()
+        if self.dump_interval and now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            log.info("metrics: %s", summary)
+
+    def _qml_summary(self):
+        # QVariantMap anahtarları string olmalı
+        def convert(value):
+            if isinstance(value, dict):
+                return {hex(k) if isinstance(k, int) else str(k): convert(v) for k, v in value.items()}
+            return value
+        return convert(self._summary)
+
+    summary = Property('QVariantMap', _qml_summary, notify=summaryChanged)
+    text = Property(str, lambda self: self._text, notify=summaryChanged)
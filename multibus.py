@@ -0,0 +1,382 @@
+# === MULTI-BUS === #
+# Birden çok USB-CAN adaptörü (ör. powertrain ve body bus'ları ayrı dongle'larda).
+# Her bus'ın kendi okuyucu işçisi (thread ya da process), transport'u ve
+# FrameDecoder'ı vardır. ID filtresi çözücünün içinde, payload bytes'ı
+# üretilmeden uygulanır; process modunda filtrelenen frame'ler ana sürece hiç
+# taşınmaz ve çözme işi ayrı çekirdeklere dağılır.
+#
+# Her read() parçası tek bir zaman damgası (time.monotonic) taşır. Parçalar bir
+# heap'te zaman sırasına göre birleştirilir ve tek bir dispatch thread'inden
+# CANReceiver'a verilir; dispatcher katmanı tek akış görmeye devam eder.
+#
+#   --bus powertrain=/dev/ttyUSB1?filter=0x2601,0x2801 --bus body=/dev/ttyUSB2
+#   --bus-worker process --tx-bus body
+
+import heapq
+import logging
+import multiprocessing
+import queue
+import select
+import threading
+import time
+from multiprocessing.connection import wait as wait_connections
+
+from protocol import FRAME_FORMATS
+from transport import open_transport, DEFAULT_BAUDRATE
+
+log = logging.getLogger(__name__)
+
+MERGE_WINDOW = 0.002  # sessiz bir bus'ı en fazla bu kadar bekle (s)
+POLL_TIMEOUT = 0.2
+
+
+class BusConfig:
+    def __init__(self, name, url, baudrate=DEFAULT_BAUDRATE, ids=None, frame_format='variable'):
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"{name}: bilinmeyen frame formatı {frame_format!r}")
+        self.name = name
+        self.url = url
+        self.baudrate = baudrate
+        self.ids = ids  # frozenset ya da None (filtre yok)
+        self.frame_format = frame_format
+
+    def make_decoder(self):
+        decoder = FRAME_FORMATS[self.frame_format][0]()
+        decoder.id_filter = self.ids
+        return decoder
+
+
+def parse_bus(spec, baudrate=DEFAULT_BAUDRATE, frame_format='variable'):
+    # "isim=url"; url'deki filter=ID,ID ve format=... bu modülde işlenir,
+    # kalan parametreler transport'a gider
+    name, sep, url = spec.partition('=')
+    if not sep or not name or not url:
+        raise ValueError(f"--bus isim=url bekleniyor: {spec!r}")
+    base, _, query = url.partition('?')
+    ids = None
+    rest = []
+    for item in query.split('&'):
+        key, _, value = item.partition('=')
+        if key == 'filter':
+            ids = frozenset(int(frame_id, 0) for frame_id in value.split(',') if frame_id)
+        elif item:
+            if key == 'format':
+                frame_format = value
+            rest.append(item)
+    url = base + ('?' + '&'.join(rest) if rest else '')
+    return BusConfig(name, url, baudrate, ids, frame_format)
+
+
+def _read_chunk(transport, fd, timeout):
+    if fd is not None:
+        if not select.select([fd], [], [], timeout)[0]:
+            return b''
+        return transport.read(transport.in_waiting or 1)
+    # fd'siz port: read(1) transport timeout'una kadar bloklanır
+    first = transport.read(1)
+    waiting = transport.in_waiting if first else 0
+    return first + transport.read(waiting) if waiting else first
+
+
+def _counters(decoder):
+    # Parça başına ana sürece giden çözücü sayaçları (küçük bir tuple)
+    return decoder.frames, decoder.dropped_bytes, decoder.resyncs, decoder.filtered, tuple(decoder.errors.values())
+
+
+def _fileno(transport):
+    try:
+        return transport.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+# === WORKERS === #
+class BusThread(threading.Thread):
+    # Transport bu süreçte açılır; CANWriter aynı nesneye yazabilir
+    def __init__(self, index, config, sink):
+        super().__init__(name=f"bus-{config.name}", daemon=True)
+        self.index = index
+        self.config = config
+        self.transport = open_transport(config.url, config.baudrate, timeout=POLL_TIMEOUT)
+        self.decoder = config.make_decoder()
+        self._sink = sink
+        self._stopped = threading.Event()
+
+    @property
+    def port(self):
+        return self.transport
+
+    def run(self):
+        transport = self.transport
+        fd = _fileno(transport)
+        decoder = self.decoder
+        sink = self._sink
+        index = self.index
+        while not self._stopped.is_set():
+            try:
+                chunk = _read_chunk(transport, fd, POLL_TIMEOUT)
+            except OSError as e:
+                log.error("%s bus okuma hatası: %s", self.config.name, e)
+                return
+            if chunk:
+                timestamp = time.monotonic()
+                frames = list(decoder.feed(chunk))
+                sink((index, timestamp, len(chunk), frames, _counters(decoder)))
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        self.stop()
+        if self.is_alive():
+            self.join(1)
+        self.transport.close()
+
+
+class PipePort:
+    # Process işçisinin portuna yazmak için CANWriter'a verilen pyserial benzeri nesne
+    def __init__(self, conn):
+        self._conn = conn
+        self.is_open = True
+
+    def write(self, data):
+        self._conn.send_bytes(bytes(data))
+        return len(data)
+
+    def close(self):
+        self.is_open = False
+
+
+def _bus_process_main(config, conn, started):
+    # Alt süreç: port burada açılır; çözülen parçalar pipe'tan, TX baytları ters yönde.
+    # Okuma dispatch döngüsü başlayınca (started) başlar, TX hemen kabul edilir.
+    try:
+        transport = open_transport(config.url, config.baudrate, timeout=POLL_TIMEOUT)
+    except (OSError, ValueError) as e:
+        conn.send(f"{config.name}: {e}")
+        return
+    conn.send(None)
+
+    decoder = config.make_decoder()
+    fd = transport.fileno()
+    control = conn.fileno()
+    try:
+        while True:
+            if started.is_set():
+                readable = select.select([fd, control], [], [], POLL_TIMEOUT)[0]
+            else:
+                readable = select.select([control], [], [], 0.01)[0]
+            if control in readable:
+                data = conn.recv_bytes()
+                if not data:
+                    break  # durdurma isteği
+                transport.write(data)
+            if fd in readable:
+                chunk = transport.read(transport.in_waiting or 1)
+                if chunk:
+                    timestamp = time.monotonic()
+                    frames = list(decoder.feed(chunk))
+                    conn.send((timestamp, len(chunk), frames, _counters(decoder)))
+    except (OSError, EOFError) as e:
+        log.error("%s bus süreci durdu: %s", config.name, e)
+    finally:
+        transport.close()
+        conn.close()
+
+
+class BusProcess:
+    # spawn: Qt ve diğer thread'lerin kilitleri çatallanmış sürece taşınmasın
+    _context = multiprocessing.get_context('spawn')
+
+    def __init__(self, index, config):
+        self.index = index
+        self.config = config
+        self.conn, child = self._context.Pipe()
+        self._started = self._context.Event()
+        self.process = self._context.Process(target=_bus_process_main, args=(config, child, self._started),
+                                             name=f"bus-{config.name}", daemon=True)
+        self.process.start()
+        child.close()
+        error = self.conn.recv() if self.conn.poll(30) else f"{config.name}: süreç yanıt vermedi"
+        if error is not None:
+            self.close()
+            raise OSError(error)
+        self.port = PipePort(self.conn)
+
+    def start(self):
+        self._started.set()
+
+    def stop(self):
+        pass
+
+    def close(self):
+        if self.process.is_alive():
+            try:
+                self.conn.send_bytes(b'')
+            except OSError:
+                pass
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        if getattr(self, 'port', None) is not None:
+            self.port.close()
+        self.conn.close()
+
+
+# === MERGE === #
+class FrameMerger:
+    # Her bus kendi içinde zaman sıralı; bir parça, tüm bus'lar onun zamanını
+    # geçtiğinde ya da MERGE_WINDOW kadar eskidiğinde güvenle yayınlanır.
+    def __init__(self, bus_count, window=MERGE_WINDOW):
+        self.window = window
+        self._heap = []
+        self._seq = 0
+        self._latest = [0.0] * bus_count  # bus başına son parça zamanı
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, bus, timestamp, size, frames):
+        self._latest[bus] = timestamp
+        if frames:
+            heapq.heappush(self._heap, (timestamp, self._seq, size, frames))
+            self._seq += 1
+
+    def pop_ready(self, now):
+        # -> (zaman, bayt, frame'ler)
+        watermark = max(min(self._latest), now - self.window)
+        heap = self._heap
+        while heap and heap[0][0] <= watermark:
+            timestamp, _, size, frames = heapq.heappop(heap)
+            yield timestamp, size, frames
+
+    def drain(self):
+        while self._heap:
+            timestamp, _, size, frames = heapq.heappop(self._heap)
+            yield timestamp, size, frames
+
+    def next_deadline(self):
+        return self._heap[0][0] + self.window if self._heap else None
+
+
+class MultiBus:
+    def __init__(self, configs, worker='thread', window=MERGE_WINDOW):
+        if not configs:
+            raise ValueError("En az bir bus gerekli")
+        names = [config.name for config in configs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Bus isimleri tekrar ediyor: {names}")
+        if worker not in ('thread', 'process'):
+            raise ValueError(f"Bilinmeyen bus işçisi: {worker}")
+        self.configs = configs
+        self.worker = worker
+        self.merger = FrameMerger(len(configs), window)
+        self.workers = []
+        self.stats = {config.name: {'frames': 0, 'bytes': 0, 'filtered': 0, 'dropped_bytes': 0, 'resyncs': 0,
+                                    'errors': dict.fromkeys(config.make_decoder().ERRORS, 0)}
+                      for config in configs}
+        self.running = False
+        self._queue = queue.SimpleQueue()             # thread işçileri -> dispatch
+        self._wake_r, self._wake_w = multiprocessing.Pipe(duplex=False)  # process modu için
+
+    def open(self):
+        try:
+            for index, config in enumerate(self.configs):
+                if self.worker == 'process':
+                    self.workers.append(BusProcess(index, config))
+                else:
+                    self.workers.append(BusThread(index, config, self._queue.put))
+        except Exception:
+            self.close()
+            raise
+        for worker in self.workers:
+            log.info("Bus %s açıldı (%s, %s)%s", worker.config.name, worker.config.url, self.worker,
+                     f", filtre {len(worker.config.ids)} ID" if worker.config.ids else "")
+        return self
+
+    def port(self, name=None):
+        # CANWriter'ın yazacağı bus; varsayılan ilk bus
+        for worker in self.workers:
+            if name is None or worker.config.name == name:
+                return worker.port
+        raise ValueError(f"{name} adında bus yok")
+
+    def run(self, deliver):
+        # Dispatch döngüsü (CANReceiver.start_receiving);
+        # deliver(zaman, bayt, frame'ler) parça başına zaman sırasıyla çağrılır
+        self.running = True
+        for worker in self.workers:
+            worker.start()
+        collect = self._collect_processes if self.worker == 'process' else self._collect_threads
+        merger = self.merger
+        while self.running:
+            deadline = merger.next_deadline()
+            timeout = POLL_TIMEOUT if deadline is None else max(0.0, min(POLL_TIMEOUT, deadline - time.monotonic()))
+            collect(timeout)
+            for chunk in merger.pop_ready(time.monotonic()):
+                deliver(*chunk)
+        for chunk in merger.drain():
+            deliver(*chunk)
+
+    def _accept(self, index, timestamp, size, frames, counters):
+        stats = self.stats[self.configs[index].name]
+        stats['bytes'] += size
+        stats['frames'], stats['dropped_bytes'], stats['resyncs'], stats['filtered'], errors = counters
+        stats['errors'] = dict(zip(stats['errors'], errors))
+        self.merger.push(index, timestamp, size, frames)
+
+    def decoder_stats(self):
+        # Tüm bus'ların çözücü sayaçlarının toplamı (tek port çözücüsüyle aynı anahtarlar)
+        total = {'frames': 0, 'dropped_bytes': 0, 'resyncs': 0, 'filtered': 0, 'errors': {}}
+        for stats in self.stats.values():
+            for key in ('frames', 'dropped_bytes', 'resyncs', 'filtered'):
+                total[key] += stats[key]
+            for reason, count in stats['errors'].items():
+                total['errors'][reason] = total['errors'].get(reason, 0) + count
+        return total
+
+    def _collect_threads(self, timeout):
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while item is not None:
+            self._accept(*item)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _collect_processes(self, timeout):
+        conns = {worker.conn: worker.index for worker in self.workers}
+        for conn in wait_connections([self._wake_r, *conns], timeout):
+            if conn is self._wake_r:
+                conn.recv_bytes()
+                continue
+            index = conns[conn]
+            try:
+                while conn.poll():
+                    self._accept(index, *conn.recv())
+            except (EOFError, OSError):
+                log.error("%s bus süreci bağlantısı kapandı", self.configs[index].name)
+                self.running = False
+
+    def stop(self):
+        self.running = False
+        for worker in self.workers:
+            worker.stop()
+        # Bekleyen dispatch döngüsünü uyandır
+        self._queue.put(None)
+        try:
+            self._wake_w.send_bytes(b'\x00')
+        except OSError:
+            pass
+
+    def close(self):
+        self.stop()
+        for worker in self.workers:
+            worker.close()
+        self.workers.clear()
+        self._wake_r.close()
+        self._wake_w.close()
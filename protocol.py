@@ -0,0 +1,420 @@
+# === CAN PROTOCOL === #
+# USB-CAN adaptörünün değişken uzunluklu seri çerçeve formatı:
+#
+#   0xAA | type | id (2 veya 4 bayt, big endian) | data (0-8 bayt) | 0x55
+#
+# type baytı: bit7-6 = 0b11, bit5 = extended, bit4 = remote, bit3-0 = DLC
+#
+# Adaptör ayrıca checksum'lı 20 baytlık sabit bir format da destekler:
+#
+#   0xAA 0x55 0x01 | tip (1 std, 2 ext) | format (1 data, 2 remote) |
+#   id (4 bayt, little endian) | DLC | data (8 bayt, sıfır dolgulu) | 0x00 | checksum
+#
+# checksum = 2..18. baytların toplamının düşük 8 biti
+#
+# Ayar komutu (her iki formatta 20 bayt, adaptör yanıt vermez):
+#
+#   0xAA 0x55 | 0x12 (değişken format) / 0x02 (sabit) | bitrate kodu | tip (1 std, 2 ext) |
+#   filtre id (4 bayt, LE) | maske (4 bayt, LE) | mod | 0x01 | 0x00 x4 | checksum
+#
+# Kabul filtresi: (id & maske) == (filtre & maske); maske 0 her şeyi geçirir.
+
+class CANProtocol:
+    PACKET_HEADER = 0xaa
+    END_CODE = 0x55
+
+    FRAME_TYPE_STANDARD = 0b0 << 5
+    FRAME_TYPE_EXTENDED = 0b1 << 5
+    FRAME_FORMAT_DATA = 0b0 << 4
+    FRAME_FORMAT_REMOTE = 0b1 << 4
+    BASE_TYEP_BITS = 0b11000000
+
+    FIXED_FRAME_LENGTH = 20
+
+    SETTING_VARIABLE = 0x12
+    SETTING_FIXED = 0x02
+    BITRATE_CODES = {
+        1000000: 0x01, 800000: 0x02, 500000: 0x03, 400000: 0x04, 250000: 0x05, 200000: 0x06,
+        125000: 0x07, 100000: 0x08, 50000: 0x09, 20000: 0x0A, 10000: 0x0B, 5000: 0x0C,
+    }
+    MODE_NORMAL = 0x00
+    MODE_LOOPBACK = 0x01
+    MODE_SILENT = 0x02
+    MODE_LOOPBACK_SILENT = 0x03
+
+    def _validate(self, frame_id, data, is_extended):
+        if not (0 <= len(data) <= 8):
+            raise ValueError("Data length max 8 byte olabilir.")
+        if is_extended:
+            if not (0 <= frame_id < (1 << 29)):
+                raise ValueError(f"Extended Frame ID must be between 0 and {(1 << 29) - 1}.")
+        else:
+            if not (0 <= frame_id < (1 << 11)):
+                raise ValueError(f"Standard Frame ID must be between 0 and {(1 << 11) - 1}.")
+
+    def pack_can_frame(self, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False) -> bytes:
+        self._validate(frame_id, data, is_extended)
+
+        tyep_byte = self.BASE_TYEP_BITS
+        tyep_byte |= self.FRAME_TYPE_EXTENDED if is_extended else self.FRAME_TYPE_STANDARD
+        tyep_byte |= self.FRAME_FORMAT_REMOTE if is_remote else self.FRAME_FORMAT_DATA
+        tyep_byte |= (len(data) & 0b00001111)
+
+        packed_frame = bytearray([self.PACKET_HEADER, tyep_byte])
+        id_bytes = frame_id.to_bytes(4 if is_extended else 2, 'big')
+        packed_frame.extend(id_bytes)
+        packed_frame.extend(data)
+        packed_frame.append(self.END_CODE)
+
+        return bytes(packed_frame)
+
+    def pack_fixed_frame(self, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False) -> bytes:
+        self._validate(frame_id, data, is_extended)
+        packed_frame = bytearray([self.PACKET_HEADER, self.END_CODE, 0x01,
+                                  2 if is_extended else 1, 2 if is_remote else 1])
+        packed_frame.extend(frame_id.to_bytes(4, 'little'))
+        packed_frame.append(len(data))
+        packed_frame.extend(data.ljust(8, b'\x00'))
+        packed_frame.append(0x00)
+        packed_frame.append(sum(packed_frame[2:]) & 0xFF)
+        return bytes(packed_frame)
+
+    def pack_setting_frame(self, bitrate: int, filter_id: int = 0, mask: int = 0, is_extended: bool = False,
+                           mode: int = MODE_NORMAL, fixed_format: bool = False) -> bytes:
+        if bitrate not in self.BITRATE_CODES:
+            raise ValueError(f"Desteklenmeyen CAN bitrate: {bitrate}")
+        limit = 1 << (29 if is_extended else 11)
+        if not (0 <= filter_id < limit and 0 <= mask < limit):
+            raise ValueError(f"Filtre ve maske 0 ile {limit - 1} arasında olmalı.")
+        packed_frame = bytearray([self.PACKET_HEADER, self.END_CODE,
+                                  self.SETTING_FIXED if fixed_format else self.SETTING_VARIABLE,
+                                  self.BITRATE_CODES[bitrate], 2 if is_extended else 1])
+        packed_frame.extend(filter_id.to_bytes(4, 'little'))
+        packed_frame.extend(mask.to_bytes(4, 'little'))
+        packed_frame.extend((mode, 0x01, 0, 0, 0, 0))
+        packed_frame.append(sum(packed_frame[2:]) & 0xFF)
+        return bytes(packed_frame)
+
+    def parse_setting_frame(self, packet):
+        # Simülatör ve testler için: geçerli bir ayar komutuysa alanlar, değilse None
+        if (len(packet) < self.FIXED_FRAME_LENGTH or packet[0] != self.PACKET_HEADER or packet[1] != self.END_CODE
+                or packet[2] not in (self.SETTING_VARIABLE, self.SETTING_FIXED)
+                or sum(packet[2:19]) & 0xFF != packet[19]):
+            return None
+        bitrates = {code: bitrate for bitrate, code in self.BITRATE_CODES.items()}
+        return {
+            'bitrate': bitrates.get(packet[3]),
+            'is_extended': packet[4] == 2,
+            'filter_id': int.from_bytes(packet[5:9], 'little'),
+            'mask': int.from_bytes(packet[9:13], 'little'),
+            'mode': packet[13],
+            'fixed_format': packet[2] == self.SETTING_FIXED,
+        }
+
+
+def acceptance_filter(frame_ids):
+    # Tek bir filtre/maske çifti: tüm ID'lerde ortak olan bitler karşılaştırılır.
+    # Kapsam tam değil (ortak bitleri paylaşan başka ID'ler de geçer); kalanını
+    # FrameDecoder.id_filter yazılımda eler. -> (filtre, maske, extended)
+    frame_ids = sorted(frame_ids)
+    if not frame_ids:
+        return 0, 0, False
+    is_extended = frame_ids[-1] > 0x7FF
+    full = (1 << (29 if is_extended else 11)) - 1
+    differing = 0
+    for frame_id in frame_ids:
+        differing |= frame_id ^ frame_ids[0]
+    mask = full & ~differing
+    return frame_ids[0] & mask, mask, is_extended
+
+
+# === FRAME DECODER === #
+class FrameDecoder:
+    # Sabit kapasiteli tampon üzerinde artımlı çözücü. Okuma/yazma imleçleri
+    # ilerler, çözülen her frame için kalan tampon kopyalanmaz; yalnızca yeni
+    # veri sığmadığında okunmamış kuyruk (en fazla yarım bir frame) başa alınır.
+    #
+    # Geçersiz bir başlıkta (type baytının üst bitleri 0b11 değil, DLC > 8 ya da
+    # 0x55 sonlandırıcı yok) bir sonraki 0xAA aynı tampon üzerinde find ile
+    # aranır. Senkron kaybından bir sonraki geçerli frame'e kadar atılan bayt
+    # sayısı on_resync(lost, reason) ile bildirilir.
+    #
+    # id_filter verilirse (frozenset) dışındaki ID'ler payload bytes'ı
+    # üretilmeden atlanır ve yalnızca filtered sayacında görünür.
+    #
+    #   decoder = FrameDecoder()
+    #   for frame_id, dlc, data in decoder.feed(chunk):
+    #       ...
+
+    MIN_CAPACITY = 64
+    ERRORS = ('garbage', 'bad_type', 'bad_dlc', 'bad_terminator')
+
+    def __init__(self, capacity: int = 1 << 16):
+        if capacity < self.MIN_CAPACITY:
+            raise ValueError(f"Kapasite en az {self.MIN_CAPACITY} bayt olmalı.")
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0  # okunmamış ilk bayt
+        self._end = 0    # bir sonraki yazma konumu
+
+        self.frames = 0
+        self.dropped_bytes = 0
+        self.resyncs = 0
+        self.filtered = 0
+        self.id_filter = None
+        # Hata sebebi -> olay sayısı (atılan bayt sayısı dropped_bytes'ta)
+        self.errors = dict.fromkeys(self.ERRORS, 0)
+        self.on_resync = None  # (kaybedilen bayt, ilk hata sebebi)
+        self._lost = 0         # süren senkron kaybında atılan bayt
+        self._lost_reason = None
+
+    def __len__(self):
+        return self._end - self._start
+
+    def reset(self):
+        self._start = self._end = 0
+        self._lost = 0
+        self._lost_reason = None
+
+    def feed(self, data):
+        pending = memoryview(data)
+        while pending:
+            written = self._write(pending)
+            pending = pending[written:]
+            yield from self._scan()
+
+    def _lose(self, reason, count):
+        # Hata yolunda çağrılır; sıcak yol yalnızca yerel sayaçları kullanır
+        self.errors[reason] += 1
+        if not self._lost:
+            self._lost_reason = reason
+        self._lost += count
+        self.dropped_bytes += count
+
+    def _resynced(self):
+        lost, reason = self._lost, self._lost_reason
+        self._lost = 0
+        self._lost_reason = None
+        self.resyncs += 1
+        if self.on_resync is not None:
+            self.on_resync(lost, reason)
+
+    def _scan(self):
+        buf = self._buf
+        view = self._view
+        find = buf.find
+        pos = self._start
+        end = self._end
+        frames = 0
+        filtered = 0
+        accept = self.id_filter
+        lost = self._lost > 0  # yerel bayrak; self._lost yalnızca hata yolunda güncellenir
+        try:
+            while True:
+                header = find(0xAA, pos, end)
+                if header == -1:
+                    if end != pos:
+                        self._lose('garbage', end - pos)
+                    pos = end
+                    break
+                if header != pos:
+                    self._lose('garbage', header - pos)
+                    lost = True
+                    pos = header
+
+                if end - header < 2:
+                    break
+                type_byte = buf[header + 1]
+                dlc = type_byte & 0x0F
+                if type_byte & 0xC0 != 0xC0 or dlc > 8:
+                    # Payload içindeki 0xAA sahte başlık olabilir; sonrakini ara
+                    self._lose('bad_type' if type_byte & 0xC0 != 0xC0 else 'bad_dlc', 1)
+                    lost = True
+                    pos = header + 1
+                    continue
+                if type_byte & 0x20:
+                    data_start = header + 6
+                else:
+                    data_start = header + 4
+                tail = data_start + dlc
+                if tail >= end:
+                    break
+
+                if buf[tail] != 0x55:
+                    self._lose('bad_terminator', 1)
+                    lost = True
+                    pos = header + 1
+                    continue
+
+                if data_start == header + 4:
+                    frame_id = (buf[header + 2] << 8) | buf[header + 3]
+                else:
+                    frame_id = int.from_bytes(view[header + 2:data_start], 'big')
+
+                pos = tail + 1
+                if lost:
+                    self._resynced()
+                    lost = False
+                if accept is not None and frame_id not in accept:
+                    filtered += 1
+                    continue
+                frames += 1
+                yield frame_id, dlc, bytes(view[data_start:tail])
+        finally:
+            # Tüketici döngüden erken çıksa da imleçler tutarlı kalır
+            self.frames += frames
+            self.filtered += filtered
+            if pos == end:
+                self._start = self._end = 0
+            else:
+                self._start = pos
+
+    def _write(self, view):
+        free = self.capacity - self._end
+        if free < len(view) and self._start > 0:
+            pending = self._end - self._start
+            self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+            free = self.capacity - pending
+
+        count = min(free, len(view))
+        self._view[self._end:self._end + count] = view[:count]
+        self._end += count
+        return count
+
+
+class FixedFrameDecoder(FrameDecoder):
+    # 20 baytlık checksum'lı sabit format. Başlık iki bayt (AA 55) olduğundan
+    # payload içindeki tek bir 0xAA nadiren aday olur; aday olursa checksum eler.
+
+    ERRORS = ('garbage', 'bad_type', 'bad_dlc', 'bad_checksum')
+    FRAME_LENGTH = CANProtocol.FIXED_FRAME_LENGTH
+
+    def _scan(self):
+        buf = self._buf
+        view = self._view
+        find = buf.find
+        length = self.FRAME_LENGTH
+        pos = self._start
+        end = self._end
+        frames = 0
+        filtered = 0
+        accept = self.id_filter
+        lost = self._lost > 0  # yerel bayrak; self._lost yalnızca hata yolunda güncellenir
+        try:
+            while True:
+                header = find(0xAA, pos, end)
+                if header == -1:
+                    if end != pos:
+                        self._lose('garbage', end - pos)
+                    pos = end
+                    break
+                if header != pos:
+                    self._lose('garbage', header - pos)
+                    lost = True
+                    pos = header
+
+                if end - header < length:
+                    # Eksik frame; başlığın geri kalanı şimdiden yanlışsa bekleme
+                    if end - header < 2 or buf[header + 1] == 0x55:
+                        break
+                    self._lose('bad_type', 1)
+                    lost = True
+                    pos = header + 1
+                    continue
+                dlc = buf[header + 9]
+                if (buf[header + 1] != 0x55 or buf[header + 2] != 0x01
+                        or buf[header + 3] not in (1, 2) or buf[header + 4] not in (1, 2)):
+                    reason = 'bad_type'
+                elif dlc > 8:
+                    reason = 'bad_dlc'
+                elif sum(view[header + 2:header + 19]) & 0xFF != buf[header + 19]:
+                    reason = 'bad_checksum'
+                else:
+                    reason = None
+                if reason is not None:
+                    self._lose(reason, 1)
+                    lost = True
+                    pos = header + 1
+                    continue
+
+                frame_id = int.from_bytes(view[header + 5:header + 9], 'little')
+                pos = header + length
+                if lost:
+                    self._resynced()
+                    lost = False
+                if accept is not None and frame_id not in accept:
+                    filtered += 1
+                    continue
+                frames += 1
+                yield frame_id, dlc, bytes(view[header + 10:header + 10 + dlc])
+        finally:
+            self.frames += frames
+            self.filtered += filtered
+            if pos == end:
+                self._start = self._end = 0
+            else:
+                self._start = pos
+
+
+# === FRAME PACKER === #
+class FramePacker:
+    # (id, dlc, extended, remote) başına başlık + type + id baytlarını bir kez
+    # doğrulayıp önbelleğe alır; her gönderimde yalnızca payload eklenir.
+    # pack_into() ile aynı tick'te üretilen frame'ler tek bir tampona dizilir.
+
+    def __init__(self, protocol=None):
+        self.protocol = protocol if protocol is not None else CANProtocol()
+        self._prefixes = {}
+
+    def prefix(self, frame_id: int, dlc: int, is_extended: bool = False, is_remote: bool = False) -> bytes:
+        key = (frame_id, dlc, is_extended, is_remote)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            # Doğrulama ve bayt düzeni için referans paketleyiciyi kullan
+            frame = self.protocol.pack_can_frame(frame_id, bytes(dlc), is_extended, is_remote)
+            prefix = frame[:len(frame) - dlc - 1]
+            self._prefixes[key] = prefix
+        return prefix
+
+    def pack_into(self, out: bytearray, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False):
+        out += self.prefix(frame_id, len(data), is_extended, is_remote)
+        out += data
+        out.append(CANProtocol.END_CODE)
+
+    def pack(self, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False) -> bytes:
+        out = bytearray()
+        self.pack_into(out, frame_id, data, is_extended, is_remote)
+        return bytes(out)
+
+
+class FixedFramePacker(FramePacker):
+    # Sabit format: önbellekteki ilk 10 bayt + dolgulu data + checksum.
+    # Önek baytlarının toplamı da önbellekte; checksum için yalnızca data toplanır.
+
+    def __init__(self, protocol=None):
+        super().__init__(protocol)
+        self._sums = {}
+
+    def prefix(self, frame_id: int, dlc: int, is_extended: bool = False, is_remote: bool = False) -> bytes:
+        key = (frame_id, dlc, is_extended, is_remote)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            prefix = self.protocol.pack_fixed_frame(frame_id, bytes(dlc), is_extended, is_remote)[:10]
+            self._prefixes[key] = prefix
+            self._sums[key] = sum(prefix[2:])
+        return prefix
+
+    def pack_into(self, out: bytearray, frame_id: int, data: bytes, is_extended: bool = False, is_remote: bool = False):
+        out += self.prefix(frame_id, len(data), is_extended, is_remote)
+        out += data
+        out += bytes(9 - len(data))  # dolgu + ayrılmış bayt
+        out.append((self._sums[(frame_id, len(data), is_extended, is_remote)] + sum(data)) & 0xFF)
+
+
+# --frame-format -> (çözücü, paketleyici)
+FRAME_FORMATS = {
+    'variable': (FrameDecoder, FramePacker),
+    'fixed': (FixedFrameDecoder, FixedFramePacker),
+}
@@ -0,0 +1,147 @@
+# === PERIODIC SCHEDULER === #
+# Monotonic saat ile çalışan periyodik görev zamanlayıcısı. Her görevin kendi
+# periyodu ve bir sonraki deadline'ı vardır; thread en yakın deadline'a kadar
+# uyur, aktif görev yoksa enable()/wake() çağrılana kadar hiç uyanmaz.
+# run() kendi thread'inde, run_async() bir asyncio döngüsünde çalışır.
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class PeriodicTask:
+    __slots__ = ('name', 'period', 'callback', 'enabled', 'deadline', 'runs', 'lateness')
+
+    def __init__(self, name, period, callback, enabled, history):
+        self.name = name
+        self.period = period
+        self.callback = callback
+        self.enabled = enabled
+        self.deadline = 0.0
+        self.runs = 0
+        self.lateness = deque(maxlen=history)  # saniye, deadline'dan ne kadar geç çalıştı
+
+
+class PeriodicScheduler:
+    def __init__(self, clock=time.monotonic, history=1000):
+        self.clock = clock
+        self.history = history
+        self._tasks = {}
+        self._cond = threading.Condition()
+        self._running = True
+        self._notify_async = None  # run_async() çalışırken döngüyü uyandırır
+
+    def add(self, name, period, callback, enabled=True):
+        with self._cond:
+            task = PeriodicTask(name, period, callback, enabled, self.history)
+            task.deadline = self.clock()
+            self._tasks[name] = task
+            self._notify()
+
+    def enable(self, name, enabled=True, delay=0.0):
+        task = self._tasks[name]
+        if task.enabled == enabled:
+            return
+        with self._cond:
+            if enabled:
+                # delay=0 ise yeni aktif olan görev beklemeden hemen çalışır
+                task.deadline = self.clock() + delay
+            task.enabled = enabled
+            self._notify()
+
+    def wake(self):
+        with self._cond:
+            self._notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._notify()
+
+    def _notify(self):
+        # _cond tutulurken çağrılır
+        self._cond.notify()
+        if self._notify_async is not None:
+            self._notify_async()
+
+    def run(self, after_tick=None):
+        # after_tick: aynı uyanışta çalışan görevlerden sonra bir kez çağrılır
+        while True:
+            with self._cond:
+                due = self._wait_for_due()
+                if due is None:
+                    return
+            self._run_tasks(due, after_tick)
+
+    async def run_async(self, after_tick=None):
+        # Aynı zamanlama, thread yerine asyncio döngüsünde; enable()/stop()
+        # başka bir thread'den de çağrılabilir
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        self._notify_async = lambda: loop.call_soon_threadsafe(wakeup.set)
+        try:
+            while True:
+                wakeup.clear()
+                with self._cond:
+                    if not self._running:
+                        return
+                    due, timeout = self._collect_due()
+                if due:
+                    self._run_tasks(due, after_tick)
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._notify_async = None
+
+    def _run_tasks(self, due, after_tick):
+        now = self.clock()
+        for task in due:
+            task.lateness.append(now - task.deadline)
+            task.runs += 1
+            task.deadline += task.period
+            if task.deadline <= now:
+                # Kaçırılan periyotları biriktirme, bir sonraki slottan devam et
+                task.deadline = now + task.period
+            task.callback()
+
+        if after_tick is not None:
+            after_tick()
+
+    def _collect_due(self):
+        # (şimdi çalışacaklar, en yakın deadline'a kalan süre ya da None)
+        now = self.clock()
+        enabled = [task for task in self._tasks.values() if task.enabled]
+        due = [task for task in enabled if task.deadline <= now]
+        if due or not enabled:
+            return due, None
+        return due, min(task.deadline for task in enabled) - now
+
+    def _wait_for_due(self):
+        while self._running:
+            due, timeout = self._collect_due()
+            if due:
+                return due
+            self._cond.wait(timeout)
+        return None
+
+    def jitter_stats(self):
+        # görev adı -> gecikme istatistikleri (ms)
+        stats = {}
+        for name, task in list(self._tasks.items()):
+            samples = sorted(task.lateness)
+            if not samples:
+                stats[name] = {'runs': task.runs, 'samples': 0}
+                continue
+            stats[name] = {
+                'runs': task.runs,
+                'samples': len(samples),
+                'mean_ms': sum(samples) / len(samples) * 1e3,
+                'p50_ms': samples[len(samples) // 2] * 1e3,
+                'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e3,
+                'max_ms': samples[-1] * 1e3,
+            }
+        return stats
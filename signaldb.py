@@ -0,0 +1,329 @@
+# === SIGNAL DATABASE === #
+# Frame ID'leri, bayt/bit düzeni, ölçek/ofset ve birimler kodda değil
+# signals.json'da tanımlanır (DBC benzeri). Dosya açılışta bir kez okunur ve
+# her mesaj için önceden hesaplanmış struct.Struct çözücü/kodlayıcılara derlenir;
+# alım yolu hex string'e çevirmeden doğrudan fiziksel değer üretir.
+#
+# signals.json:
+#
+#   {"messages": [
+#       {"id": "0x2601", "name": "Motor", "direction": "rx",
+#        "signals": [{"name": "speed", "size": "dlc", "offset": -15, "min": 0, "unit": "km/h"}]},
+#       {"id": 138, "name": "Throttle", "direction": "tx",
+#        "signals": [{"name": "throttle", "size": 1, "min": 0, "max": 255}]}
+#   ]}
+#
+# Sinyal alanları (varsayılanlar parantez içinde):
+#   byte (0), size (1) bayt     - payload içindeki konum (tamsayı, byte + size <= 8)
+#   size "dlc"                  - payload'ın tamamı, gelen DLC kadar bayt (boş payload 0);
+#                                 mesajdaki tek sinyal olmalı, bit dilimi/signed yok
+#   bit (0), bits (size*8)      - alan içinde bit dilimi (LSB'den)
+#   endian ("big"), signed (false)
+#   scale (1), offset (0)       - fiziksel = ham * scale + offset
+#   min, max                    - fiziksel değer sınırları (kırpılır)
+#   type ("int")                - int, float ya da bool
+#   unit, default               - birim etiketi, kodlamada verilmeyen değer
+#   deadband (0), bands ([])    - göstergeye yayın eşiği ve her zaman yayınlanan bant kenarları
+#   saturate                    - üstündeki değerler eşit sayılır (bkz. vehicle.Deadband)
+
+import json
+import os
+import struct
+from functools import lru_cache
+
+DEFAULT_SIGNALS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "signals.json")
+
+_STRUCT_CODES = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+_TYPES = {'int': int, 'float': float, 'bool': bool}
+
+
+class SignalError(ValueError):
+    pass
+
+
+class SignalDef:
+    __slots__ = ('name', 'byte', 'size', 'payload', 'bit', 'bits', 'endian', 'signed',
+                 'scale', 'offset', 'minimum', 'maximum', 'type', 'unit', 'default', 'deadband', 'bands', 'saturate')
+
+    def __init__(self, entry):
+        try:
+            self.name = entry['name']
+        except KeyError:
+            raise SignalError(f"Sinyal adı eksik: {entry}") from None
+        self.byte = entry.get('byte', 0)
+        size = entry.get('size', 1)
+        # "dlc": alan gelen payload'ın tamamıdır (en fazla 8 bayt)
+        self.payload = size == 'dlc'
+        self.size = 8 if self.payload else size
+        self.bit = entry.get('bit', 0)
+        self.bits = entry.get('bits', self.size * 8 if isinstance(self.size, int) else 0)
+        self.endian = entry.get('endian', 'big')
+        self.signed = entry.get('signed', False)
+        self.scale = entry.get('scale', 1)
+        self.offset = entry.get('offset', 0)
+        self.minimum = entry.get('min')
+        self.maximum = entry.get('max')
+        self.type = entry.get('type', 'int')
+        self.unit = entry.get('unit', '')
+        self.default = entry.get('default', 0)
+        self.deadband = entry.get('deadband', 0)
+        self.bands = tuple(entry.get('bands', ()))
+        self.saturate = entry.get('saturate')
+
+        # Düzen hataları derlenmiş çözücüde değil yüklemede yakalanır
+        for key in ('byte', 'size', 'bit', 'bits'):
+            value = getattr(self, key)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise SignalError(f"{self.name}: {key} negatif olmayan bir tamsayı olmalı ({value!r})")
+        if self.byte + self.size > 8:
+            raise SignalError(f"{self.name}: alan 8 baytlık payload'ın dışına taşıyor (byte {self.byte}, size {self.size})")
+        if self.endian not in ('big', 'little'):
+            raise SignalError(f"{self.name}: endian 'big' ya da 'little' olmalı")
+        if self.type not in _TYPES:
+            raise SignalError(f"{self.name}: bilinmeyen type {self.type!r}")
+        if self.size < 1 or self.bit < 0 or self.bits < 1 or self.bit + self.bits > self.size * 8:
+            raise SignalError(f"{self.name}: bit düzeni alanın dışına taşıyor")
+        if self.payload and (self.byte or self.signed or not self.whole_field):
+            raise SignalError(f"{self.name}: size \"dlc\" ile byte, bit dilimi ve signed kullanılamaz")
+        if self.scale == 0:
+            raise SignalError(f"{self.name}: scale 0 olamaz")
+        if self.deadband < 0 or list(self.bands) != sorted(self.bands):
+            raise SignalError(f"{self.name}: deadband negatif ya da bands sıralı değil")
+
+    @property
+    def end(self):
+        return self.byte + self.size
+
+    @property
+    def whole_field(self):
+        # Bit dilimi yok: struct kodu doğrudan kullanılabilir
+        return self.bit == 0 and self.bits == self.size * 8
+
+    def struct_code(self):
+        if self.payload or self.size not in _STRUCT_CODES or not self.whole_field:
+            return None
+        code = _STRUCT_CODES[self.size]
+        return code if self.signed else code.upper()
+
+    def raw_expr(self, var, namespace):
+        # data -> ham tamsayı ifadesi (çözücü kaynağı için)
+        if self.payload:
+            # Tek baytlık payload Message._compile_decoder'daki tablodan döner
+            namespace['_from_bytes'] = int.from_bytes
+            return f"_from_bytes(data, {self.endian!r})"
+        code = self.struct_code()
+        if code == 'B':
+            return f"data[{self.byte}]"
+        if code is not None:
+            namespace[f"_{var}"] = struct.Struct(('>' if self.endian == 'big' else '<') + code).unpack_from
+            return f"_{var}(data, {self.byte})[0]"
+        namespace['_from_bytes'] = int.from_bytes
+        return (f"(_from_bytes(data[{self.byte}:{self.end}], {self.endian!r}) >> {self.bit})"
+                f" & {(1 << self.bits) - 1}")
+
+    def physical_lines(self, var):
+        # ham -> fiziksel; gereksiz adımlar derlemede atlanır
+        scale, offset = self.scale, self.offset
+        low, high = self.minimum, self.maximum
+        lines = []
+        if self.signed and not self.whole_field:
+            lines.append(f"if {var} & {1 << (self.bits - 1)}: {var} -= {1 << self.bits}")
+        if scale != 1:
+            divisor = 1 / scale
+            if divisor.is_integer():
+                # raw / 10, raw * 0.1'den farklı olarak 5.7 gibi değerleri tam verir
+                lines.append(f"{var} = {var} / {int(divisor)}")
+            else:
+                lines.append(f"{var} = {var} * {scale!r}")
+        if offset:
+            lines.append(f"{var} = {var} + {offset!r}")
+        if low is not None:
+            lines.append(f"if {var} < {low!r}: {var} = {low!r}")
+        if high is not None:
+            lines.append(f"if {var} > {high!r}: {var} = {high!r}")
+        if self.type == 'bool':
+            lines.append(f"{var} = {var} != 0")
+        elif self.type == 'float' and not lines:
+            lines.append(f"{var} = float({var})")
+        elif self.type == 'int' and scale != 1:
+            lines.append(f"{var} = round({var})")
+        return lines
+
+    def to_raw(self, value):
+        # fiziksel -> ham (kodlama için), sınırlar içinde
+        if self.minimum is not None and value < self.minimum:
+            value = self.minimum
+        if self.maximum is not None and value > self.maximum:
+            value = self.maximum
+        raw = round((value - self.offset) / self.scale)
+        low = -(1 << (self.bits - 1)) if self.signed else 0
+        high = (1 << (self.bits - 1)) - 1 if self.signed else (1 << self.bits) - 1
+        return low if raw < low else high if raw > high else raw
+
+
+class Message:
+    def __init__(self, entry):
+        frame_id = entry.get('id')
+        if isinstance(frame_id, str):
+            frame_id = int(frame_id, 0)
+        if not isinstance(frame_id, int):
+            raise SignalError(f"Mesaj ID'si eksik ya da geçersiz: {entry}")
+        self.frame_id = frame_id
+        self.name = entry.get('name', hex(frame_id))
+        self.direction = entry.get('direction', 'rx')
+        if self.direction not in ('rx', 'tx'):
+            raise SignalError(f"{self.name}: direction 'rx' ya da 'tx' olmalı")
+        self.extended = entry.get('extended', frame_id > 0x7FF)
+        self.signals = [SignalDef(signal) for signal in entry.get('signals', [])]
+        if not self.signals:
+            raise SignalError(f"{self.name}: sinyal tanımı yok")
+        if len(self.signals) > 1 and any(signal.payload for signal in self.signals):
+            raise SignalError(f"{self.name}: size \"dlc\" olan sinyal mesajdaki tek sinyal olmalı")
+        self.dlc = entry.get('dlc', max(signal.end for signal in self.signals))
+        if not isinstance(self.dlc, int) or not 0 <= self.dlc <= 8:
+            raise SignalError(f"{self.name}: dlc 0-8 arası olmalı")
+        # Sabit düzende çözücünün ihtiyaç duyduğu en kısa payload
+        self.min_length = 0 if self.signals[0].payload else max(signal.end for signal in self.signals)
+        self.decode = self._compile_decoder()
+        self._encoders = {}
+
+    def signal(self, name):
+        for signal in self.signals:
+            if signal.name == name:
+                return signal
+        raise SignalError(f"{self.name}: {name} sinyali yok")
+
+    def _compile_decoder(self):
+        # data -> ((sinyal adı, fiziksel değer), ...)
+        # namedtuple gibi düz bir fonksiyon kaynağı üretilir: closure zinciri
+        # yerine tek çağrı, tek baytlık alanlar doğrudan data[i]
+        namespace = {}
+        names = [f"v{index}" for index in range(len(self.signals))]
+        body = []
+        if self.min_length:
+            # Kısa frame IndexError/struct.error yerine anlaşılır bir hata verir
+            namespace['_short'] = self._short_frame
+            body.append(f"if len(data) < {self.min_length}: _short(data)")
+        layout = self._single_struct() if len(self.signals) > 1 else None
+        if layout is not None:
+            namespace['_unpack'] = layout.unpack_from
+            body.append(f"{', '.join(names)} = _unpack(data)")
+        else:
+            body.extend(f"{var} = {signal.raw_expr(var, namespace)}" for var, signal in zip(names, self.signals))
+        for var, signal in zip(names, self.signals):
+            body.extend(signal.physical_lines(var))
+        pairs = ''.join(f"({signal.name!r}, {var}), " for var, signal in zip(names, self.signals))
+        body.append(f"return ({pairs})")
+
+        decode = self._exec_decoder(body, namespace)
+        if self.signals[0].payload:
+            # En yaygın frame tek baytlık payload: 256 sonuç önceden hesaplanır,
+            # çözme bir uzunluk kontrolü ve bir indeks olur
+            namespace['_table'] = tuple(decode(bytes((value,))) for value in range(256))
+            decode = self._exec_decoder(["if len(data) == 1: return _table[data[0]]"] + body, namespace)
+        return decode
+
+    def _exec_decoder(self, body, namespace):
+        self.decode_source = "def decode(data):\n" + ''.join(f"    {line}\n" for line in body)
+        exec(self.decode_source, namespace)
+        return namespace['decode']
+
+    def _short_frame(self, data):
+        raise SignalError(f"{self.name}: payload {len(data)} bayt, en az {self.min_length} gerekli")
+
+    def _single_struct(self):
+        # Tüm sinyaller bayt hizalı, çakışmasız ve aynı endian ise tek bir Struct
+        signals = sorted(self.signals, key=lambda signal: signal.byte)
+        if any(signal.struct_code() is None for signal in signals):
+            return None
+        if len({signal.endian for signal in signals}) != 1:
+            return None
+        if signals != self.signals:
+            return None  # unpack sırası tanım sırasıyla aynı olmalı
+        fmt = '>' if signals[0].endian == 'big' else '<'
+        position = 0
+        for signal in signals:
+            if signal.byte < position:
+                return None
+            fmt += 'x' * (signal.byte - position) + signal.struct_code()
+            position = signal.end
+        return struct.Struct(fmt)
+
+    def encode(self, **values):
+        # Verilmeyen sinyaller default değerini alır
+        payload = 0
+        for signal in self.signals:
+            raw = signal.to_raw(values.get(signal.name, signal.default))
+            if signal.payload:
+                # Payload'ın tamamı: dlc bayta sığacak şekilde kırpılır
+                return min(raw, (1 << (8 * self.dlc)) - 1).to_bytes(self.dlc, signal.endian)
+            field = (raw & ((1 << signal.bits) - 1)) << signal.bit
+            payload |= int.from_bytes(
+                field.to_bytes(signal.size, signal.endian), 'big') << (8 * (self.dlc - signal.end))
+        return payload.to_bytes(self.dlc, 'big')
+
+    def encoder(self, name):
+        # Tek sinyal için değer -> payload; 8 bitlik sinyaller tablo araması
+        encoder = self._encoders.get(name)
+        if encoder is None:
+            signal = self.signal(name)
+            if signal.bits <= 8 and not signal.signed:
+                low = signal.minimum if signal.minimum is not None else 0
+                high = signal.maximum if signal.maximum is not None else 255
+                table = {value: self.encode(**{name: value}) for value in range(int(low), int(high) + 1)}
+                encoder = lambda value: table.get(value) or self.encode(**{name: value})
+            else:
+                encoder = lambda value: self.encode(**{name: value})
+            self._encoders[name] = encoder
+        return encoder
+
+
+class SignalDatabase:
+    def __init__(self, messages, path=None):
+        self.path = path
+        self.messages = messages
+        self.rx = {}
+        self.by_name = {}
+        for message in messages:
+            if message.name in self.by_name:
+                raise SignalError(f"{message.name} iki kez tanımlı")
+            self.by_name[message.name] = message
+            if message.direction == 'rx':
+                if message.frame_id in self.rx:
+                    raise SignalError(f"{hex(message.frame_id)} iki kez tanımlı")
+                self.rx[message.frame_id] = message
+
+    def __contains__(self, frame_id):
+        return frame_id in self.rx
+
+    def decode(self, frame_id, data):
+        return self.rx[frame_id].decode(data)
+
+    def name(self, frame_id, default="Bilinmeyen"):
+        message = self.rx.get(frame_id)
+        return message.name if message is not None else default
+
+    def message(self, name):
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise SignalError(f"{name} mesajı tanımlı değil ({self.path})") from None
+
+    def command(self, name, **values):
+        # Sabit payload'lı komut: (frame_id, payload, extended)
+        message = self.message(name)
+        return message.frame_id, message.encode(**values), message.extended
+
+    def signal_names(self):
+        return {signal.name for message in self.rx.values() for signal in message.signals}
+
+
+def load_signal_db(path=DEFAULT_SIGNALS_PATH):
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    return SignalDatabase([Message(entry) for entry in config.get('messages', [])], path)
+
+
+@lru_cache(maxsize=None)
+def default_signal_db():
+    return load_signal_db(DEFAULT_SIGNALS_PATH)
@@ -1,23 +1,38 @@
-import struct
-import subprocess
+import sys
+import time
 
-JS_EVENT_SIZE = 8
-JS_BUTTON = 0x01
+from gamepad import JoystickReader, JS_BUTTON
 
 START_BUTTON_NUMBER = 9  # <-- change this to your Start button number
 
+# Start'a basılmadan önce ağır import'ları (PySide6, serial, uygulama modülleri)
+# yap ve fast-boot kaynaklarını kaydet; basıldığında yeni bir python süreci
+# başlatmak yerine aynı yorumlayıcıda main.main()'e geçilir.
+def prewarm():
+    import main
+    from PySide6 import QtQuick  # noqa: F401  QML motorunun yüklediği modül
+    from PySide6.QtCore import QResource
+    QResource.registerResource(main.RCC_PATH)
+    return main
+
 def main():
+    app = prewarm()
     print("Waiting for Start button press on /dev/input/js0...")
-    with open('/dev/input/js0', 'rb') as jsdev:
-        while True:
-            evbuf = jsdev.read(JS_EVENT_SIZE)
-            if evbuf:
-                time, value, type, number = struct.unpack('IhBB', evbuf)
-                if type & JS_BUTTON:
-                    if number == START_BUTTON_NUMBER and value == 1:  # pressed
-                        print("Start button pressed! Launching your app...")
-                        subprocess.Popen(['python3', '/path/to/your/app.py'])
-                        break
+    reader = JoystickReader('/dev/input/js0', mapping={(JS_BUTTON, START_BUTTON_NUMBER): 'start'})
+    try:
+        pressed = False
+        while not pressed:
+            for key, value, timestamp in reader.poll():
+                if value == 1:  # pressed
+                    pressed = True
+                    break
+    finally:
+        reader.close()
+    print("Start button pressed! Launching your app...")
+
+    # Açılış süresi butona basıldığı andan itibaren ölçülür
+    boot = app.BootTimer(time.perf_counter())
+    return app.main(['--fast-boot'] + sys.argv[1:], boot=boot)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
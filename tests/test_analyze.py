@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+import pytest
+
+from com.analyze import IdStatistics, decode_raw, iter_raw_chunks, signal_values
+from protocol import FrameDecoder, FramePacker
+from signaldb import Message, default_signal_db
+
+# Payload'ı geçerli görünen bir 0xAA ... 0x55 dizisi taşıyan extended frame
+TRICKY_FRAME = (0x3001, bytes.fromhex('aae0aa1faaaa5555'))
+
+
+def make_stream(count, seed, noise=False):
+    rng = random.Random(seed)
+    packer = FramePacker()
+    out = bytearray()
+    for _ in range(count):
+        if rng.random() < 0.1:
+            frame_id, data = TRICKY_FRAME
+        else:
+            frame_id = rng.choice((0x123, 0x7FF, 0x2301, 0x2601, 0x3001))
+            data = bytes(rng.choice((0xAA, 0x55, 0xE0, rng.randrange(256))) for _ in range(rng.randint(0, 8)))
+        out += packer.pack(frame_id, data, frame_id > 0x7FF)
+        if noise and rng.random() < 0.05:
+            out += bytes(rng.choice((0xAA, 0x55, 0xC8, rng.randrange(256))) for _ in range(rng.randint(1, 6)))
+    return bytes(out)
+
+
+def reference(stream):
+    return [(frame_id, dlc, data) for frame_id, dlc, data in FrameDecoder().feed(stream)]
+
+
+def frames_of(columns):
+    return [(int(frame_id), int(dlc), bytes(payload[:dlc]))
+            for frame_id, dlc, payload in zip(columns['frame_id'], columns['dlc'], columns['payload'])]
+
+
+@pytest.mark.parametrize('noise', (False, True))
+@pytest.mark.parametrize('chunk_size', (1, 15, 1000))
+def test_chunked_decode_matches_frame_decoder(tmp_path, chunk_size, noise):
+    stream = make_stream(400, seed=chunk_size, noise=noise)
+    path = tmp_path / 'drive.bin'
+    path.write_bytes(stream)
+
+    decoded = []
+    offsets = []
+    for columns in iter_raw_chunks(str(path), chunk_size, baud=2000000):
+        decoded += frames_of(columns)
+        offsets += columns['offset'].tolist()
+
+    assert decoded == reference(stream)
+    assert offsets == sorted(offsets)
+
+
+def test_split_inside_payload_carries_real_frame():
+    packer = FramePacker()
+    stream = (packer.pack(0x2601, b'\x50', True) + packer.pack(*TRICKY_FRAME, True)
+              + packer.pack(0x123, b'\xaa\x55'))
+    expected = reference(stream)
+    buf = np.frombuffer(stream, dtype=np.uint8)
+    for split in range(len(stream) + 1):
+        first, consumed = decode_raw(buf[:split])
+        rest, _ = decode_raw(buf[consumed:], consumed, final=True)
+        assert frames_of(first) + frames_of(rest) == expected, split
+
+
+def test_id_statistics_across_chunks():
+    rng = np.random.default_rng(1)
+    frame_ids = rng.choice(np.array([0x2301, 0x2601, 0x2801], dtype=np.uint32), 3000)
+    timestamps = np.sort(rng.random(3000)) * 10
+    values = rng.integers(0, 256, 3000).astype(np.uint64)
+
+    stats = IdStatistics()
+    for part in np.array_split(np.arange(3000), 7):
+        stats.update({'frame_id': frame_ids[part], 'timestamp': timestamps[part], 'value': values[part]})
+    summary = stats.summary()
+
+    for frame_id in (0x2301, 0x2601, 0x2801):
+        mask = frame_ids == frame_id
+        ts, vs = timestamps[mask], values[mask].astype(float)
+        gaps = np.diff(ts)
+        s = summary[hex(frame_id)]
+        assert s['count'] == mask.sum()
+        assert s['min'] == vs.min() and s['max'] == vs.max()
+        assert s['mean'] == pytest.approx(vs.mean())
+        assert s['period_ms'] == pytest.approx(gaps.mean() * 1e3)
+        assert s['jitter_ms'] == pytest.approx(gaps.std() * 1e3, rel=1e-6)
+        assert s['max_gap_ms'] == pytest.approx(gaps.max() * 1e3)
+
+
+def test_id_statistics_use_decoded_signal_values(tmp_path):
+    packer = FramePacker()
+    stream = b''.join((
+        packer.pack(0x2601, b'\x64', True),      # hız: 100 - 15 = 85 km/h
+        packer.pack(0x2601, b'\x01\x2c', True),  # 300 - 15 = 285 km/h
+        packer.pack(0x2801, b'\x02\x58', True),  # sıcaklık: 600 / 10 = 60.0
+        packer.pack(0x2801, b'\x00\xfa', True),  # 25.0
+        packer.pack(0x123, b'\x01\x00'),         # tanımsız ID: ham değer
+    ))
+    path = tmp_path / 'drive.bin'
+    path.write_bytes(stream)
+
+    stats = IdStatistics(default_signal_db())
+    for columns in iter_raw_chunks(str(path), 1 << 20, baud=2000000):
+        stats.update(columns)
+    summary = stats.summary()
+
+    assert (summary['0x2601']['min'], summary['0x2601']['max'], summary['0x2601']['mean']) == (85, 285, 185)
+    assert (summary['0x2801']['min'], summary['0x2801']['max']) == (25.0, 60.0)
+    assert summary['0x2801']['mean'] == pytest.approx(42.5)
+    assert summary['0x123']['min'] == 256
+
+
+@pytest.mark.parametrize('signal', [
+    {'name': 's', 'byte': 1, 'size': 2, 'endian': 'little', 'signed': True, 'scale': 0.5},
+    {'name': 's', 'byte': 0, 'size': 2, 'bit': 3, 'bits': 7, 'offset': -40},
+    {'name': 's', 'size': 'dlc', 'endian': 'little', 'max': 1000},
+    {'name': 's', 'byte': 2, 'size': 1, 'type': 'bool'},
+])
+def test_signal_values_match_compiled_decoder(signal):
+    message = Message({'id': 0x100, 'dlc': 4, 'signals': [signal]})
+    rng = np.random.default_rng(2)
+    payload = rng.integers(0, 256, (200, 8)).astype(np.uint8)
+    dlc = rng.integers(0, 9, 200).astype(np.uint8)
+
+    values = signal_values(message.signals[0], payload, dlc, message.min_length)
+    for row, length, value in zip(payload, dlc, values):
+        data = bytes(row[:length])
+        if len(data) < message.min_length:
+            assert np.isnan(value)
+        else:
+            assert value == message.decode(data)[0][1]
@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+
+import pytest
+
+from can_io import CanIoCore
+from gamepad import EV_KEY, EvdevReader
+from main import CANReceiver, CANWriter
+from protocol import FramePacker
+from signaldb import default_signal_db
+from transport import LoopbackTransport
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def ports():
+    # a: araç tarafı, b: uygulamanın portu
+    a, b = LoopbackTransport.pair(timeout=0.05)
+    yield a, b
+    a.close()
+    b.close()
+
+
+def test_rx_tx_and_gamepad_share_one_loop(ports):
+    vehicle_port, port = ports
+    receiver = CANReceiver(port)
+    writer = CANWriter(port)
+    core = CanIoCore(receiver, writer)
+    received = []
+    receiver.dispatcher.register(0x2601, lambda *frame: received.append((threading.current_thread().name, frame)))
+    read_fd, write_fd = os.pipe()
+    core.add_input(EvdevReader(read_fd))
+    core.run_in_thread()
+    try:
+        vehicle_port.write(FramePacker().pack(0x2601, b'\x64', True))
+        assert wait_for(lambda: received)
+        assert received == [('can-io', (0x2601, 1, b'\x64'))]  # add_reader: executor yok
+
+        os.write(write_fd, EvdevReader.EVENT.pack(10, 0, EV_KEY, 0x127, 1))  # A
+        button_a = default_signal_db().command('ButtonA')[:2]
+        expected = FramePacker().pack(*button_a)
+        assert wait_for(lambda: vehicle_port.in_waiting >= len(expected))
+        assert vehicle_port.read(len(expected)) == expected
+        assert wait_for(lambda: writer.scheduler._tasks['buttons'].enabled)
+    finally:
+        core.stop()
+        core.join(2)
+        os.close(read_fd)
+        os.close(write_fd)
+    assert not core._thread.is_alive()
+    assert not receiver.running and not writer.running
+    assert core._readers == []
+
+
+def test_port_without_fileno_falls_back_to_executor():
+    class Replay:
+        path = 'test'
+
+        def __init__(self):
+            self.stopped = threading.Event()
+
+        def play(self, handle_frame, realtime=True):
+            handle_frame(0x123, 0, b'')
+            self.stopped.wait(2)
+            return 1
+
+        def stop(self):
+            self.stopped.set()
+
+    receiver = CANReceiver(None, receive_mode='blocking')
+    receiver.replay = Replay()
+    received = []
+    receiver.dispatcher.register(0x123, lambda *frame: received.append(threading.current_thread().name))
+    core = CanIoCore(receiver, CANWriter(None))
+    core.run_in_thread()
+    try:
+        assert wait_for(lambda: received)
+    finally:
+        core.stop()
+        core.join(2)
+    assert received[0] != 'can-io'
+    assert receiver.replay.stopped.is_set()  # _shutdown oynatmayı durdurdu
+    assert not core._thread.is_alive()
+
+
+def test_serial_error_detaches_reader(ports):
+    vehicle_port, port = ports
+    receiver = CANReceiver(port)
+    core = CanIoCore(receiver, CANWriter(None))
+    core.run_in_thread()
+    try:
+        vehicle_port.close()  # karşı taraf kapandı: read() TransportError
+        assert wait_for(lambda: receiver.metrics.errors['serial'] == 1)
+        assert wait_for(lambda: core._readers == [])
+        assert not receiver.running
+    finally:
+        core.stop()
+        core.join(2)
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from cantrace import RECORD, TRACE_MAGIC, TraceRecorder, TraceReplay
+from main import CANReceiver, parse_args
+
+FRAMES = [(0x2601, 1, b'\x64'), (0x123, 0, b''), (0x1FFFFFFF, 8, bytes(range(8)))]
+
+
+def write_trace(path, frames, interval_ns):
+    # Zaman damgaları elle: oynatma zamanlaması kesin bilinsin
+    with open(path, 'wb') as f:
+        f.write(TRACE_MAGIC)
+        for index, (frame_id, dlc, data) in enumerate(frames):
+            f.write(RECORD.pack(1_000_000_000 + index * interval_ns, frame_id, dlc, 0, data))
+    return str(path)
+
+
+def collect(replay, **kwargs):
+    played = []
+    count = replay.play(lambda frame_id, dlc, data: played.append((time.perf_counter(), frame_id, dlc, data)),
+                        **kwargs)
+    return count, played
+
+
+def test_record_replay_round_trip(tmp_path):
+    path = str(tmp_path / 'drive.cantrace')
+    recorder = TraceRecorder(path, flush_interval=0.01)
+    for frame in FRAMES:
+        recorder(*frame)
+    recorder.close()
+    assert recorder.recorded == len(FRAMES)
+
+    replay = TraceReplay(path)
+    try:
+        assert len(replay) == len(FRAMES)
+        timestamps = [timestamp for timestamp, *_ in replay.frames()]
+        assert timestamps == sorted(timestamps)
+        count, played = collect(replay, realtime=False)
+        assert count == len(FRAMES)
+        assert [tuple(frame) for _, *frame in played] == FRAMES
+    finally:
+        replay.close()
+
+
+def test_replay_fast_ignores_recorded_timing(tmp_path):
+    replay = TraceReplay(write_trace(tmp_path / 'slow.cantrace', FRAMES * 4, interval_ns=200_000_000))
+    try:
+        start = time.perf_counter()
+        count, _ = collect(replay, realtime=False)  # kayıt 2.2 s sürüyor
+        assert count == 12
+        assert time.perf_counter() - start < 0.5
+    finally:
+        replay.close()
+
+
+@pytest.mark.parametrize('speed', (1.0, 2.0))
+def test_realtime_replay_keeps_recorded_spacing(tmp_path, speed):
+    interval = 0.05
+    replay = TraceReplay(write_trace(tmp_path / 'drive.cantrace', FRAMES * 2, interval_ns=int(interval * 1e9)))
+    try:
+        count, played = collect(replay, realtime=True, speed=speed)
+        assert count == 6
+        first = played[0][0]
+        for index, (at, *_) in enumerate(played):
+            assert at - first >= index * interval / speed - 0.002
+        assert played[-1][0] - first < 5 * interval / speed + 0.2
+    finally:
+        replay.close()
+
+
+def test_stop_interrupts_realtime_replay(tmp_path):
+    replay = TraceReplay(write_trace(tmp_path / 'long.cantrace', FRAMES * 10, interval_ns=1_000_000_000))
+    try:
+        threading.Timer(0.1, replay.stop).start()
+        start = time.perf_counter()
+        count, _ = collect(replay, realtime=True)
+        assert count == 1
+        assert time.perf_counter() - start < 1.0
+    finally:
+        replay.close()
+
+
+def test_non_trace_file_rejected(tmp_path):
+    path = tmp_path / 'raw.bin'
+    path.write_bytes(b'\xaa\xc1\x01\x23\x00\x55' * 4)
+    with pytest.raises(ValueError):
+        TraceReplay(str(path))
+
+
+def test_receiver_records_and_replays_fast(tmp_path):
+    path = str(tmp_path / 'drive.cantrace')
+    source = CANReceiver(None, receive_mode='blocking')
+    source.recorder = TraceRecorder(path, flush_interval=0.01)
+    for frame in FRAMES:
+        source.handle_frame(*frame)
+        time.sleep(0.1)  # kayıt 0.2 s sürüyor
+    source.recorder.close()
+
+    args, _ = parse_args(['--replay', path, '--replay-fast'])
+    target = CANReceiver(None, receive_mode='blocking')
+    target.replay = TraceReplay(args.replay)
+    target.replay_realtime = not args.replay_fast  # main() ile aynı
+    received = []
+    for frame_id, *_ in FRAMES:
+        target.dispatcher.register(frame_id, lambda *frame: received.append(frame))
+    try:
+        start = time.perf_counter()
+        target.start_receiving()
+        assert time.perf_counter() - start < 0.1
+    finally:
+        target.replay.close()
+    assert received == FRAMES
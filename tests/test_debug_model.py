@@ -0,0 +1,76 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from debug_model import FRAME_ID_ROLE, CanMessageModel
+
+CAPACITY = 4
+
+
+@pytest.fixture
+def model():
+    QCoreApplication.instance() or QCoreApplication([])
+    model = CanMessageModel(capacity=CAPACITY)
+    model._timer.stop()  # toplu aktarım testte elle yapılır
+    model.active = True
+    model.changes = []
+    model.rowsRemoved.connect(lambda parent, first, last: model.changes.append(('removed', first, last)))
+    model.rowsInserted.connect(lambda parent, first, last: model.changes.append(('inserted', first, last)))
+    return model
+
+
+def push(model, *frame_ids):
+    for frame_id in frame_ids:
+        model.push(frame_id, 1, bytes((frame_id & 0xFF,)))
+    model._flush()
+
+
+def rows(model):
+    # Satır 0 en yeni kayıt
+    return [int(model.data(model.index(row), FRAME_ID_ROLE), 16) for row in range(model.rowCount())]
+
+
+def test_newest_rows_inserted_at_top(model):
+    push(model, 1, 2)
+    push(model, 3)
+    assert rows(model) == [3, 2, 1]
+    assert model.changes == [('inserted', 0, 1), ('inserted', 0, 0)]
+
+
+def test_overflow_drops_oldest_rows_from_bottom(model):
+    push(model, 1, 2, 3)
+    model.changes.clear()
+    push(model, 4, 5, 6)
+    assert rows(model) == [6, 5, 4, 3]
+    # Taşan 2 kayıt (1 ve 2) eklemeden önce alttan silinir
+    assert model.changes == [('removed', 1, 2), ('inserted', 0, 2)]
+
+
+def test_wrapped_buffer_keeps_order(model):
+    for frame_id in range(1, 12):
+        push(model, frame_id)
+    assert rows(model) == [11, 10, 9, 8]
+    assert model.rowCount() == CAPACITY
+
+
+def test_batch_larger_than_capacity_keeps_newest(model):
+    push(model, 1)
+    model.changes.clear()
+    push(model, *range(10, 20))
+    assert rows(model) == [19, 18, 17, 16]
+    assert model.changes == [('removed', 0, 0), ('inserted', 0, CAPACITY - 1)]
+
+
+def test_shrinking_capacity_keeps_newest(model):
+    push(model, 1, 2, 3, 4)
+    model.capacity = 2
+    assert rows(model) == [4, 3]
+    push(model, 5)
+    assert rows(model) == [5, 4]
+
+
+def test_inactive_or_filtered_frames_not_recorded(model):
+    model.filter = "2, 3"
+    push(model, 1, 2, 3)
+    model.active = False
+    push(model, 2)
+    assert rows(model) == [3, 2]
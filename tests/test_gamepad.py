@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from gamepad import EV_ABS, EV_KEY, EV_SYN, Control, EvdevReader
+
+
+@pytest.fixture
+def reader():
+    read_fd, write_fd = os.pipe()
+    reader = EvdevReader(read_fd)
+    yield reader
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def event(type_, code, value, sec=10, usec=500000):
+    return EvdevReader.EVENT.pack(sec, usec, type_, code, value)
+
+
+@pytest.mark.parametrize('code, control', [
+    (0x127, Control.A),  # BTN_BASE2
+    (0x126, Control.B),  # BTN_BASE
+    (0x134, Control.X),  # BTN_WEST
+    (0x133, Control.Y),  # BTN_NORTH
+])
+def test_button_codes_follow_input_event_codes(reader, code, control):
+    assert reader.decode(event(EV_KEY, code, 1)) == [(control, 1, 10.5)]
+
+
+def test_axes_decoded_and_sync_skipped(reader):
+    data = event(EV_ABS, 0x02, 200) + event(EV_SYN, 0, 0) + event(EV_ABS, 0x11, -1) + event(EV_KEY, 0x128, 1)
+    assert reader.decode(data) == [(Control.THROTTLE, 200, 10.5), (Control.HAT_Y, -1, 10.5)]
@@ -0,0 +1,84 @@
+import logging
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from main import CANReceiver
+from metrics import Histogram, IdCounters, MetricsBridge, RateLimitedLog
+from protocol import FramePacker
+
+
+def test_histogram_percentiles_use_bucket_upper_bound():
+    histogram = Histogram()
+    for value in [3] * 90 + [100] * 9 + [5000]:
+        histogram.record(value)
+    # 3 -> [2, 4) kovası, 100 -> [64, 128) kovası
+    assert histogram.summary() == {'count': 100, 'p50': 3, 'p99': 127, 'max': 5000}
+    assert Histogram().summary() == {'count': 0, 'p50': 0, 'p99': 0, 'max': 0}
+
+
+def test_histogram_clamps_to_last_bucket():
+    histogram = Histogram(buckets=4)
+    histogram.record(1 << 20)
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(0.5) == 7  # son kovanın üst sınırı
+
+
+def test_id_counters_overflow_into_other_slot():
+    counters = IdCounters(max_ids=2)
+    for frame_id in (0x10, 0x20, 0x10, 0x30, 0x40, 0x30):
+        counters.increment(frame_id)
+    assert counters.snapshot() == {0x10: 2, 0x20: 1, 'other': 3}
+
+
+def test_rate_limited_log_reports_suppressed_count(caplog, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('metrics.time.monotonic', lambda: now[0])
+    throttled = RateLimitedLog(logging.getLogger('test.metrics'), interval=5.0)
+    with caplog.at_level(logging.WARNING, logger='test.metrics'):
+        for _ in range(4):
+            throttled.warning('resync', "kayıp %d", 1)
+        throttled.warning('other', "ayrı anahtar")
+        now[0] += 5.0
+        throttled.warning('resync', "kayıp %d", 2)
+    assert [record.getMessage() for record in caplog.records] == [
+        "kayıp 1", "ayrı anahtar", "kayıp 2 (son 5s içinde 3 benzer mesaj bastırıldı)"]
+
+
+def test_bridge_reports_receive_path_counters(monkeypatch):
+    QCoreApplication.instance() or QCoreApplication([])
+    now = [10.0]
+    monkeypatch.setattr('metrics.time.monotonic', lambda: now[0])
+    receiver = CANReceiver(None, receive_mode='blocking')
+    bridge = MetricsBridge(receiver, dump_interval=0)
+    bridge._timer.stop()
+    bridge.refresh()
+
+    packer = FramePacker()
+    chunk = b'\x00' * 4 + packer.pack(0x2601, b'\x64', True) * 3 + packer.pack(0x123, b'')
+    receiver.process_chunk(chunk)
+    now[0] += 2.0
+    bridge.refresh()
+
+    summary = bridge._summary
+    assert summary['rx_fps'] == {0x2601: 1.5, 0x123: 0.5}
+    assert summary['rx_bytes_per_s'] == len(chunk) / 2
+    assert summary['rx_reads'] == 1 and summary['read_size']['count'] == 1
+    assert summary['decoder']['frames'] == 4 and summary['decoder']['dropped_bytes'] == 4
+    assert summary['resync_bytes'] == {'count': 1, 'p50': 4, 'p99': 4, 'max': 4}
+    assert summary['latency_us']['count'] == 1
+    assert bridge.text.startswith("RX 2 f/s")
+    assert bridge.summary['rx_fps'] == {'0x2601': 1.5, '0x123': 0.5}  # QML: string anahtarlar
+
+
+@pytest.mark.parametrize('raising', (True, False))
+def test_handler_errors_counted_not_raised(raising):
+    receiver = CANReceiver(None, receive_mode='blocking')
+
+    def handler(*frame):
+        if raising:
+            raise ValueError("bozuk")
+    receiver.dispatcher.register(0x2601, handler)
+    receiver.dispatch_frames([(0x2601, 1, b'\x01')] * 2)
+    assert receiver.metrics.errors['handler'] == (2 if raising else 0)
+    assert receiver.metrics.frames.snapshot() == {0x2601: 2}
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from main import CANReceiver
+from metrics import MetricsBridge
+from multibus import FrameMerger, MultiBus, parse_bus
+from protocol import FramePacker
+
+WINDOW = 0.002
+
+
+def merged(chunks):
+    return [(timestamp, frames[0][0]) for timestamp, _, frames in chunks]
+
+
+def frame(frame_id):
+    return [(frame_id, 1, b'\x00')]
+
+
+def test_merger_orders_chunks_by_timestamp():
+    merger = FrameMerger(2, WINDOW)
+    merger.push(0, 1.0, 6, frame(0xA1))
+    merger.push(0, 3.0, 6, frame(0xA3))
+    merger.push(1, 2.0, 6, frame(0xB2))
+    # Bus 1 2.0'a kadar gördü: 3.0'daki parça ondan önce gelebilecek frame'leri bekler
+    assert merged(merger.pop_ready(now=2.0)) == [(1.0, 0xA1), (2.0, 0xB2)]
+    assert len(merger) == 1
+    merger.push(1, 4.0, 6, frame(0xB4))
+    assert merged(merger.pop_ready(now=2.0)) == [(3.0, 0xA3)]
+    assert merged(merger.drain()) == [(4.0, 0xB4)]
+
+
+def test_merger_waits_at_most_window_for_silent_bus():
+    merger = FrameMerger(2, WINDOW)
+    merger.push(0, 1.0, 6, frame(0xA1))
+    assert merger.next_deadline() == pytest.approx(1.0 + WINDOW)
+    assert list(merger.pop_ready(now=1.0 + WINDOW / 2)) == []
+    assert merged(merger.pop_ready(now=1.0 + WINDOW)) == [(1.0, 0xA1)]
+    assert merger.next_deadline() is None
+
+
+def test_merger_keeps_arrival_order_for_equal_timestamps():
+    merger = FrameMerger(2, WINDOW)
+    for bus, frame_id in ((1, 0xB1), (0, 0xA1), (1, 0xB2)):
+        merger.push(bus, 1.0, 6, frame(frame_id))
+    assert [frames[0][0] for _, _, frames in merger.drain()] == [0xB1, 0xA1, 0xB2]
+
+
+def test_empty_chunk_advances_bus_without_queueing():
+    merger = FrameMerger(2, WINDOW)
+    merger.push(0, 1.0, 6, frame(0xA1))
+    merger.push(1, 5.0, 4, [])  # tümü filtrelendi: yine de bus 1'in zamanı ilerler
+    assert len(merger) == 1
+    assert merged(merger.pop_ready(now=1.0)) == [(1.0, 0xA1)]
+
+
+def test_bus_counters_feed_metrics_overlay():
+    QCoreApplication.instance() or QCoreApplication([])
+    buses = MultiBus([parse_bus('powertrain=loopback'), parse_bus('body=loopback?filter=0x2601')]).open()
+    receiver = CANReceiver(None, receive_mode='blocking')
+    receiver.buses = buses
+    received = []
+    for frame_id in (0x2601, 0x2301):
+        receiver.dispatcher.register(frame_id, lambda *frame: received.append(frame))
+    thread = threading.Thread(target=receiver.start_receiving)
+    thread.start()
+    try:
+        packer = FramePacker()
+        chunk = b'\x01\x02\x03' + packer.pack(0x2601, b'\x10', True) + packer.pack(0x2301, b'\x05', True)
+        for name in ('powertrain', 'body'):
+            buses.port(name).write(chunk)
+        deadline = time.monotonic() + 5
+        while len(received) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        receiver.stop_receiving()
+        thread.join()
+
+    powertrain, body = buses.stats['powertrain'], buses.stats['body']
+    assert (powertrain['frames'], powertrain['filtered']) == (2, 0)
+    assert (body['frames'], body['filtered']) == (1, 1)
+    assert powertrain['bytes'] == body['bytes'] == len(chunk)
+    assert powertrain['dropped_bytes'] == body['dropped_bytes'] == 3
+    assert powertrain['errors']['garbage'] == body['errors']['garbage'] == 1  # tek find atlaması
+
+    total = buses.decoder_stats()
+    assert total['frames'] == 3 and total['filtered'] == 1
+    assert total['dropped_bytes'] == 6 and total['resyncs'] == 2
+    assert total['errors']['garbage'] == 2
+
+    bridge = MetricsBridge(receiver)
+    bridge._timer.stop()
+    summary = bridge.collect()
+    assert summary['decoder'] == total
+    assert receiver.metrics.bytes_read == 2 * len(chunk)
+    buses.close()
@@ -0,0 +1,191 @@
+import random
+
+import pytest
+
+from protocol import (CANProtocol, FixedFrameDecoder, FixedFramePacker, FrameDecoder, FramePacker,
+                      acceptance_filter)
+
+FRAMES = [
+    (0x2601, b'\x64', True),
+    (0x123, b'', False),
+    (0x7FF, bytes(range(8)), False),
+    (0x3001, b'\xaa\x55\xaa', True),  # payload içinde başlık/sonlandırıcı baytları
+    (0x1FFFFFFF, b'\x55', True),
+]
+
+
+def variable_stream(frames=FRAMES):
+    protocol = CANProtocol()
+    return b''.join(protocol.pack_can_frame(frame_id, data, extended) for frame_id, data, extended in frames)
+
+
+def expected(frames=FRAMES):
+    return [(frame_id, len(data), data) for frame_id, data, _ in frames]
+
+
+def feed_chunks(decoder, stream, size):
+    return [frame for i in range(0, len(stream), size) for frame in decoder.feed(stream[i:i + size])]
+
+
+def test_several_frames_in_one_read():
+    decoder = FrameDecoder()
+    assert list(decoder.feed(variable_stream())) == expected()
+    assert len(decoder) == 0
+    assert decoder.frames == len(FRAMES)
+
+
+@pytest.mark.parametrize('size', range(1, 12))
+def test_frames_split_across_reads(size):
+    decoder = FrameDecoder()
+    assert feed_chunks(decoder, variable_stream(), size) == expected()
+    assert decoder.dropped_bytes == 0 and decoder.resyncs == 0
+
+
+def test_partial_frame_waits_for_rest():
+    stream = variable_stream()
+    decoder = FrameDecoder()
+    assert list(decoder.feed(stream[:5])) == []
+    assert len(decoder) == 5
+    assert list(decoder.feed(stream[5:])) == expected()
+
+
+def test_small_capacity_compacts_unread_tail():
+    rng = random.Random(1)
+    frames = [(rng.randrange(0x800), bytes(rng.randrange(256) for _ in range(rng.randint(0, 8))), False)
+              for _ in range(500)]
+    decoder = FrameDecoder(capacity=FrameDecoder.MIN_CAPACITY)
+    assert feed_chunks(decoder, variable_stream(frames), 37) == expected(frames)
+
+
+def test_capacity_below_minimum_rejected():
+    with pytest.raises(ValueError):
+        FrameDecoder(capacity=FrameDecoder.MIN_CAPACITY - 1)
+
+
+@pytest.mark.parametrize('frame_id, data, extended', FRAMES)
+@pytest.mark.parametrize('remote', (False, True))
+def test_packer_matches_reference(frame_id, data, extended, remote):
+    packer = FramePacker()
+    reference = CANProtocol().pack_can_frame(frame_id, data, extended, remote)
+    assert packer.pack(frame_id, data, extended, remote) == reference
+    assert packer.pack(frame_id, data, extended, remote) == reference  # önbellekten
+
+
+def test_pack_into_batches_frames():
+    packer = FramePacker()
+    out = bytearray()
+    for frame_id, data, extended in FRAMES:
+        packer.pack_into(out, frame_id, data, extended)
+    assert bytes(out) == variable_stream()
+
+
+def test_packer_validates_like_reference():
+    with pytest.raises(ValueError):
+        FramePacker().pack(0x800, b'\x01')  # standard ID aralığı dışında
+    with pytest.raises(ValueError):
+        FramePacker().pack(0x100, bytes(9))
+
+
+def fixed_stream(frames=FRAMES):
+    protocol = CANProtocol()
+    return b''.join(protocol.pack_fixed_frame(frame_id, data, extended) for frame_id, data, extended in frames)
+
+
+def resync_decoder(cls=FrameDecoder):
+    decoder = cls()
+    decoder.resync_events = []
+    decoder.on_resync = lambda lost, reason: decoder.resync_events.append((lost, reason))
+    return decoder
+
+
+@pytest.mark.parametrize('corrupt, reason, lost', [
+    (lambda frame: b'\x01\x02\x03', 'garbage', 3),
+    (lambda frame: frame[:-1] + b'\x00', 'bad_terminator', 7),   # başlık + kalan 6 bayt
+    (lambda frame: frame[:1] + b'\xc9' + frame[2:], 'bad_dlc', 7),
+    (lambda frame: frame[:1] + b'\x02' + frame[2:], 'bad_type', 7),
+])
+def test_resync_reports_lost_bytes_and_first_reason(corrupt, reason, lost):
+    protocol = CANProtocol()
+    bad = corrupt(protocol.pack_can_frame(0x123, b'\x01\x02'))
+    decoder = resync_decoder()
+    frames = list(decoder.feed(bad + variable_stream()))
+    assert frames == expected()
+    assert decoder.resync_events == [(lost, reason)]
+    assert decoder.dropped_bytes == lost and decoder.resyncs == 1
+    assert decoder.errors[reason] == 1
+
+
+def test_loss_spanning_reads_reported_once():
+    decoder = resync_decoder()
+    assert list(decoder.feed(b'\x01\x02')) == []
+    assert list(decoder.feed(b'\x03\x04\x05')) == []
+    assert list(decoder.feed(variable_stream())) == expected()
+    assert decoder.resync_events == [(5, 'garbage')]
+    assert decoder.errors['garbage'] == 2
+
+
+@pytest.mark.parametrize('frame_id, data, extended', FRAMES)
+@pytest.mark.parametrize('remote', (False, True))
+def test_fixed_packer_matches_reference(frame_id, data, extended, remote):
+    packer = FixedFramePacker()
+    reference = CANProtocol().pack_fixed_frame(frame_id, data, extended, remote)
+    assert len(reference) == CANProtocol.FIXED_FRAME_LENGTH
+    assert packer.pack(frame_id, data, extended, remote) == reference
+    assert packer.pack(frame_id, data, extended, remote) == reference
+
+
+@pytest.mark.parametrize('size', (1, 7, 19, 20, 21, 1000))
+def test_fixed_frames_split_across_reads(size):
+    decoder = FixedFrameDecoder()
+    assert feed_chunks(decoder, fixed_stream(), size) == expected()
+
+
+def test_fixed_frame_with_bad_checksum_rejected():
+    frame = bytearray(CANProtocol().pack_fixed_frame(0x123, b'\x01\x02'))
+    frame[-1] ^= 0xFF
+    decoder = resync_decoder(FixedFrameDecoder)
+    assert list(decoder.feed(bytes(frame) + fixed_stream())) == expected()
+    assert decoder.errors['bad_checksum'] == 1
+    assert decoder.resync_events == [(CANProtocol.FIXED_FRAME_LENGTH, 'bad_checksum')]
+
+
+def test_fixed_frame_with_bad_payload_byte_rejected():
+    frame = bytearray(CANProtocol().pack_fixed_frame(0x123, b'\x01\x02'))
+    frame[10] ^= 0x01  # data değişti, checksum eski
+    decoder = FixedFrameDecoder()
+    assert list(decoder.feed(bytes(frame))) == []
+    assert decoder.errors['bad_checksum'] == 1 and decoder.frames == 0
+
+
+@pytest.mark.parametrize('cls, stream', [(FrameDecoder, variable_stream), (FixedFrameDecoder, fixed_stream)])
+@pytest.mark.parametrize('size', (1, 5, 1000))
+def test_id_filter_skips_other_ids(cls, stream, size):
+    decoder = cls()
+    decoder.id_filter = frozenset((0x2601, 0x7FF))
+    frames = feed_chunks(decoder, stream(), size)
+    assert frames == [frame for frame in expected() if frame[0] in decoder.id_filter]
+    assert decoder.frames == 2 and decoder.filtered == 3
+    assert decoder.dropped_bytes == 0
+
+
+def test_acceptance_filter_without_ids_accepts_everything():
+    assert acceptance_filter(()) == (0, 0, False)
+
+
+@pytest.mark.parametrize('frame_ids, filter_id, mask, extended', [
+    ({0x123}, 0x123, 0x7FF, False),
+    ({0x123, 0x125}, 0x121, 0x7F9, False),          # 0x123 ^ 0x125 = 0x006
+    ({0x2601, 0x2801}, 0x2001, 0x1FFFF1FF, True),   # 0x2601 ^ 0x2801 = 0xE00
+    ({0x7FF, 0x800}, 0x0, 0x1FFFF000, True),        # biri 11 biti aşınca 29 bitlik maske
+])
+def test_acceptance_filter_mask_and_code(frame_ids, filter_id, mask, extended):
+    assert acceptance_filter(frame_ids) == (filter_id, mask, extended)
+    for frame_id in frame_ids:
+        assert frame_id & mask == filter_id
+
+
+def test_acceptance_filter_passes_superset_left_to_id_filter():
+    filter_id, mask, _ = acceptance_filter({0x2601, 0x2801})
+    # Ortak bitleri paylaşan abone olunmamış ID donanımdan geçer, yazılımda elenir
+    assert 0x2201 & mask == filter_id
+    assert 0x2301 & mask != filter_id
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from scheduler import PeriodicScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCondition(threading.Condition):
+    # Zamanlayıcının beklemesi uyumak yerine sahte saati ilerletir:
+    # görevler tam deadline'larında çalışır
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout=None):
+        assert timeout is not None, "aktif görev varken süresiz bekleme"
+        self.clock.now += timeout
+        return False
+
+
+def fake_scheduler():
+    clock = FakeClock()
+    scheduler = PeriodicScheduler(clock)
+    scheduler._cond = FakeCondition(clock)
+    return clock, scheduler
+
+
+def run_until(scheduler, done):
+    def after_tick():
+        if done():
+            scheduler.stop()
+    scheduler.run(after_tick)
+
+
+def test_tasks_run_at_their_deadlines():
+    clock, scheduler = fake_scheduler()
+    runs = {'fast': [], 'slow': []}
+    scheduler.add('fast', 0.005, lambda: runs['fast'].append(clock.now))
+    scheduler.add('slow', 0.0125, lambda: runs['slow'].append(clock.now))
+    run_until(scheduler, lambda: len(runs['fast']) >= 20)
+
+    assert runs['fast'] == pytest.approx([index * 0.005 for index in range(20)])
+    assert runs['slow'] == pytest.approx([index * 0.0125 for index in range(len(runs['slow']))])
+    assert len(runs['slow']) == 8
+    stats = scheduler.jitter_stats()['fast']
+    assert stats['runs'] == 20 and stats['max_ms'] == pytest.approx(0, abs=1e-9)
+
+
+def test_missed_periods_are_not_replayed():
+    clock, scheduler = fake_scheduler()
+    runs = []
+
+    def slow_callback():
+        runs.append(clock.now)
+        if len(runs) == 2:
+            clock.now += 0.05  # 10 periyot kaçırıldı
+
+    scheduler.add('task', 0.005, slow_callback)
+    run_until(scheduler, lambda: len(runs) >= 4)
+    # Kaçırılan 10 periyot tek bir geç çalışmaya iner, sonra bir periyot sonrasından devam
+    assert runs == pytest.approx([0.0, 0.005, 0.055, 0.06])
+    assert scheduler.jitter_stats()['task']['max_ms'] == pytest.approx(45)
+
+
+def test_enable_and_disable():
+    clock, scheduler = fake_scheduler()
+    ticks = []
+    optional = []
+
+    def tick():
+        ticks.append(clock.now)
+        if len(ticks) == 5:
+            scheduler.enable('optional')
+        elif len(ticks) == 10:
+            scheduler.enable('optional', False)
+
+    scheduler.add('tick', 0.005, tick)
+    scheduler.add('optional', 0.002, lambda: optional.append(clock.now), enabled=False)
+    run_until(scheduler, lambda: len(ticks) >= 15)
+
+    # delay=0: etkinleştirildiği anda, kapatılana kadar 2 ms'de bir
+    assert optional == pytest.approx([ticks[4] + index * 0.002 for index in range(13)])
+    assert optional[-1] <= ticks[9]
+
+
+def test_enable_with_delay():
+    clock, scheduler = fake_scheduler()
+    ticks = []
+    delayed = []
+
+    def tick():
+        ticks.append(clock.now)
+        if len(ticks) == 1:
+            scheduler.enable('delayed', delay=0.02)
+
+    scheduler.add('tick', 0.005, tick)
+    scheduler.add('delayed', 0.005, lambda: delayed.append(clock.now), enabled=False)
+    run_until(scheduler, lambda: len(delayed) >= 1)
+    assert delayed[0] == pytest.approx(ticks[0] + 0.02)
+
+
+def test_stop_wakes_idle_scheduler():
+    scheduler = PeriodicScheduler()
+    scheduler.add('idle', 0.01, lambda: None, enabled=False)
+    thread = threading.Thread(target=scheduler.run)
+    thread.start()
+    scheduler.stop()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    scheduler.run()  # durdurulmuş zamanlayıcı hemen döner
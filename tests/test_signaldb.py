@@ -0,0 +1,44 @@
+import pytest
+
+from signaldb import Message, SignalError, default_signal_db
+
+
+@pytest.mark.parametrize('data, expected', [
+    (b'', 0),
+    (b'\x64', 85),
+    (b'\x01\x2c', 285),  # 300 - 15: 255 üstü kırpılmaz
+])
+def test_default_speed_uses_whole_payload(data, expected):
+    assert default_signal_db().decode(0x2601, data) == (('speed', expected),)
+
+
+def test_default_signals_match_big_endian_payload():
+    db = default_signal_db()
+    data = b'\x02\x58'  # 600
+    assert db.decode(0x2301, data) == (('distance', 600),)
+    assert db.decode(0x2801, data) == (('temperature', 60.0),)
+    assert db.decode(0x3101, b'\x00\x00') == (('brake', False),)
+    assert db.decode(0x3101, b'\x01\x00') == (('brake', True),)
+
+
+@pytest.mark.parametrize('signal', [
+    {'name': 's', 'byte': -1},
+    {'name': 's', 'byte': '0'},
+    {'name': 's', 'size': 1.5},
+    {'name': 's', 'size': True},
+    {'name': 's', 'byte': 6, 'size': 4},
+    {'name': 's', 'byte': 9},
+    {'name': 's', 'size': 'dlc', 'byte': 1},
+    {'name': 's', 'size': 'dlc', 'signed': True},
+])
+def test_invalid_layout_rejected_on_load(signal):
+    with pytest.raises(SignalError):
+        Message({'id': 0x100, 'signals': [signal]})
+
+
+def test_short_frame_raises_signal_error():
+    message = Message({'id': 0x100, 'signals': [{'name': 'a', 'byte': 0, 'size': 1},
+                                                 {'name': 'b', 'byte': 1, 'size': 2}]})
+    assert message.decode(b'\x01\x00\x02') == (('a', 1), ('b', 2))
+    with pytest.raises(SignalError):
+        message.decode(b'\x01')
@@ -0,0 +1,144 @@
+import argparse
+import os
+import threading
+import time
+
+import pytest
+
+from main import configure_adapter
+from multibus import MultiBus, parse_bus
+from protocol import CANProtocol, FixedFrameDecoder, FixedFramePacker, FrameDecoder, acceptance_filter
+from transport import (LoopbackTransport, PtyTransport, SimulatedAdapterTransport, SyntheticTransport,
+                       open_transport)
+
+ARGS = argparse.Namespace(can_bitrate=500000, frame_format='variable')
+
+
+def read_for(transport, seconds):
+    data = bytearray()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        data += transport.read(transport.in_waiting or 1)
+    return bytes(data)
+
+
+def test_loopback_pair_connects_both_ends():
+    a, b = LoopbackTransport.pair(timeout=0.05)
+    try:
+        a.write(b'\xaa\x01')
+        b.write(b'\x55')
+        time.sleep(0.01)
+        assert b.in_waiting == 2 and b.read(2) == b'\xaa\x01'
+        assert a.read(1) == b'\x55'
+        assert a.read(1) == b''  # timeout
+    finally:
+        a.close()
+        b.close()
+    assert not a.is_open
+
+
+def test_single_loopback_echoes_writes():
+    transport = open_transport('loopback', timeout=0.05)
+    try:
+        transport.write(b'\x01\x02\x03')
+        assert transport.read(3) == b'\x01\x02\x03'
+    finally:
+        transport.close()
+
+
+def test_pty_peer_behaves_like_serial_port():
+    transport = open_transport('pty', timeout=0.5)
+    assert isinstance(transport, PtyTransport)
+    try:
+        peer = os.open(transport.peer_name, os.O_RDWR | os.O_NOCTTY)
+        try:
+            transport.write(b'\xaa\x55\x0a')  # raw kip: bayt dönüşümü yok
+            assert os.read(peer, 3) == b'\xaa\x55\x0a'
+            os.write(peer, b'\x0d\x11')
+            assert transport.read(2) == b'\x0d\x11'
+        finally:
+            os.close(peer)
+    finally:
+        transport.close()
+
+
+@pytest.mark.parametrize('frame_format, decoder', [('variable', FrameDecoder), ('fixed', FixedFrameDecoder)])
+def test_synthetic_traffic_decodes_with_configured_ids(frame_format, decoder):
+    transport = open_transport(f'synthetic?rate=5000&ids=0x2601:3,0x123&seed=1&format={frame_format}', timeout=0.05)
+    try:
+        assert isinstance(transport, SyntheticTransport)
+        assert transport.ids == {0x2601: 3.0, 0x123: 1.0}
+        frames = list(decoder().feed(read_for(transport, 0.2)))
+        transport.write(b'\x00' * 4)
+        assert transport.written == 4
+    finally:
+        transport.close()
+    assert len(frames) > 100
+    assert {frame_id for frame_id, _, _ in frames} == {0x2601, 0x123}
+    assert all(dlc == 1 for _, dlc, _ in frames)
+    assert transport.generated >= len(frames)
+
+
+def test_adapter_url_uses_fixed_packer():
+    transport = open_transport('adapter?rate=0&format=fixed')
+    try:
+        assert isinstance(transport, SimulatedAdapterTransport)
+        assert isinstance(transport._packer, FixedFramePacker)
+        assert transport.ids == SimulatedAdapterTransport.BUSY_IDS
+    finally:
+        transport.close()
+
+
+def test_setting_frame_split_across_writes_applied():
+    adapter = SimulatedAdapterTransport(rate=0, seed=1)
+    try:
+        command = CANProtocol().pack_setting_frame(500000, 0x2001, 0x1FFFF0FF, True)
+        adapter.write(b'\xaa\xc1\x01')  # yarım CAN frame'i: yalnızca sayılır
+        adapter.write(command[:7])
+        assert adapter.settings is None
+        adapter.write(command[7:])
+        assert adapter.settings['filter_id'] == 0x2001 and adapter.settings['mask'] == 0x1FFFF0FF
+        assert adapter.acceptance == (0x1FFFF0FF, 0x2001)
+        assert adapter.written == 3 + len(command)
+    finally:
+        adapter.close()
+
+
+def test_open_filter_setting_clears_acceptance():
+    adapter = SimulatedAdapterTransport(rate=0, seed=1)
+    try:
+        assert configure_adapter(adapter, ARGS, {0x123})
+        assert adapter.acceptance == (0x7FF, 0x123)
+        assert configure_adapter(adapter, ARGS, None)  # --no-hw-filter
+        assert adapter.acceptance is None
+    finally:
+        adapter.close()
+
+
+def test_each_bus_adapter_filters_its_own_ids():
+    powertrain_ids = frozenset((0x2601, 0x2901))  # maske 0x2X01'in tamamını geçirir
+    body_ids = frozenset((0x123,))
+    configs = [parse_bus('powertrain=adapter?rate=20000&seed=1'), parse_bus('body=adapter?rate=20000&seed=2')]
+    configs[0].ids, configs[1].ids = powertrain_ids, body_ids  # open_buses'ın yazılım filtresi
+    buses = MultiBus(configs).open()
+    received = set()
+    thread = threading.Thread(target=buses.run, args=(lambda timestamp, size, frames: received.update(
+        frame_id for frame_id, _, _ in frames),))
+    thread.start()
+    try:
+        for worker in buses.workers:
+            assert configure_adapter(worker.port, ARGS, worker.config.ids, worker.config.name)
+        time.sleep(0.3)
+    finally:
+        buses.stop()
+        thread.join()
+
+    powertrain, body = (worker.transport for worker in buses.workers)
+    for adapter, ids in ((powertrain, powertrain_ids), (body, body_ids)):
+        filter_id, mask, _ = acceptance_filter(ids)
+        assert adapter.acceptance == (mask, filter_id)
+        assert adapter.suppressed > 0
+    assert received == powertrain_ids | body_ids
+    # 0x2301, 0x2701, 0x2801 donanım maskesinden geçer, powertrain çözücüsünde elenir
+    assert buses.stats['powertrain']['filtered'] > 0
+    buses.close()
@@ -0,0 +1,67 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from dispatch import FrameDispatcher
+from signaldb import Message, SignalDatabase
+from vehicle import Deadband, VehicleModel
+
+HOLD_TICKS = 5
+
+
+@pytest.fixture
+def vehicle():
+    QCoreApplication.instance() or QCoreApplication([])
+    model = VehicleModel(deadbands={'temperature': Deadband(0.5)}, hold_ticks=HOLD_TICKS)
+    model._timer.stop()  # kareler testte elle ilerletilir
+    return model
+
+
+def tick(vehicle, value=None):
+    if value is not None:
+        vehicle.coalescer.offer(0x2801, (('temperature', value),))
+    vehicle._publish()
+
+
+def test_slow_ramp_converges_to_true_value(vehicle):
+    published = []
+    vehicle.temperatureChanged.connect(lambda: published.append(vehicle.temperature))
+    tick(vehicle, 20.0)
+    for step in range(1, 8):
+        tick(vehicle, 20.0 + step * 0.01)  # adım deadband'in çok altında
+    assert vehicle.temperature < 20.07
+    for _ in range(HOLD_TICKS):
+        tick(vehicle)  # kayma durdu, frame gelmiyor
+    assert vehicle.temperature == pytest.approx(20.07)
+    assert len(published) < 7  # deadband yine de çoğu değişikliği bastırır
+
+
+def test_held_value_dropped_when_signal_returns(vehicle):
+    tick(vehicle, 20.0)
+    tick(vehicle, 20.2)
+    tick(vehicle, 20.0)
+    for _ in range(HOLD_TICKS * 2):
+        tick(vehicle)
+    assert vehicle.temperature == 20.0
+    assert vehicle.suppressed['temperature'] == 1
+
+
+def test_large_change_published_immediately(vehicle):
+    tick(vehicle, 20.0)
+    tick(vehicle, 21.0)
+    assert vehicle.temperature == 21.0
+
+
+def test_every_rx_message_is_registered(vehicle):
+    unknown = []
+    dispatcher = FrameDispatcher(unknown=lambda *frame: unknown.append(frame))
+    extra = Message({'id': '0x2701', 'name': 'Yag', 'direction': 'rx',
+                     'signals': [{'name': 'oilPressure', 'byte': 0, 'size': 1}]})
+    vehicle.signal_db = SignalDatabase(list(vehicle.signal_db.messages) + [extra])
+    vehicle.attach(dispatcher)
+    assert 0x2701 in dispatcher.ids()
+    assert VehicleModel.frame_ids(vehicle.signal_db) == frozenset(dispatcher.ids())
+    dispatcher.dispatch(0x2701, 1, b'\x07')
+    dispatcher.dispatch(0x2601, 1, b'\x64')
+    vehicle._publish()
+    assert unknown == []
+    assert vehicle.speed == 85
@@ -0,0 +1,89 @@
+import pytest
+
+from gamepad import Control, GamepadState
+from main import CANWriter
+from protocol import FrameDecoder
+from signaldb import default_signal_db
+
+
+class RecordingPort:
+    is_open = True
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return len(data)
+
+
+@pytest.fixture
+def writer():
+    return CANWriter(RecordingPort())
+
+
+def sent(writer):
+    # -> write başına çözülmüş (frame_id, payload) listesi
+    frames = [[(frame_id, data) for frame_id, _, data in FrameDecoder().feed(packet)]
+              for packet in writer.serial_connection.writes]
+    writer.serial_connection.writes.clear()
+    return frames
+
+
+def command(name):
+    return default_signal_db().command(name)[:2]
+
+
+def enabled(writer, task):
+    return writer.scheduler._tasks[task].enabled
+
+
+def test_state_snapshot_is_immutable():
+    state = GamepadState()
+    before = state.snapshot
+    assert state.set(Control.A, 1)
+    assert before[Control.A] == 0  # okuyucunun elindeki snapshot değişmez
+    assert state.snapshot[Control.A] == 1 and state[Control.A] == 1
+    snapshot = state.snapshot
+    assert not state.set(Control.A, 1)
+    assert state.snapshot is snapshot  # değişiklik yoksa yeni tuple da yok
+    assert state.any_pressed()
+
+
+def test_button_press_sent_immediately_and_held_periodically(writer):
+    writer.handle_input(Control.A, 1)
+    assert sent(writer) == [[command('ButtonA')]]
+    assert enabled(writer, 'buttons')
+
+    writer.handle_input(Control.X, 1)
+    writer._send_held_buttons()
+    writer._flush_tick()
+    assert sent(writer) == [[command('ButtonX')], [command('ButtonA'), command('ButtonX')]]
+
+    writer.handle_input(Control.A, 0)
+    writer.handle_input(Control.X, 0)
+    assert sent(writer) == [[command('ButtonRelease')], [command('ButtonRelease')]]
+    assert not enabled(writer, 'buttons')
+
+
+def test_repeated_value_not_resent(writer):
+    writer.handle_input(Control.HAT_X, -1)
+    writer.handle_input(Control.HAT_X, -1)
+    writer.handle_input(Control.HAT_X, 0)  # bırakma: d-pad için komut yok
+    assert sent(writer) == [[command('DpadLeft')]]
+
+
+def test_trigger_enables_periodic_send_above_threshold(writer):
+    throttle = default_signal_db().message('Throttle')
+    writer.handle_input(Control.THROTTLE, 32767)
+    assert writer.state.snapshot[Control.THROTTLE] == 255
+    assert enabled(writer, 'throttle') and not enabled(writer, 'brake')
+    assert sent(writer) == []  # trigger'lar yalnızca periyodik gönderilir
+
+    writer._send_throttle()
+    writer._send_brake()
+    writer._flush_tick()
+    assert sent(writer) == [[(throttle.frame_id, throttle.encoder('throttle')(255))]]
+
+    writer.handle_input(Control.THROTTLE, -32768 + 5 * 256)  # 5 <= 10
+    assert not enabled(writer, 'throttle')
@@ -0,0 +1,271 @@
+# === TRANSPORT === #
+# CANReceiver/CANWriter'ın kullandığı pyserial alt kümesi (read, write,
+# in_waiting, fileno, is_open, close) etrafında takılabilir arka uçlar:
+#
+#   /dev/ttyUSB1, COM6, serial:/dev/ttyUSB1?baud=2000000  -> SerialTransport
+#   pty                                                     -> PtyTransport
+#   loopback                                                -> LoopbackTransport
+#   synthetic?rate=5000&ids=0x2601:5,0x2301:1&format=fixed  -> SyntheticTransport
+#   adapter?rate=20000                                      -> SimulatedAdapterTransport
+#
+# Donanım olmadan tüm hattı çalıştırmak ve benchmark almak için kullanılır.
+
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+    import termios
+    import tty
+except ImportError:  # Windows: yalnızca SerialTransport kullanılabilir
+    fcntl = termios = tty = None
+
+from protocol import CANProtocol, FRAME_FORMATS
+
+DEFAULT_BAUDRATE = 2000000
+
+
+class TransportError(OSError):
+    pass
+
+
+class SerialTransport:
+    # pyserial Serial nesnesini olduğu gibi kullanır
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE, timeout=1):
+        import serial
+        self.serial = serial.Serial(port, baudrate, timeout=timeout)
+
+    def __getattr__(self, name):
+        return getattr(self.serial, name)
+
+
+class FdTransport:
+    # Ham dosya tanımlayıcısı üzerinde pyserial benzeri arayüz
+    def __init__(self, fd, timeout=1):
+        self.fd = fd
+        self.timeout = timeout
+        self.is_open = True
+
+    def fileno(self):
+        return self.fd
+
+    @property
+    def in_waiting(self):
+        buf = fcntl.ioctl(self.fd, termios.FIONREAD, b'\0\0\0\0')
+        return struct.unpack('I', buf)[0]
+
+    def read(self, size=1):
+        readable, _, _ = select.select([self.fd], [], [], self.timeout)
+        if not readable:
+            return b''
+        data = os.read(self.fd, size)
+        if not data:
+            raise TransportError("Bağlantı karşı taraftan kapatıldı")
+        return data
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+        return len(data)
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            os.close(self.fd)
+
+
+class PtyTransport(FdTransport):
+    # Bir pty çiftinin master ucu; peer_name (örn. /dev/pts/3) başka bir süreç
+    # ya da SerialTransport tarafından gerçek bir seri port gibi açılabilir
+    def __init__(self, timeout=1):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        tty.setraw(slave)
+        super().__init__(master, timeout)
+        self.slave_fd = slave
+        self.peer_name = os.ttyname(slave)
+
+    def close(self):
+        if self.is_open:
+            os.close(self.slave_fd)
+        super().close()
+
+
+class LoopbackTransport(FdTransport):
+    # Süreç içi bağlantı. pair() iki uç döner: birine yazılan diğerinden
+    # okunur (örn. CANWriter -> CANReceiver). Tek başına açılırsa yazılan
+    # veri aynı uçtan geri okunur.
+    def __init__(self, sock=None, timeout=1):
+        self._peer = None
+        if sock is None:
+            sock, self._peer = socket.socketpair()
+        self._sock = sock
+        super().__init__(sock.fileno(), timeout)
+
+    @classmethod
+    def pair(cls, timeout=1):
+        a, b = socket.socketpair()
+        return cls(a, timeout), cls(b, timeout)
+
+    def write(self, data):
+        if self._peer is not None:
+            self._peer.sendall(data)
+            return len(data)
+        return super().write(data)
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._sock.close()
+            if self._peer is not None:
+                self._peer.close()
+
+
+class SyntheticTransport(LoopbackTransport):
+    # Yapılandırılabilir hız ve ID dağılımında sentetik trafik üretir.
+    # Host'un yazdığı frame'ler sayılır ve atılır.
+    DEFAULT_IDS = {0x2601: 5, 0x2301: 2, 0x2801: 1, 0x2901: 1, 0x3001: 1, 0x3101: 1}
+
+    def __init__(self, rate=1000, ids=None, seed=None, timeout=1, frame_format='variable'):
+        rx, self._tx = socket.socketpair()
+        super().__init__(rx, timeout)
+        self.rate = rate
+        self.ids = dict(ids or self.DEFAULT_IDS)
+        self.generated = 0
+        self.suppressed = 0
+        self.written = 0
+        self.acceptance = None  # (maske, beklenen): SimulatedAdapterTransport ayarlar
+        self._rng = random.Random(seed)
+        self._packer = FRAME_FORMATS[frame_format][1]()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._generate, name="SyntheticTransport", daemon=True)
+        self._thread.start()
+
+    def write(self, data):
+        self.written += len(data)
+        return len(data)
+
+    def next_frame(self):
+        frame_id = self._rng.choices(list(self.ids), weights=list(self.ids.values()))[0]
+        return frame_id, bytes((self._rng.randrange(256),))
+
+    def _generate(self):
+        # 1 ms'lik dilimlerde, biriken hız kadar frame'i tek send ile gönder
+        tick = 0.001
+        per_tick = self.rate * tick
+        credit = 0.0
+        next_tick = time.monotonic()
+        ids = list(self.ids)
+        weights = list(self.ids.values())
+        choices = self._rng.choices
+        randrange = self._rng.randrange
+        is_extended = {frame_id: frame_id >= (1 << 11) for frame_id in ids}
+
+        while not self._stopped.is_set():
+            credit += per_tick
+            count = int(credit)
+            if count:
+                credit -= count
+                batch = bytearray()
+                mask, match = self.acceptance or (0, 0)
+                for frame_id in choices(ids, weights=weights, k=count):
+                    if frame_id & mask != match:
+                        self.suppressed += 1
+                        continue
+                    self._packer.pack_into(batch, frame_id, bytes((randrange(256),)), is_extended[frame_id])
+                try:
+                    self._tx.sendall(batch)
+                except OSError:
+                    return
+                self.generated += count
+            next_tick += tick
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._stopped.wait(delay)
+
+    def close(self):
+        self._stopped.set()
+        try:
+            # Okunmayan tampon dolduysa bloklanmış sendall'ı serbest bırak
+            self._tx.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._thread.join()
+        self._tx.close()
+        super().close()
+
+
+class SimulatedAdapterTransport(SyntheticTransport):
+    # Kalabalık bir bus'a bağlı adaptör: tanınmayan ID'ler de üretilir ve host'un
+    # yazdığı ayar komutları (CANProtocol.pack_setting_frame) uygulanır; kabul
+    # filtresinden geçmeyen frame'ler USB'ye hiç çıkmaz (suppressed).
+    BUSY_IDS = {**SyntheticTransport.DEFAULT_IDS,
+                0x2701: 2, 0x2300: 2, 0x123: 5, 0x456: 5, 0x18FEF100: 5, 0x18FF0A00: 5}
+
+    def __init__(self, rate=1000, ids=None, seed=None, timeout=1, frame_format='variable'):
+        super().__init__(rate, ids or self.BUSY_IDS, seed, timeout, frame_format)
+        self.protocol = CANProtocol()
+        self.settings = None
+        self._commands = bytearray()
+
+    def write(self, data):
+        # Ayar komutlarını ayıkla; CAN frame'leri yalnızca sayılır
+        buf = self._commands
+        buf += data
+        start = buf.find(b'\xaa\x55')
+        while start != -1 and len(buf) - start >= CANProtocol.FIXED_FRAME_LENGTH:
+            settings = self.protocol.parse_setting_frame(buf[start:start + CANProtocol.FIXED_FRAME_LENGTH])
+            if settings is not None:
+                self.apply(settings)
+                start += CANProtocol.FIXED_FRAME_LENGTH
+            else:
+                start += 1
+            start = buf.find(b'\xaa\x55', start)
+        # Yarım kalmış olası bir komutun başını sakla
+        keep = len(buf) - start if start != -1 else (1 if buf.endswith(b'\xaa') else 0)
+        del buf[:len(buf) - keep]
+        return super().write(data)
+
+    def apply(self, settings):
+        self.settings = settings
+        mask = settings['mask']
+        self.acceptance = (mask, settings['filter_id'] & mask) if mask else None
+
+
+def _parse_ids(spec):
+    ids = {}
+    for item in spec.split(','):
+        frame_id, _, weight = item.partition(':')
+        ids[int(frame_id, 0)] = float(weight or 1)
+    return ids
+
+
+def open_transport(url, baudrate=DEFAULT_BAUDRATE, timeout=1):
+    name, _, query = url.partition('?')
+    params = dict(item.partition('=')[::2] for item in query.split('&') if item)
+
+    if name == 'pty':
+        return PtyTransport(timeout)
+    if name == 'loopback':
+        return LoopbackTransport(timeout=timeout)
+    if name == 'synthetic':
+        ids = _parse_ids(params['ids']) if 'ids' in params else None
+        seed = int(params['seed']) if 'seed' in params else None
+        return SyntheticTransport(float(params.get('rate', 1000)), ids, seed, timeout,
+                                  params.get('format', 'variable'))
+    if name == 'adapter':
+        ids = _parse_ids(params['ids']) if 'ids' in params else None
+        seed = int(params['seed']) if 'seed' in params else None
+        return SimulatedAdapterTransport(float(params.get('rate', 1000)), ids, seed, timeout,
+                                         params.get('format', 'variable'))
+    if name.startswith('serial:'):
+        name = name[len('serial:'):]
+    # Düz bir port yolu: /dev/ttyUSB1, COM6
+    return SerialTransport(name, int(params.get('baud', baudrate)), timeout)
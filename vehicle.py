@@ -0,0 +1,155 @@
+# === VEHICLE MODEL === #
+# CAN payload'larını Python tarafında fiziksel değerlere çevirir ve QML'e
+# sayısal Property'ler olarak sunar. QML her frame'de hex string parse etmek
+# yerine bu değerlere bağlanır; değer değişmedikçe notify sinyali atılmaz.
+# Değerler ekran karesi başına bir kez yayınlanır (bkz. coalesce.py).
+# ID'ler ve ölçekler signals.json'dan gelir (bkz. signaldb.py); her rx
+# mesajı dispatcher'a kaydedilir, yani yeni bir frame yalnızca signals.json'a
+# eklenerek tanınır. Adı bir property ile eşleşen sinyaller göstergeye
+# bağlanır. Sinyalin deadband / bands alanları, ekranda fark yaratmayan
+# değişikliklerin QML'e hiç gitmemesini sağlar (binding ve scenegraph
+# güncellemesi olmaz). Deadband'de kalan son değer tutulur ve en geç
+# hold_ticks kare sonra yine de yayınlanır; adım altındaki yavaş kayma
+# göstergede kalıcı bir sapma bırakmaz.
+
+from bisect import bisect_left
+
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer
+
+from coalesce import FrameCoalescer
+from signaldb import default_signal_db
+
+UI_UPDATE_INTERVAL_MS = 16  # Road.qml'deki animasyon timer'ı ile aynı (~60 Hz)
+DEADBAND_HOLD_TICKS = 30    # ~0.5 s
+
+
+class Deadband:
+    # Son yayınlanan değere göre karar verir:
+    #   bands    - kenarlar (değer <= kenar); bant değişirse her zaman yayınla
+    #   saturate - bu değerin üstündeki değerler eşit sayılır (ör. uyarının gizli olduğu mesafe)
+    #   deadband - aksi halde |yeni - son| bu değeri aşmadıkça yayınlama
+    __slots__ = ('deadband', 'bands', 'saturate')
+
+    def __init__(self, deadband=0, bands=(), saturate=None):
+        self.deadband = deadband + 1e-9  # 25.0 - 24.9 gibi float farkları
+        self.bands = tuple(bands)
+        self.saturate = saturate
+
+    def changed(self, last, value):
+        bands = self.bands
+        if bands and bisect_left(bands, value) != bisect_left(bands, last):
+            return True
+        saturate = self.saturate
+        if saturate is not None and value > saturate and last > saturate:
+            return False
+        # NaN (henüz veri yok) ile karşılaştırma False döner: yayınlanır
+        return not abs(value - last) <= self.deadband
+
+
+def _value_property(type_, name, notify):
+    return Property(type_, lambda self: self._values[name], notify=notify)
+
+
+class VehicleModel(QObject):
+    speedChanged = Signal()
+    distanceChanged = Signal()
+    temperatureChanged = Signal()
+    leftSignalChanged = Signal()
+    rightSignalChanged = Signal()
+    brakeChanged = Signal()
+
+    @staticmethod
+    def frame_ids(signal_db):
+        # attach'in abone olacağı ID'ler; model oluşmadan (bus açılırken) filtre için de kullanılır
+        return frozenset(signal_db.rx)
+
+    def __init__(self, parent=None, interval_ms=UI_UPDATE_INTERVAL_MS, signal_db=None, deadbands=None,
+                 hold_ticks=DEADBAND_HOLD_TICKS):
+        super().__init__(parent)
+        self.signal_db = signal_db if signal_db is not None else default_signal_db()
+        self._values = {
+            'speed': 0,
+            'distance': -1,               # -1: henüz veri yok
+            'temperature': float('nan'),  # NaN: henüz veri yok
+            'leftSignal': False,
+            'rightSignal': False,
+            'brake': False,
+        }
+        self._notify = {name: getattr(self, name + 'Changed') for name in self._values}
+        # property -> Deadband; None ise signals.json'dan, {} ise kapalı
+        if deadbands is None:
+            deadbands = {signal.name: Deadband(signal.deadband, signal.bands, signal.saturate)
+                         for message in self.signal_db.rx.values() for signal in message.signals
+                         if signal.name in self._values
+                         and (signal.deadband or signal.bands or signal.saturate is not None)}
+        self._deadbands = deadbands
+        self.suppressed = dict.fromkeys(self._values, 0)  # deadband'de kalan değişiklikler
+        self._held = {}  # property -> [deadband'de kalan son değer, beklediği kare sayısı]
+        self._hold_ticks = hold_ticks
+
+        # Receiver thread'i her frame'i buraya yazar, GUI thread'i her ekran
+        # karesinde bir kez okur; arada gelen değerler birleştirilir
+        self.coalescer = FrameCoalescer()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._publish)
+        self._timer.start()
+
+    def attach(self, dispatcher):
+        # Önceden derlenmiş çözücü doğrudan handler'a gömülür: frame başına tek çağrı.
+        # Göstergede karşılığı olmayan sinyaller de çözülür (frame_stats'ta sayılır),
+        # _apply_value'da atlanır
+        offer = self.coalescer.offer
+        for frame_id, message in self.signal_db.rx.items():
+            def on_frame(frame_id, length, data, decode=message.decode):
+                offer(frame_id, decode(data))
+
+            dispatcher.register(frame_id, on_frame)
+
+    def frame_stats(self):
+        # frame_id -> {'received', 'published', 'coalesced'}
+        return self.coalescer.stats()
+
+    @Slot()
+    def _publish(self):
+        for frame_id, values in self.coalescer.drain():
+            for name, value in values:
+                self._apply_value(name, value)
+        if self._held:
+            self._settle()
+
+    def _settle(self):
+        # Bekleme süresi dolan değerler deadband'e bakılmadan yayınlanır
+        for name, held in list(self._held.items()):
+            held[1] += 1
+            if held[1] >= self._hold_ticks:
+                del self._held[name]
+                self._set_value(name, held[0])
+
+    def _apply_value(self, name, value):
+        last = self._values.get(name, value)
+        if last == value:
+            self._held.pop(name, None)
+            return  # değişmedi ya da göstergede karşılığı yok
+        deadband = self._deadbands.get(name)
+        if deadband is not None and not deadband.changed(last, value):
+            self.suppressed[name] += 1
+            held = self._held.get(name)
+            if held is None:
+                self._held[name] = [value, 0]
+            else:
+                held[0] = value  # süre ilk sapmadan sayılır: sürekli kaymada da periyodik yayın
+            return
+        self._held.pop(name, None)
+        self._set_value(name, value)
+
+    def _set_value(self, name, value):
+        self._values[name] = value
+        self._notify[name].emit()
+
+    speed = _value_property(int, 'speed', speedChanged)
+    distance = _value_property(int, 'distance', distanceChanged)
+    temperature = _value_property(float, 'temperature', temperatureChanged)
+    leftSignal = _value_property(bool, 'leftSignal', leftSignalChanged)
+    rightSignal = _value_property(bool, 'rightSignal', rightSignalChanged)
+    brake = _value_property(bool, 'brake', brakeChanged)